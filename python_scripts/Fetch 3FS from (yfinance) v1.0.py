@@ -1,51 +1,107 @@
-import yfinance as yf
-import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from data_export import export_sheets
+from pipeline import Pipeline
+from run_metrics import instrumented
+from statements import (STATEMENTS, fetch_statements, fetch_ticker_statements, print_latency_report, stack_statements,
+                        ticker_workbook)
+from ttm import compute_ttm
+from yf_cache import InfoCache
+from yf_fetch import fetch_info
 
 # ✅ Fetch data directly from Yahoo Finance
-ticker = "PONY"  # CHANGE THIS TO ANY TICKER YOU WANT
-stock = yf.Ticker(ticker)
-
-# ✅ Get company name for dynamic filename
-company_name = stock.info.get("shortName", ticker)  # Use ticker if name is missing
-safe_company_name = "".join(c if c.isalnum() or c in (" ", "_") else "_" for c in company_name)  # Clean filename
-
-# ✅ Fetch full financials (Annual)
-income_stmt = stock.financials  # Income Statement (Annual)
-balance_sheet = stock.balance_sheet  # Balance Sheet (Annual)
-cash_flow = stock.cashflow  # Cash Flow Statement (Annual)
-
-# ✅ Fetch TTM Data (Summing last 4 quarters)
-income_stmt_ttm = stock.quarterly_financials.sum(axis=1)  # TTM Income Statement
-balance_sheet_ttm = stock.quarterly_balance_sheet.sum(axis=1)  # TTM Balance Sheet
-cash_flow_ttm = stock.quarterly_cashflow.sum(axis=1)  # TTM Cash Flow Statement
-
-# ✅ Function to format each statement correctly
-def format_statement(df, ttm_series, statement_name):
-    """Format the financial statement for proper Excel formatting with TTM included."""
-    df = df.copy()  # Avoid modifying original data
-    df.insert(0, "TTM", ttm_series)  # Add TTM as the first column
-    df.index.name = statement_name  # Set index name as statement title
-    df.reset_index(inplace=True)  # Move row names to a column
-    return df
-
-# ✅ Format all statements properly, including TTM
-income_stmt = format_statement(income_stmt, income_stmt_ttm, "Income Statement")
-balance_sheet = format_statement(balance_sheet, balance_sheet_ttm, "Balance Sheet")
-cash_flow = format_statement(cash_flow, cash_flow_ttm, "Cash Flow Statement")
-
-#Saving files in Downloads
-# ✅ Get the user's Downloads folder dynamically
-downloads_folder = os.path.join(os.path.expanduser("~"), "Downloads")
-
-# ✅ Define dynamic output filename
-#Note that if we remove the downloads_folder, file will be saved under C: drive / Users
-output_file = os.path.join(downloads_folder, f"{safe_company_name}_Financials.xlsx")
-
-# ✅ Save to Excel
-with pd.ExcelWriter(output_file, engine="xlsxwriter") as writer:
-    income_stmt.to_excel(writer, sheet_name="Income Statement", index=False)
-    balance_sheet.to_excel(writer, sheet_name="Balance Sheet", index=False)
-    cash_flow.to_excel(writer, sheet_name="Cash Flow Statement", index=False)
-
-print(f"✅ Excel file saved: {output_file}")
+TICKERS = ["PONY"]  # CHANGE THIS TO ANY TICKERS YOU WANT (e.g. the whole Nasdaq-100)
+
+# ✅ Concurrent workers shared by all (ticker, statement) requests
+MAX_WORKERS = 8
+
+# ✅ Output: "workbooks" (one Excel file per ticker) or "store" (one consolidated Parquet file)
+OUTPUT_MODE = "workbooks"
+
+# ✅ Workbooks mode is pipelined per ticker: TTM and formatting run while later tickers download, and each workbook
+#    is written as soon as it is ready. 0 = transforms on a thread; a process pool (e.g. 2) pays off from a few dozen tickers
+TRANSFORM_PROCESSES = 0
+
+# ✅ Profiler for this run: None, "cprofile" or "py-spy" (run metrics JSON is always written to ~/Downloads/MWKT_Metrics)
+PROFILE = None
+
+info_cache = InfoCache()
+
+# ✅ Get company names for dynamic filenames (profile fields are cached for days)
+def get_company_name(ticker):
+    try:
+        return info_cache.get(ticker, fetch_info, groups=["profile"]).get("shortName", ticker)
+    except Exception:
+        return ticker  # Use ticker if name is missing
+
+# ✅ Whole run: the settings above are the defaults, `mwkt 3fs` passes its arguments here
+@instrumented("3fs")
+def main(tickers=TICKERS, max_workers=MAX_WORKERS, output_mode=OUTPUT_MODE, output_dir=None,
+         transform_processes=TRANSFORM_PROCESSES):
+    #Saving files in Downloads
+    # ✅ Get the user's Downloads folder dynamically
+    downloads_folder = output_dir or os.path.join(os.path.expanduser("~"), "Downloads")
+
+    if output_mode == "store":
+        # ✅ Fetch full financials (Annual + Quarterly) for every ticker concurrently
+        statements, latencies = fetch_statements(tickers, max_workers=max_workers)
+
+        # ✅ TTM for all tickers at once: last 4 quarters summed for income/cash flow, latest quarter for balance sheet
+        stacked_statements = stack_statements(statements)
+        ttm_table = compute_ttm(stacked_statements)
+
+        # ✅ One consolidated long table: (ticker, statement, line item, period, value)
+        current_date = datetime.today().strftime("%Y-%m-%d")
+        output_file = os.path.join(downloads_folder, f"Financial_Statements_{current_date}.parquet")
+        stacked_statements.to_parquet(output_file, index=False)
+        print(f"✅ Statement store saved: {output_file}")
+
+        # ✅ TTM, prior-year TTM, YoY growth and TTM margins per (ticker, statement, line item)
+        ttm_file = os.path.join(downloads_folder, f"Financial_Statements_TTM_{current_date}.parquet")
+        ttm_table.reset_index().to_parquet(ttm_file, index=False)
+        print(f"✅ TTM metrics saved: {ttm_file}")
+    else:
+        latencies = {}
+        requests = ThreadPoolExecutor(max_workers=max_workers)  # Caps (ticker, statement) requests across all tickers
+
+        # ✅ Stage 1 (threads): all six statements and the company name of one ticker
+        def fetch_ticker(ticker):
+            statements, latencies[ticker] = fetch_ticker_statements(ticker, executor=requests)
+            return ticker, get_company_name(ticker), statements
+
+        # ✅ Stage 3 (thread): write the workbook as soon as its sheets are formatted
+        def export_workbook(item):
+            ticker, company_name, sheets = item
+            safe_company_name = "".join(c if c.isalnum() or c in (" ", "_") else "_" for c in company_name)  # Clean filename
+
+            # ✅ Define dynamic output filename (ticker first: share classes such as GOOG/GOOGL have the same name)
+            #Note that if we remove the downloads_folder, file will be saved under C: drive / Users
+            safe_ticker = "".join(c if c.isalnum() or c in ("-", "_") else "_" for c in ticker)
+            output_file = os.path.join(downloads_folder, f"{safe_ticker}_{safe_company_name}_Financials.xlsx")
+
+            # ✅ Save to Excel
+            export_sheets(output_file, sheets)
+
+            print(f"✅ Excel file saved: {output_file}")
+            return output_file
+
+        # ✅ Stage 2 (process pool if TRANSFORM_PROCESSES > 0): TTM (NaN where the last 4 quarters aren't all available) and sheet formatting
+        pipeline = Pipeline("3fs", processes=transform_processes)
+        pipeline.source("tickers", tickers)
+        # Enough tickers in flight to keep the request pool full; the pool, not the stage, bounds concurrency
+        pipeline.stage("fetch", fetch_ticker, after="tickers", workers=-(-max_workers // len(STATEMENTS)) + 1)
+        pipeline.stage("transform", ticker_workbook, after="fetch", workers=max(transform_processes, 1), processes=True)
+        pipeline.stage("export", export_workbook, after="transform")
+        try:
+            pipeline.run(total=len(tickers), desc="Financial statements")
+        finally:
+            requests.shutdown()
+        pipeline.report()
+
+    info_cache.close()
+    print_latency_report(latencies)
+    info_cache.report()
+
+if __name__ == "__main__":
+    main(profile=PROFILE)
@@ -1,213 +1,173 @@
 import os
-import yfinance as yf
-from tqdm import tqdm # type: ignore
-import pandas as pd
+import re
 from datetime import datetime
-
-# ✅ Scrape Nasdaq-100 table from Wikipedia
-url = "https://en.wikipedia.org/wiki/NASDAQ-100"
-nasdaq_tables = pd.read_html(url)
-
-# ✅ Get the correct table (may change index if Wikipedia updates structure)
-nasdaq_df = nasdaq_tables[4]  # Adjust index if Wikipedia changes the structure
-nasdaq_df.rename(columns={"Ticker": "Symbol"}, inplace=True)
-
-# ✅ Clean the ticker symbols (replace '.' with '-' for Yahoo Finance compatibility)
-nasdaq_df["Symbol"] = nasdaq_df["Symbol"].str.replace(".", "-")
-
-# ✅ Convert symbols to a list
-nasdaq_symbols = nasdaq_df["Symbol"].tolist()
-
-print(f"✅ Retrieved {len(nasdaq_symbols)} Nasdaq-100 tickers.")
-print(nasdaq_symbols[:10])  # Display first 10 symbols for verification
-
-# ✅ Convert Unix timestamps into readable date format
-def convert_timestamp(timestamp):
-    if isinstance(timestamp, (int, float)) and timestamp > 0:
-        return datetime.utcfromtimestamp(timestamp).strftime("%d-%m-%Y")
-    return "N/A"
-
-# ✅ Function to retrieve stock data
-def get_stock_data(ticker):
+from functools import partial
+from chunk_pipeline import DEFAULT_CHECKPOINT_DIR, clear_checkpoints, run_chunked
+from data_export import export_sheets
+from field_index import FieldIndex
+from nasdaq_schema import COLUMN_SPEC, build_stock_frame
+from price_history import PriceHistory
+from run_metrics import instrumented
+from snapshot_store import SnapshotStore
+from stock_screen import Field, PctRank, Screen, ZScore
+from yf_cache import InfoCache, refresh_quote_fields
+from yf_fetch import fetch_all, fetch_info
+from yf_quotes import LazyQuotes, fetch_quotes, merge_quotes
+from universe import load_universe, universe_name
+
+# ✅ Symbol source: "nasdaq100", "sp500", "russell3000" (index holdings file) or a local CSV path
+UNIVERSE = "nasdaq100"
+
+# ✅ Symbols per checkpointed chunk (a crashed or rate-limited run resumes from the last finished chunk)
+CHUNK_SIZE = 100
+
+# ✅ Fetch settings (concurrent workers, Yahoo rate limit, retries per ticker)
+MAX_WORKERS = 8
+REQUESTS_PER_SECOND = 5
+MAX_RETRIES = 3
+
+# ✅ Chunks are pipelined: chunk n is converted to DataFrame rows and checkpointed while chunk n + 1 is still downloading
+#    0 = conversion on a thread (~50 ms per chunk); > 0 = on that many processes, for very large chunks
+TRANSFORM_PROCESSES = 0
+
+# ✅ Quotes-only mode: refresh price/volume columns with one batched download
+#    (other columns come from the cache, however old, without any `.info` calls)
+QUOTES_ONLY = False
+
+# ✅ Drive the column spec from the universe's field coverage index when one was built (`mwkt info --coverage nasdaq100`):
+#    fields no ticker returns are not read or converted, timestamp units come from the observed values
+USE_FIELD_INDEX = True
+
+# ✅ Price/volume columns from the local daily-bar store (price_history.py): one batched download of new bars
+#    per run, with averages and 52-week ranges computed here (False = use Yahoo's precomputed `.info` values)
+PRICE_HISTORY = True
+
+# ✅ Download the full history again instead of only the bars since the last stored session (e.g. after a split)
+REFRESH_PRICES = False
+
+# ✅ The Parquet snapshot store is the system of record; the dated Excel file is optional
+EXPORT_EXCEL = True
+
+# ✅ Screens exported as extra Excel sheets (Field / PctRank / ZScore expressions, see stock_screen.py)
+SCREENS = {
+    "PEG under 1": Field("Trailing PEG Ratio").between(0, 1),
+    "Cheapest EV-EBITDA by Sector": PctRank("EV/EBITDA", by="Sector", where=Field("EV/EBITDA") > 0) <= 0.2,  # Negative EBITDA is not "cheap"
+    "Short Interest Outliers": ZScore("Short Percent of Float", by="Sector") > 2,
+}
+
+# ✅ Value ranking sheet: composite z-score within each sector (negative weight = lower is better)
+RANKING_WEIGHTS = {"EV/EBITDA": -1, "Trailing PEG Ratio": -1, "PE Ratio (TTM)": -0.5, "ROE (Return on Equity)": 1}
+
+# ✅ Profiler for this run: None, "cprofile" or "py-spy" (run metrics JSON is always written to ~/Downloads/MWKT_Metrics)
+PROFILE = None
+
+# ✅ Shared on-disk cache of `.info` payloads (quotes expire in minutes, fundamentals in days)
+info_cache = InfoCache()
+
+# ✅ Function to retrieve the raw `.info` dict for one stock (None if it fails)
+def get_stock_data(ticker, retries=MAX_RETRIES, requests_per_second=REQUESTS_PER_SECOND, quotes=None):
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info  # Get stock details
-
-        return {
-            "Asset Class": info.get("quoteType", "N/A"),
-            "Exchange": info.get("fullExchangeName", "N/A"),
-            "Currency": info.get("currency", "N/A"),
-            "Symbol": ticker,
-            "Company Name": info.get("shortName", "N/A"),
-            "Current Price": info.get("currentPrice", "N/A"),
-            "Market Cap": info.get("marketCap", "N/A"),
-            "PE Ratio (TTM)": info.get("trailingPE", "N/A"),
-            "Beta (5Y Monthly)": info.get("beta", "N/A"),
-            "EPS (Trailing)": info.get("trailingEps", "N/A"),
-            "EPS (Forward)": info.get("forwardEps", "N/A"), #Expected EPS for Next Quarter.
-            "EPS (Current Year)": info.get("epsCurrentYear", "N/A"), #EPS for Current Quarter.
-            "Sector": info.get("sector", "N/A"),
-            "Industry": info.get("industry", "N/A"),
-
-            # ✅ Market Prices & Changes
-            "Regular Market Price": info.get("regularMarketPrice", "N/A"),
-            "Regular Market Change Percent": info.get("regularMarketChangePercent", "N/A"),
-            "Post Market Change %": info.get("postMarketChangePercent", "N/A"),
-            "Post Market Price": info.get("postMarketPrice", "N/A"),  # Stock price in post-market trading
-            "Post Market Change": info.get("postMarketChange", "N/A"),  # Change in stock price after market close
-            "Regular Market Change": info.get("regularMarketChange", "N/A"),  # Change in stock price during regular trading
-            "Regular Market Day Range": info.get("regularMarketDayRange", "N/A"),  # Low-High range during the trading day
-
-            # ✅ 52-Week Performance
-            "52W Low": info.get("fiftyTwoWeekLow", "N/A"),
-            "52W Low Change": info.get("fiftyTwoWeekLowChange", "N/A"),  # Price change from 52-week low
-            "52W Low Change %": info.get("fiftyTwoWeekLowChangePercent", "N/A"),  # % change from 52-week low
-            "52W Range": info.get("fiftyTwoWeekRange", "N/A"),  # 52-week Low-High range
-            "52W High": info.get("fiftyTwoWeekHigh", "N/A"),
-            "52W High Change": info.get("fiftyTwoWeekHighChange", "N/A"),  # Price change from 52-week high
-            "52W High Change %": info.get("fiftyTwoWeekHighChangePercent", "N/A"),  # % change from 52-week high
-            "52W Change %": info.get("fiftyTwoWeekChangePercent", "N/A"),  # % change over the last 52 weeks
-
-            # ✅ Moving Averages & Trends
-            "50-Day Moving Average": info.get("fiftyDayAverage", "N/A"),
-            "50-Day Avg Change": info.get("fiftyDayAverageChange", "N/A"),  # Change from 50-day moving average
-            "50-Day Avg Change %": info.get("fiftyDayAverageChangePercent", "N/A"),  # % change from 50-day MA
-            "200-Day Moving Average": info.get("twoHundredDayAverage", "N/A"),
-            "200-Day Avg Change": info.get("twoHundredDayAverageChange", "N/A"),  # Change from 200-day MA
-            "200-Day Avg Change %": info.get("twoHundredDayAverageChangePercent", "N/A"),  # % change from 200-day MA
-
-            # ✅ Volume 
-            "Volume": info.get("volume", "N/A"),
-            "Regular Market Volume": info.get("regularMarketVolume", "N/A"),
-            "Average Volume": info.get("averageVolume", "N/A"),
-            "Average Volume (10 days)": info.get("averageVolume10days", "N/A"),
-            "Average Daily Volume (10 days)": info.get("averageDailyVolume10Day", "N/A"),
-            
-            # ✅ Stock Trading Metrics
-            "Bid": info.get("bid", "N/A"),
-            "Ask": info.get("ask", "N/A"),
-            "Bid Size": info.get("bidSize", "N/A"),
-            "Ask Size": info.get("askSize", "N/A"),
-
-            # ✅ Growth Estimates
-            "Earnings Growth": info.get("earningsGrowth", "N/A"),
-            "Revenue Growth": info.get("revenueGrowth", "N/A"),
-            "Earnings Quarterly Growth": info.get("earningsQuarterlyGrowth", "N/A"),
-            "Trailing PEG Ratio": info.get("trailingPegRatio", "N/A"), 
-            #PEG < 1: Undervalued 
-            #PEG = 1: Fair Value
-            #PEG > 1: Overvalued
-
-            # ✅ Revenue Margins
-            "Net Profit Margin": info.get("profitMargins", "N/A"),
-            "Gross Margins": info.get("grossMargins", "N/A"),
-            "EBITDA Margins": info.get("ebitdaMargins", "N/A"),
-            "Operating Margins": info.get("operatingMargins", "N/A"),
-
-            # ✅ Additional financial ratios [Valuation, Leverage]
-            "Enterprise Value": info.get("enterpriseValue", "N/A"),
-            "EBITDA": info.get("ebitda", "N/A"),
-            "EV/EBITDA": info.get("enterpriseToEbitda", "N/A"),
-            "Enterprise to Revenue": info.get("enterpriseToRevenue", "N/A"),
-            "Book Value": info.get("bookValue", "N/A"),
-            "Price/Book Ratio": info.get("priceToBook", "N/A"),
-            "Debt/Equity Ratio": info.get("debtToEquity", "N/A"),
-            "ROE (Return on Equity)": info.get("returnOnEquity", "N/A"),
-            "ROA (Return on Assets)": info.get("returnOnAssets", "N/A"),
-            
-            # ✅ Valuation Metrics
-            "Total Cash": info.get("totalCash", "N/A"),
-            "Total Debt": info.get("totalDebt", "N/A"),
-            "Free Cash Flow": info.get("freeCashflow", "N/A"), #Levered Free Cash Flow (Cash after servicing Debt).
-            "Operating Cash Flow": info.get("operatingCashflow", "N/A"),
-            "Total Debt": info.get("totalDebt", "N/A"),
-            "Quick Ratio": info.get("quickRatio", "N/A"),
-            "Current Ratio": info.get("currentRatio", "N/A"),
-            "Total Revenue": info.get("totalRevenue", "N/A"),
-            "Gross Profits": info.get("grossProfits", "N/A"),
-            "Cash Per Share": info.get("totalCashPerShare", "N/A"),
-            "Revenue per Share": info.get("revenuePerShare", "N/A"),
-
-            # ✅ Risk Metrics
-            "Compensation Timestamp": convert_timestamp(info.get("compensationAsOfEpochDate")),
-            "Compensation Risk": info.get("compensationRisk", "N/A"), #Executive Pay Fairness
-            "Governance Timestamp": convert_timestamp(info.get("governanceEpochDate")),
-            "Audit Risk": info.get("auditRisk", "N/A"), #Transparency of Financials
-            "Board Risk": info.get("boardRisk", "N/A"), #Effectiveness & Independence of the Board
-            "Shareholder Rights Risk": info.get("shareHolderRightsRisk", "N/A"), #Investor Protection
-            "Overall Risk": info.get("overallRisk", "N/A"), #Combined Score
-
-            # ✅ Analyst Ratings & Price Targets
-            "Target High Price": info.get("targetHighPrice", "N/A"), #Highest analyst price target
-            "Target Low Price": info.get("targetLowPrice", "N/A"), #Lowest analyst price target
-            "Target Mean Price": info.get("targetMeanPrice", "N/A"),#Average analyst price target
-            "Target Median Price": info.get("targetMedianPrice", "N/A"),
-            "Recommendation Mean": info.get("recommendationMean", "N/A"),
-            "Recommendation Key": info.get("recommendationKey", "N/A"),
-            "Number of Analyst Opinions": info.get("numberOfAnalystOpinions", "N/A"), 
-            "Average Analyst Rating": info.get("averageAnalystRating", "N/A"),
-
-            # ✅ Stock Splits & Dividends
-            "Payout Ratio": info.get("payoutRatio", "N/A"), #Payout Ratio measures how much of a company's earnings (net income) is paid out as dividends to shareholders. 
-            "Dividend Rate": info.get("dividendRate", "N/A"), #Annual dividend payout per share
-            "Dividend Yield": info.get("dividendYield", "N/A"),
-            "Five-Year Avg Dividend Yield": info.get("fiveYearAvgDividendYield", "N/A"),
-            "Last Split Factor": info.get("lastSplitFactor", "N/A"),
-            "Last Split Date": convert_timestamp(info.get("lastSplitDate")),
-            "Last Dividend Value": info.get("lastDividendValue", "N/A"),
-            "Last Dividend Date": convert_timestamp(info.get("lastDividendDate")),
-            "Ex-Dividend Date": convert_timestamp(info.get("exDividendDate")), #Last Day to Qualify for Dividend Payout
-            "Trailing Annual Dividend Rate": info.get("trailingAnnualDividendRate", "N/A"),
-            "Trailing Annual Dividend Yield": info.get("trailingAnnualDividendYield", "N/A"),
-            
-            # ✅ Date Fields (Converted)
-            "Earnings Timestamp": convert_timestamp(info.get("earningsTimestamp")),
-            "Earnings Timestamp Start": convert_timestamp(info.get("earningsTimestampStart")),
-            "Earnings Timestamp End": convert_timestamp(info.get("earningsTimestampEnd")),
-            "Earnings Call Start": convert_timestamp(info.get("earningsCallTimestampStart")),
-            "Earnings Call End": convert_timestamp(info.get("earningsCallTimestampEnd")),
-            "First Trade Date": convert_timestamp(info.get("firstTradeDateMilliseconds") / 1000),
-            "Last Fiscal Year End": convert_timestamp(info.get("lastFiscalYearEnd")),
-            "Next Fiscal Year End": convert_timestamp(info.get("nextFiscalYearEnd")),
-            "Most Recent Quarter": convert_timestamp(info.get("mostRecentQuarter")),
-
-            # ✅ Share Structure
-            "Float Shares": info.get("floatShares", "N/A"), # 🟢 Total number of shares available for trading in the public market. 
-            "Shares Outstanding": info.get("sharesOutstanding", "N/A"), # 🟢 Total number of shares issued by the company. 
-            "Shares Short": info.get("sharesShort", "N/A"),  # 🔴 Number of shares currently sold short (borrowed and sold, but not yet repurchased).
-            "Shares Short Prior Month": info.get("sharesShortPriorMonth", "N/A"),  # 🔴 Number of shares that were shorted in the prior reporting month.
-            "Shares Short Previous Month Date": convert_timestamp(info.get("sharesShortPreviousMonthDate")),   # 🔴 The date of the previous month’s short interest report.
-            "Date Short Interest": convert_timestamp(info.get("dateShortInterest")),  # 🔴 The most recent short interest reporting date.
-            "Shares Percent Shares Out": info.get("sharesPercentSharesOut", "N/A"),  # 🔴 Percentage of total outstanding shares that are shorted.
-            "Held Percent Insiders": info.get("heldPercentInsiders", "N/A"),   # 🟢 Percentage of shares held by **insiders** (e.g., executives, board members).
-            "Held Percent Institutions": info.get("heldPercentInstitutions", "N/A"),  # 🟢 Percentage of shares held by **institutional investors** (e.g., mutual funds, pension funds).
-            "Short Ratio (Days to Cover)": info.get("shortRatio", "N/A"),  # 🔴 **Short Ratio (Days to Cover)**: Number of days it would take to cover all short positions, [Shares Short / Average Daily Volume].
-            "Short Percent of Float": info.get("shortPercentOfFloat", "N/A"),  # 🔴 Percentage of the float (publicly tradable shares) that are shorted.
-            "Implied Shares Outstanding": info.get("impliedSharesOutstanding", "N/A"), # 🟢 Total **theoretical shares outstanding** including convertible securities, options, etc. 
-
-            # ✅ Business Summary
-            "Business Summary": info.get("longBusinessSummary", "N/A"),
-        }
+        # Get stock details (cached; network fetches are rate limited and retried with jittered backoff)
+        # Fundamentals and profile fields stay cached for days; expired quotes come from `quotes(ticker)` when given
+        return info_cache.get(ticker, lambda t: fetch_info(t, retries=retries, requests_per_second=requests_per_second),
+                              quotes=quotes)
     except Exception as e:
         print(f"❌ Error retrieving {ticker}: {e}")
-        return {"Symbol": ticker, "Company Name": "Error"}  # Default error data
-
-# ✅ Fetch data for all Nasdaq-100 stocks
-nasdaq_data = []
-for ticker in tqdm(nasdaq_symbols, desc="Fetching Nasdaq-100 Data", unit="stock"):
-    nasdaq_data.append(get_stock_data(ticker))
-
-# ✅ Convert data to DataFrame
-nasdaq_df = pd.DataFrame(nasdaq_data)
-
-# ✅ Get today's date in YYYY-MM-DD format (For File Naming Convention)
-current_date = datetime.today().strftime("%d-%m-%Y")
-
-# ✅ Save to Excel in Downloads Folder
-downloads_folder = os.path.join(os.path.expanduser("~"), "Downloads")
-output_file = os.path.join(downloads_folder, f"Nasdaq100_StockData_{current_date}.xlsx")
-
-with pd.ExcelWriter(output_file, engine="xlsxwriter") as writer:
-    nasdaq_df.to_excel(writer, sheet_name="Nasdaq-100 Data", index=False)
-
-print(f"✅ Stock data saved to: {output_file}")
+        return None  # Becomes the default error row in build_stock_frame
+
+# ✅ Fetch the raw `.info` dicts of one chunk of stocks (None for tickers that failed)
+def fetch_chunk(symbols, universe=UNIVERSE, quotes_only=QUOTES_ONLY, max_workers=MAX_WORKERS,
+                retries=MAX_RETRIES, requests_per_second=REQUESTS_PER_SECOND, quotes=None):
+    if quotes_only:
+        quotes = fetch_quotes(symbols) if quotes is None else quotes
+        infos = []
+        for ticker in symbols:
+            # New prices on the cached row: market cap and EV are rescaled, quote fields the download doesn't have
+            # (bid/ask, pre/post market) are dropped so a row never mixes new prices with old valuation fields
+            cached, quote = info_cache.peek(ticker), quotes.get(ticker)
+            infos.append(refresh_quote_fields(cached, quote) if cached and quote else merge_quotes(cached, quote))
+        print(f"✅ Refreshed quotes for {sum(ticker in quotes for ticker in symbols)} of {len(symbols)} tickers.")
+    else:
+        # Quote fields from the price history, else one batched download for the chunk (only if a cached ticker needs it)
+        quote_source = quotes.get if quotes is not None else LazyQuotes(symbols).get
+        infos = fetch_all(symbols, lambda ticker: get_stock_data(ticker, retries, requests_per_second, quote_source),
+                          max_workers=max_workers, desc=f"Fetching {universe} Data")
+        if quotes is not None:  # Price columns from our own history; failed tickers stay None (error rows)
+            infos = [info if info is None else merge_quotes(info, quotes.get(ticker)) for ticker, info in zip(symbols, infos)]
+
+    # A chunk where every ticker failed usually means a rate-limit ban: stop without checkpointing it
+    if all(info is None for info in infos):
+        raise RuntimeError("Every ticker in this chunk failed (rate limited?). Re-run later to resume.")
+    return infos
+
+# ✅ Whole run: the settings above are the defaults, `mwkt nasdaq100` passes its arguments here
+@instrumented("nasdaq100")
+def main(universe=UNIVERSE, chunk_size=CHUNK_SIZE, max_workers=MAX_WORKERS, requests_per_second=REQUESTS_PER_SECOND,
+         retries=MAX_RETRIES, quotes_only=QUOTES_ONLY, export_excel=EXPORT_EXCEL, output_dir=None, screens=SCREENS,
+         price_history=PRICE_HISTORY, refresh_prices=REFRESH_PRICES, use_field_index=USE_FIELD_INDEX,
+         transform_processes=TRANSFORM_PROCESSES):
+    # ✅ Load the universe (Wikipedia table, index holdings file or CSV; '.' replaced with '-' for Yahoo Finance)
+    nasdaq_symbols = load_universe(universe)
+
+    print(f"✅ Retrieved {len(nasdaq_symbols)} {universe} tickers.")
+    print(nasdaq_symbols[:10])  # Display first 10 symbols for verification
+
+    # ✅ Column spec adapted to the fields this universe actually returns
+    spec = COLUMN_SPEC
+    field_index = FieldIndex.load(universe) if use_field_index else None
+    if field_index is not None:
+        spec = field_index.column_spec(COLUMN_SPEC)
+        absent = [key for _, key, _, transform in spec if transform == "absent"]
+        print(f"✅ Field coverage index: {len(absent)} of {len(spec) - 1} fields never returned for {universe} {absent[:5]}")
+
+    # ✅ Bring the daily-bar store up to date for the whole universe, then derive every ticker's quote fields at once
+    #    (the last stored session is downloaded again on every run, so intraday runs see the current price)
+    quotes = None
+    if price_history:
+        price_store = PriceHistory(universe_name(universe))  # CSV universe: its file name
+        quotes = price_store.update(nasdaq_symbols, refresh=refresh_prices).quotes(nasdaq_symbols)
+        print(f"✅ Quote fields computed from local price history for {len(quotes)} tickers.")
+
+    # ✅ Fetch data for all stocks, chunk by chunk (finished chunks are reused when the run is restarted,
+    #    even on another day; the folder is cleared once the snapshot is written)
+    checkpoint_dir = os.path.join(DEFAULT_CHECKPOINT_DIR, f"{universe_name(universe)}_{'quotes' if quotes_only else 'info'}")
+    nasdaq_df = run_chunked(nasdaq_symbols,
+                            lambda symbols: fetch_chunk(symbols, universe, quotes_only, max_workers, retries, requests_per_second, quotes),
+                            checkpoint_dir, chunk_size,
+                            transform_chunk=partial(build_stock_frame, spec=spec),  # Declarative column spec, real NaN/NaT
+                            transform_processes=transform_processes)
+    info_cache.close()
+
+    # ✅ Append only the values that changed since the last snapshot; symbols no longer in the universe are marked removed,
+    #    failed tickers (error rows) keep their last stored values
+    snapshot_store = SnapshotStore(universe_name(universe))  # A CSV universe is stored under its file name
+    failed = nasdaq_df.loc[nasdaq_df["Company Name"] == "Error", "Symbol"]
+    changed_values = snapshot_store.write(nasdaq_df, key="Symbol", failed=failed)
+    print(f"✅ Snapshot updated: {changed_values} changed values written to {snapshot_store.path}")
+    clear_checkpoints(checkpoint_dir)
+
+    if export_excel:
+        # ✅ Get today's date in YYYY-MM-DD format (For File Naming Convention)
+        current_date = datetime.today().strftime("%d-%m-%Y")
+
+        # ✅ Save to Excel in Downloads Folder
+        downloads_folder = output_dir or os.path.join(os.path.expanduser("~"), "Downloads")
+        file_prefix = "Nasdaq100" if universe == "nasdaq100" else universe_name(universe)  # A CSV universe: its file name
+        output_file = os.path.join(downloads_folder, f"{file_prefix}_StockData_{current_date}.xlsx")
+
+        # ✅ Screens and the sector ranking are computed in-process (NumPy over the numeric columns)
+        screen = Screen(nasdaq_df)
+        # Excel sheet names: at most 31 characters, none of []:*?/\
+        data_sheet = "Nasdaq-100 Data" if universe == "nasdaq100" else re.sub(r"[\[\]:*?/\\]", "_", file_prefix)[:26] + " Data"
+        sheets = {data_sheet: nasdaq_df}
+        sheets.update({name: screen.filter(condition) for name, condition in screens.items()})
+        sheets["Sector Value Ranking"] = screen.rank(RANKING_WEIGHTS, Field("EV/EBITDA") > 0, by="Sector",  # Negative EBITDA is not "cheap"
+                                                     columns=["Company Name", *RANKING_WEIGHTS])
+
+        export_sheets(output_file, sheets)  # Streams rows (constant memory)
+
+        print(f"✅ Stock data saved to: {output_file}")
+    info_cache.report()
+
+if __name__ == "__main__":
+    main(profile=PROFILE)
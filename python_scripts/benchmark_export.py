@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from nasdaq_schema import COLUMN_SPEC
+
+ROW_COUNTS = [100, 3000, 10000]
+METHODS = ["to_excel", "streaming", "csv", "parquet"]
+
+
+# ✅ Synthetic frame with the Nasdaq-100 schema (numbers, dates, labels, long summaries)
+def make_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, _, dtype, transform in COLUMN_SPEC:
+        if transform:
+            seconds = rng.integers(315532800, 1767225600, rows)
+            columns[name] = pd.to_datetime(seconds, unit="s")
+        elif dtype == "float":
+            values = rng.normal(100, 50, rows)
+            values[rng.random(rows) < 0.05] = np.nan  # Some missing fields, like real `.info` data
+            columns[name] = values
+        elif dtype == "category":
+            columns[name] = pd.Categorical(rng.choice(["Technology", "Healthcare", "Utilities", "Energy"], rows))
+        elif name == "Business Summary":
+            columns[name] = ["Designs, manufactures and markets products worldwide. " * 20] * rows
+        else:
+            columns[name] = [f"T{i:05d}" for i in range(rows)]
+    return pd.DataFrame(columns)
+
+
+# ✅ Run one export in this process and report wall time + peak RSS
+def run_case(method, rows):
+    df = make_frame(rows)
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        if method == "to_excel":
+            with pd.ExcelWriter(os.path.join(output_dir, "out.xlsx"), engine="xlsxwriter") as writer:
+                df.to_excel(writer, sheet_name="Nasdaq-100 Data", index=False)
+        else:
+            from data_export import export_sheets
+
+            extension = {"streaming": ".xlsx", "csv": ".csv", "parquet": ".parquet"}[method]
+            export_sheets(os.path.join(output_dir, f"out{extension}"), {"Nasdaq-100 Data": df})
+        elapsed = time.perf_counter() - start
+
+    try:
+        import resource
+
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mib = peak_kib / (1024 * 1024) if sys.platform == "darwin" else peak_kib / 1024
+    except ImportError:  # Windows
+        peak_mib = float("nan")
+    print(json.dumps({"method": method, "rows": rows, "seconds": elapsed, "peak_rss_mib": peak_mib}))
+
+
+# ✅ python benchmark_export.py  (each case runs in a fresh process so peak RSS isn't shared)
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        run_case(sys.argv[1], int(sys.argv[2]))
+        sys.exit()
+
+    print(f"{'rows':>6} {'method':>10} {'seconds':>9} {'peak RSS (MiB)':>15}")
+    for rows in ROW_COUNTS:
+        for method in METHODS:
+            output = subprocess.run([sys.executable, __file__, method, str(rows)],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{rows:>6} {method:>10} {result['seconds']:>9.2f} {result['peak_rss_mib']:>15.1f}")
@@ -0,0 +1,207 @@
+import gzip
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from nasdaq_schema import COLUMN_SPEC
+from statements import STATEMENTS
+
+# ✅ Recorded-shape fixtures for the offline benchmarks (values are synthetic, seeded, and committed)
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+INFO_FILE = os.path.join(FIXTURE_DIR, "yfinance", "info.json.gz")
+STATEMENTS_FILE = os.path.join(FIXTURE_DIR, "yfinance", "statements.json.gz")
+FRED_FILE = os.path.join(FIXTURE_DIR, "macro", "fred.csv.gz")
+WORLD_BANK_FILE = os.path.join(FIXTURE_DIR, "macro", "worldbank.csv.gz")
+SCREENER_PAGE_FILE = os.path.join(FIXTURE_DIR, "morningstar", "screener_page.html")
+
+GZIP_OPTIONS = {"method": "gzip", "mtime": 0}
+
+INFO_TICKERS = 120
+STATEMENT_TICKERS = 20
+
+CATEGORIES = {
+    "quoteType": ["EQUITY"],
+    "fullExchangeName": ["NasdaqGS", "NasdaqGM", "NYSE"],
+    "currency": ["USD"],
+    "sector": ["Technology", "Healthcare", "Consumer Cyclical", "Communication Services", "Industrials", "Utilities"],
+    "industry": ["Software - Infrastructure", "Semiconductors", "Biotechnology", "Internet Retail", "Auto Manufacturers"],
+    "recommendationKey": ["strong_buy", "buy", "hold", "underperform"],
+}
+
+# Line items per statement (a realistic subset of what yfinance returns)
+LINE_ITEMS = {
+    "Income Statement": [
+        "Total Revenue", "Cost Of Revenue", "Gross Profit", "Research And Development", "Selling General And Administration",
+        "Operating Expense", "Operating Income", "Interest Expense", "Interest Income", "Other Income Expense",
+        "Pretax Income", "Tax Provision", "Net Income", "Diluted EPS", "Basic EPS", "Diluted Average Shares",
+        "EBIT", "EBITDA", "Reconciled Depreciation", "Normalized Income",
+    ],
+    "Balance Sheet": [
+        "Total Assets", "Current Assets", "Cash And Cash Equivalents", "Receivables", "Inventory", "Net PPE",
+        "Goodwill", "Total Liabilities Net Minority Interest", "Current Liabilities", "Accounts Payable",
+        "Long Term Debt", "Total Debt", "Stockholders Equity", "Retained Earnings", "Working Capital",
+        "Invested Capital", "Tangible Book Value", "Share Issued",
+    ],
+    "Cash Flow Statement": [
+        "Operating Cash Flow", "Capital Expenditure", "Free Cash Flow", "Depreciation And Amortization",
+        "Stock Based Compensation", "Change In Working Capital", "Investing Cash Flow", "Financing Cash Flow",
+        "Repurchase Of Capital Stock", "Cash Dividends Paid", "Issuance Of Debt", "Repayment Of Debt",
+        "End Cash Position", "Beginning Cash Position",
+    ],
+}
+
+FRED_SERIES = {  # series id -> observation frequency
+    "DGS10": "B", "DGS2": "B", "DTWEXBGS": "B", "SP500": "B",
+    "FEDFUNDS": "MS", "CPIAUCSL": "MS", "UNRATE": "MS", "CPILFESL": "MS", "RSXFS": "MS", "CIVPART": "MS", "JTSJOL": "MS",
+    "GFDEBTN": "QS", "GFDEGDQ188S": "QS",
+}
+WORLD_BANK_REGIONS = ["USA", "EUU", "CHN", "IND", "EAS"]
+WORLD_BANK_INDICATORS = ["GDP (current US$)", "Inflation (%)", "Unemployment Rate (%)", "Net Trade in Goods & Services (US$)"]
+
+
+def fixture_tickers(count):
+    """Deterministic, unique four-letter tickers (AAAA, AABH, AACO, ...)."""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return [letters[i // 676 % 26] + letters[i // 26 % 26] + letters[i % 26] + letters[(i * 7) % 26] for i in range(count)]
+
+
+def _info_dict(rng, ticker):
+    info = {"symbol": ticker}
+    for _, key, dtype, transform in COLUMN_SPEC:
+        if key is None or rng.random() < 0.05:  # ~5% of fields missing, like real payloads
+            continue
+        if dtype == "category":
+            info[key] = str(rng.choice(CATEGORIES[key]))
+        elif dtype == "datetime":
+            seconds = int(rng.integers(1_420_070_400, 1_790_000_000))
+            info[key] = seconds * 1000 if transform == "timestamp_ms" else seconds
+        elif dtype == "float":
+            info[key] = float(np.round(rng.lognormal(3, 2), 4)) * (1 if rng.random() < 0.85 else -1)
+        elif key == "longBusinessSummary":
+            info[key] = f"{ticker} designs, manufactures and markets products worldwide. " * 10
+        elif key == "shortName":
+            info[key] = f"{ticker} Holdings Inc."
+        else:
+            low = round(float(rng.uniform(10, 400)), 2)
+            info[key] = f"{low} - {round(low * float(rng.uniform(1.01, 1.6)), 2)}"
+    info["companyOfficers"] = [{"name": f"Officer {i}", "title": "Director", "age": int(rng.integers(35, 75))} for i in range(5)]
+    return info
+
+
+def _statement_frame(rng, name, quarterly):
+    base = name.replace("Quarterly ", "")
+    periods = (pd.date_range(end="2025-09-30", periods=5, freq="QE") if quarterly
+               else pd.date_range(end="2024-12-31", periods=4, freq="YE"))[::-1]  # Newest first, like yfinance
+    scale = 2.5e8 if quarterly else 1e9
+    values = np.round(rng.lognormal(0, 1, (len(LINE_ITEMS[base]), len(periods))) * scale, -3)
+    return pd.DataFrame(values, index=LINE_ITEMS[base], columns=periods)
+
+
+def _write_json(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:  # mtime=0: byte-identical reruns
+        f.write(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+# ✅ Regenerate every fixture file: python benchmark_fixtures.py
+def make_fixtures(seed=42):
+    rng = np.random.default_rng(seed)
+    _write_json(INFO_FILE, {ticker: _info_dict(rng, ticker) for ticker in fixture_tickers(INFO_TICKERS)})
+
+    statements = {}
+    for ticker in fixture_tickers(STATEMENT_TICKERS):
+        statements[ticker] = {}
+        for name in STATEMENTS:
+            frame = _statement_frame(rng, name, name.startswith("Quarterly"))
+            statements[ticker][name] = {"index": list(frame.index), "columns": [str(c.date()) for c in frame.columns],
+                                        "data": frame.to_numpy().tolist()}
+    _write_json(STATEMENTS_FILE, statements)
+
+    parts = []
+    for series_id, freq in FRED_SERIES.items():
+        dates = pd.date_range("2000-01-01", "2025-09-30", freq=freq)
+        walk = 100 + np.cumsum(rng.normal(0, 1, len(dates)))
+        parts.append(pd.DataFrame({"series_id": series_id, "date": dates, "value": np.round(walk, 4)}))
+    os.makedirs(os.path.dirname(FRED_FILE), exist_ok=True)
+    pd.concat(parts).to_csv(FRED_FILE, index=False, compression=GZIP_OPTIONS)
+
+    years = pd.date_range("2000-01-01", "2024-01-01", freq="YS")
+    world_bank = [pd.DataFrame({"region": region, "indicator": indicator, "date": years,
+                                "value": np.round(rng.lognormal(2, 1, len(years)), 4)})
+                  for region in WORLD_BANK_REGIONS for indicator in WORLD_BANK_INDICATORS]
+    pd.concat(world_bank).to_csv(WORLD_BANK_FILE, index=False, compression=GZIP_OPTIONS)
+
+
+def load_infos():
+    """{ticker: `.info` dict} for INFO_TICKERS tickers."""
+    with gzip.open(INFO_FILE, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_statements():
+    """{ticker: {statement name: DataFrame}} shaped like yfinance's statement attributes."""
+    with gzip.open(STATEMENTS_FILE, "rt", encoding="utf-8") as f:
+        payload = json.load(f)
+    return {
+        ticker: {name: pd.DataFrame(frame["data"], index=frame["index"], columns=pd.to_datetime(frame["columns"]))
+                 for name, frame in statements.items()}
+        for ticker, statements in payload.items()
+    }
+
+
+def load_fred_series():
+    """{series id: Series}, as `Fred.get_series` returns them."""
+    frame = pd.read_csv(FRED_FILE, parse_dates=["date"])
+    return {series_id: group.set_index("date")["value"].rename(None) for series_id, group in frame.groupby("series_id")}
+
+
+def load_world_bank():
+    """{region code: DataFrame of indicators by year}, as `wbdata.get_dataframe` returns them."""
+    frame = pd.read_csv(WORLD_BANK_FILE, parse_dates=["date"])
+    return {region: group.pivot(index="date", columns="indicator", values="value")
+            for region, group in frame.groupby("region")}
+
+
+def synthetic_bars(tickers, sessions=504, seed=7):
+    """Daily OHLCV bars shaped like `yf.download(..., group_by="column")` (generated, not stored: too large to commit)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2025-09-30", periods=sessions)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, (sessions, len(tickers))), axis=0))
+    spread = rng.uniform(0, 0.02, (sessions, len(tickers)))
+    fields = {"Open": close * (1 + rng.normal(0, 0.005, close.shape)), "High": close * (1 + spread),
+              "Low": close * (1 - spread), "Close": close, "Adj Close": close,
+              "Volume": rng.integers(100_000, 50_000_000, close.shape).astype("float64")}
+    return pd.concat({field: pd.DataFrame(values, index=dates, columns=tickers) for field, values in fields.items()}, axis=1)
+
+
+def load_screener_page():
+    with open(SCREENER_PAGE_FILE, encoding="utf-8") as f:
+        return f.read()
+
+
+# ✅ Local stand-ins for the network providers, serving fixture data
+class FixtureInfoProvider:
+    """Drop-in `provider` for `fetch_info`: returns a copy of the recorded `.info` dict."""
+
+    def __init__(self, infos):
+        self.infos = infos
+
+    def __call__(self, ticker):
+        return dict(self.infos[ticker])
+
+
+def fixture_statement_provider(statements):
+    """Drop-in `statement_provider` for `fetch_statements`."""
+    names = {attribute: name for name, attribute in STATEMENTS.items()}
+
+    def provider_for(attribute):
+        return lambda ticker: statements[ticker][names[attribute]]
+    return provider_for
+
+
+if __name__ == "__main__":
+    make_fixtures()
+    for path in (INFO_FILE, STATEMENTS_FILE, FRED_FILE, WORLD_BANK_FILE):
+        print(f"✅ {os.path.relpath(path, FIXTURE_DIR)}: {os.path.getsize(path) / 1024:.0f} KiB")
@@ -0,0 +1,380 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import cached_property
+
+import benchmark_fixtures as fx
+
+# ✅ Offline benchmark suite: every pipeline stage timed against the committed fixtures, no network
+#    python benchmark_suite.py                          -> table of timings
+#    python benchmark_suite.py --json out.json          -> save results (pytest-benchmark style JSON)
+#    python benchmark_suite.py --compare baseline.json  -> exit 1 if any stage is slower than the threshold
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register `setup(fixtures, work_dir) -> run()`; only `run` is timed.
+    `work_dir` is an empty temporary folder, deleted once the benchmark has finished."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class Fixtures:
+    """Fixture data, loaded on first use and shared by all benchmarks."""
+
+    @cached_property
+    def infos(self):
+        return fx.load_infos()
+
+    @cached_property
+    def statements(self):
+        return fx.load_statements()
+
+    @cached_property
+    def fred(self):
+        return fx.load_fred_series()
+
+    @cached_property
+    def world_bank(self):
+        return fx.load_world_bank()
+
+    @cached_property
+    def screener_table_html(self):
+        page = fx.load_screener_page()
+        start = page.index("<table")
+        return page[start:page.index("</table>", start) + len("</table>")]
+
+    @cached_property
+    def stock_frame(self):
+        from nasdaq_schema import build_stock_frame
+        return build_stock_frame(list(self.infos), list(self.infos.values()))
+
+    @cached_property
+    def stacked_statements(self):
+        from statements import stack_statements
+        return stack_statements(self.statements)
+
+    @cached_property
+    def ttm_table(self):
+        from ttm import compute_ttm
+        return compute_ttm(self.stacked_statements)
+
+    @cached_property
+    def charts(self):
+        charts = [(data[indicator], f"{region} - {indicator}", indicator, "blue")
+                  for region, data in self.world_bank.items() for indicator in data.columns]
+        return charts + [(series, f"USA - {series_id}", series_id, "red") for series_id, series in self.fred.items()]
+
+
+# ---------------------------------------------------------------- yfinance `.info` (nasdaq100 / info scripts)
+
+@benchmark("info.fetch_all_cold_cache")
+def bench_fetch_cold(f, work_dir):
+    from yf_cache import InfoCache
+    from yf_fetch import fetch_all, fetch_info
+    provider = fx.FixtureInfoProvider(f.infos)
+
+    def run():
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = InfoCache(cache_dir)
+            fetch_all(list(f.infos), lambda t: cache.get(t, lambda t: fetch_info(t, provider, requests_per_second=0)))
+            cache.close()
+    return run
+
+
+@benchmark("info.cache_hits")
+def bench_cache_hits(f, work_dir):
+    from yf_cache import InfoCache
+    cache = InfoCache(work_dir)
+    provider = fx.FixtureInfoProvider(f.infos)
+    for ticker in f.infos:
+        cache.get(ticker, provider)
+    return lambda: [cache.get(ticker, provider) for ticker in f.infos]
+
+
+@benchmark("nasdaq100.build_stock_frame")
+def bench_build_stock_frame(f, work_dir):
+    from nasdaq_schema import build_stock_frame
+    symbols, infos = list(f.infos), list(f.infos.values())
+    return lambda: build_stock_frame(symbols, infos)
+
+
+@benchmark("nasdaq100.screen_3600_names")
+def bench_screen(f, work_dir):
+    import pandas as pd
+    from stock_screen import Field, PctRank, Screen, ZScore
+    frame = pd.concat([f.stock_frame] * 30, ignore_index=True)  # A Russell 3000-sized universe
+    condition = (PctRank("EV/EBITDA", by="Sector") <= 0.2) | (ZScore("Short Percent of Float", by="Industry") > 2)
+    weights = {"EV/EBITDA": -1, "Trailing PEG Ratio": -1, "ROE (Return on Equity)": 1}
+
+    def run():
+        screen = Screen(frame)  # Fresh indexes and memo each round
+        screen.filter(condition & Field("Trailing PEG Ratio").notna())
+        return screen.rank(weights, by="Sector", top=10)
+    return run
+
+
+@benchmark("prices.quotes_3000_tickers")
+def bench_price_quotes(f, work_dir):
+    from price_history import PriceHistory
+    store = PriceHistory("bench", work_dir)
+    store.write(fx.synthetic_bars(fx.fixture_tickers(3000)))
+    return store.quotes
+
+
+@benchmark("prices.moving_average_3000_tickers")
+def bench_moving_average(f, work_dir):
+    from price_history import PriceHistory
+    store = PriceHistory("bench", work_dir)
+    store.write(fx.synthetic_bars(fx.fixture_tickers(3000)))
+    return lambda: store.moving_average(200)
+
+
+# ---------------------------------------------------------------- Financial statements (3fs script)
+
+@benchmark("3fs.fetch_statements")
+def bench_fetch_statements(f, work_dir):
+    from statements import fetch_statements
+    provider = fx.fixture_statement_provider(f.statements)
+    return lambda: fetch_statements(list(f.statements), requests_per_second=0, statement_provider=provider)
+
+
+@benchmark("3fs.stack_statements")
+def bench_stack_statements(f, work_dir):
+    from statements import stack_statements
+    return lambda: stack_statements(f.statements)
+
+
+@benchmark("3fs.compute_ttm")
+def bench_compute_ttm(f, work_dir):
+    from ttm import compute_ttm
+    stacked = f.stacked_statements
+    return lambda: compute_ttm(stacked)
+
+
+@benchmark("3fs.format_statement")
+def bench_format_statement(f, work_dir):
+    from statements import workbook_sheets
+    ttm_table = f.ttm_table
+
+    def run():
+        for ticker, statements in f.statements.items():
+            workbook_sheets(ticker, statements, ttm_table)
+    return run
+
+
+@benchmark("3fs.pipeline_workbooks")
+def bench_pipeline_workbooks(f, work_dir):
+    from data_export import export_sheets
+    from pipeline import Pipeline
+    from statements import fetch_ticker_statements, ticker_workbook
+    provider = fx.fixture_statement_provider(f.statements)
+
+    def run():
+        # Fetch -> per-ticker TTM and formatting -> Excel, overlapped (transforms on threads: no pool start-up in the timing)
+        pipeline = Pipeline("bench", processes=0)
+        pipeline.source("tickers", list(f.statements))
+        pipeline.stage("fetch", lambda ticker: (ticker, ticker, fetch_ticker_statements(ticker, 0, statement_provider=provider)[0]),
+                       after="tickers", workers=2)
+        pipeline.stage("transform", ticker_workbook, after="fetch", processes=True)
+        pipeline.stage("export", lambda item: export_sheets(os.path.join(work_dir, f"{item[0]}.xlsx"), item[2]), after="transform")
+        return pipeline.run()
+    return run
+
+
+# ---------------------------------------------------------------- Macro report
+
+@benchmark("macro.series_cache_cold")
+def bench_series_cache(f, work_dir):
+    from series_cache import SeriesCache
+    start, end = datetime(2000, 1, 1), datetime(2025, 9, 30)
+
+    def run():
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = SeriesCache(cache_dir)
+            for series_id, series in f.fred.items():
+                cache.get("fred", series_id, start, end, lambda s, e, series=series: series[s:e])
+    return run
+
+
+@benchmark("macro.panel_align")
+def bench_macro_panel(f, work_dir):
+    from macro_panel import MacroPanel, spread, yoy
+    start, end = datetime(2000, 1, 1), datetime(2025, 9, 30)
+
+    def run():
+        panel = MacroPanel("ME", start, end)
+        for series_id, series in f.fred.items():
+            panel.add(series_id, series, how="mean" if series_id.startswith("DGS") else "last")
+        for region, data in f.world_bank.items():
+            for indicator in data.columns:
+                panel.add(f"{region} - {indicator}", data[indicator])
+        panel.derive("Spread", spread("DGS10", "DGS2")).derive("CPI YoY", yoy("CPIAUCSL"))
+        return panel.frame(), panel.at("B").series("Spread")
+    return run
+
+
+@benchmark("macro.plot_series")
+def bench_plot_series(f, work_dir):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from report_render import PAGE_SIZE, plot_series
+    figure = Figure(figsize=PAGE_SIZE)
+    FigureCanvasAgg(figure)
+    axes = figure.subplots(2, 2).ravel()
+    charts = f.charts
+
+    def run():
+        for i, (data, title, ylabel, color) in enumerate(charts):
+            plot_series(axes[i % len(axes)], data, title, ylabel, color)
+    return run
+
+
+@benchmark("macro.render_pages")
+def bench_render_pages(f, work_dir):
+    from report_render import render_pages
+    output_file = os.path.join(work_dir, "report.pdf")
+    return lambda: render_pages(f.charts, output_file)
+
+
+# ---------------------------------------------------------------- Morningstar screener
+
+@benchmark("morningstar.scrape_table")
+def bench_scrape_table(f, work_dir):
+    from screener_table import TableAccumulator
+    table_html = f.screener_table_html
+
+    def run():
+        accumulator = TableAccumulator()
+        for _ in range(10):
+            accumulator.add_page(table_html)
+        return accumulator.to_frame()
+    return run
+
+
+@benchmark("morningstar.api_stub_server")
+def bench_screener_api(f, work_dir):
+    from morningstar_api import ScreenerClient
+    from morningstar_stub_server import start_stub_server
+    server, api_url = start_stub_server()  # Daemon thread, lives until the suite exits
+    client = ScreenerClient(api_url=api_url, page_size=5, max_workers=4)
+    return client.fetch_all_tabs
+
+
+# ---------------------------------------------------------------- Excel exports
+
+@benchmark("export.nasdaq100_excel")
+def bench_export_nasdaq(f, work_dir):
+    from data_export import write_excel
+    output_file = os.path.join(work_dir, "stocks.xlsx")
+    frame = f.stock_frame
+    return lambda: write_excel(output_file, {"Nasdaq-100 Data": frame})
+
+
+@benchmark("export.statements_excel")
+def bench_export_statements(f, work_dir):
+    from data_export import write_excel
+    output_file = os.path.join(work_dir, "financials.xlsx")
+    ticker = next(iter(f.statements))
+    sheets = {name: f.statements[ticker][name].reset_index() for name in ("Income Statement", "Balance Sheet", "Cash Flow Statement")}
+    return lambda: write_excel(output_file, sheets)
+
+
+# ---------------------------------------------------------------- Runner
+
+def time_rounds(run, min_rounds=5, min_time=1.0, max_rounds=1000):
+    """Warm up once, then time rounds until both `min_rounds` and `min_time` are reached."""
+    run()
+    timings, started = [], time.perf_counter()
+    while len(timings) < max_rounds and (len(timings) < min_rounds or time.perf_counter() - started < min_time):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings), "max": max(timings), "mean": statistics.fmean(timings),
+        "median": statistics.median(timings), "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rounds": len(timings),
+    }
+
+
+def machine_info():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system(),
+            "cpu_count": os.cpu_count(), "commit": commit, "datetime": datetime.now().isoformat(timespec="seconds")}
+
+
+def run_suite(names, min_rounds=5, min_time=1.0):
+    fixtures, results = Fixtures(), {}
+    for number, name in enumerate(names, start=1):
+        # Progress bars and reports from the pipeline code would drown the table
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()), \
+                tempfile.TemporaryDirectory() as work_dir:
+            stats = time_rounds(BENCHMARKS[name](fixtures, work_dir), min_rounds, min_time)
+        results[name] = stats
+        print(f"[{number:2d}/{len(names)}] {name:<34} {stats['median'] * 1000:10.2f} ms "
+              f"± {stats['stddev'] * 1000:.2f}  (min {stats['min'] * 1000:.2f}, {stats['rounds']} rounds)")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print median ratios against a saved run; returns the names slower than `threshold`."""
+    regressions = []
+    print(f"\n{'Benchmark':<34} {'Baseline (ms)':>14} {'Now (ms)':>10} {'Ratio':>7}")
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["median"]
+        ratio = stats["median"] / before if before else float("inf")
+        flag = "  ❌ slower" if ratio > threshold else ("  ✅ faster" if ratio < 1 / threshold else "")
+        print(f"{name:<34} {before * 1000:14.2f} {stats['median'] * 1000:10.2f} {ratio:7.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for every pipeline stage.")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--min-rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=1.0, help="Minimum seconds of timed rounds per benchmark")
+    parser.add_argument("--json", dest="json_file", help="Save results to this JSON file")
+    parser.add_argument("--compare", dest="baseline_file", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Median ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if not args.pattern or args.pattern in name]
+    results = run_suite(names, args.min_rounds, args.min_time)
+
+    if args.json_file:
+        with open(args.json_file, "w", encoding="utf-8") as f:
+            json.dump({"machine_info": machine_info(), "benchmarks": results}, f, indent=2)
+        print(f"\n✅ Results saved to {args.json_file}")
+
+    if args.baseline_file:
+        with open(args.baseline_file, encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.2f}x: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
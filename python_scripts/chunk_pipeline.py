@@ -0,0 +1,103 @@
+import functools
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from pipeline import Pipeline
+from run_metrics import metrics
+
+# ✅ Checkpoints live next to the other outputs, one folder per run
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.expanduser("~"), "Downloads", "MWKT_Checkpoints")
+
+
+def split_chunks(symbols, chunk_size):
+    return [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+
+def _chunk_file(checkpoint_dir, number, symbols):
+    # The symbol hash keeps a changed universe from reusing chunks built for a different list
+    digest = hashlib.sha1(",".join(symbols).encode()).hexdigest()[:10]
+    return os.path.join(checkpoint_dir, f"chunk-{number:05d}-{digest}.parquet")
+
+
+def _write_chunk(frame, path):
+    tmp_path = f"{path}.tmp"
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)  # Only fully written chunks count as completed
+    metrics.count_file(path)
+    return path
+
+
+def _transform_task(transform_chunk, task):
+    # Module-level so the process pool can pickle it
+    symbols, path, raw = task
+    return transform_chunk(symbols, raw), path
+
+
+# ✅ Process symbols chunk by chunk, checkpointing each finished chunk to disk
+def run_chunked(symbols, process_chunk, checkpoint_dir, chunk_size=100, transform_chunk=None, transform_processes=0):
+    """`process_chunk(symbols)` returns a DataFrame; finished chunks are skipped on the next run.
+
+    If `process_chunk` raises (crash, rate-limit ban), completed chunks stay on disk and
+    re-running with the same `checkpoint_dir` resumes from the first unfinished chunk.
+
+    With `transform_chunk(symbols, raw)` (importable, e.g. a `functools.partial` of a module function),
+    `process_chunk` only downloads and the chunks are pipelined: chunk n is converted
+    (on `transform_processes` processes, 0 = a thread) and checkpointed while chunk n + 1 downloads.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    chunks = split_chunks(list(symbols), chunk_size)
+    chunk_files = [_chunk_file(checkpoint_dir, number, chunk) for number, chunk in enumerate(chunks)]
+
+    done = sum(os.path.exists(path) for path in chunk_files)
+    if done:
+        print(f"♻️ Resuming: {done} of {len(chunks)} chunks already completed in {checkpoint_dir}")
+
+    pending = [(number, chunk, path) for number, (chunk, path) in enumerate(zip(chunks, chunk_files), start=1)
+               if not os.path.exists(path)]
+
+    def fetch(task):
+        number, chunk, path = task
+        print(f"🔄 Chunk {number} of {len(chunks)} ({len(chunk)} symbols)...")
+        with metrics.stage("chunk.process"):
+            return chunk, path, process_chunk(chunk)
+
+    if transform_chunk is None:
+        for task in pending:
+            _, path, frame = fetch(task)
+            _write_chunk(frame, path)
+    elif pending:
+        pipeline = Pipeline("chunks", queue_size=2, processes=transform_processes)  # At most 2 raw chunks held in memory
+        pipeline.source("chunks", pending)
+        pipeline.stage("fetch", fetch, after="chunks")
+        pipeline.stage("transform", functools.partial(_transform_task, transform_chunk), after="fetch",
+                       workers=max(transform_processes, 1), processes=True)
+        pipeline.stage("checkpoint", lambda item: _write_chunk(*item), after="transform")
+        pipeline.run(total=len(pending), desc="Chunks")
+        pipeline.report()
+
+    with open(os.path.join(checkpoint_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"symbols": len(symbols), "chunk_size": chunk_size,
+                   "chunks": [os.path.basename(path) for path in chunk_files]}, f, indent=2)
+    return combine_chunks(chunk_files)
+
+
+# ✅ Drop a run's checkpoints once its output is safely stored (the next run starts fresh)
+def clear_checkpoints(checkpoint_dir):
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+
+
+# ✅ Read the finished chunk files back as one DataFrame
+def combine_chunks(chunk_files):
+    if not chunk_files:
+        return pd.DataFrame()
+    frames = [pd.read_parquet(path) for path in chunk_files]
+    combined = pd.concat(frames, ignore_index=True)
+    # Chunks with different category sets concatenate to object columns; restore them
+    for column, dtype in frames[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            combined[column] = combined[column].astype("category")
+    return combined
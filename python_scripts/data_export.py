@@ -0,0 +1,134 @@
+import os
+from datetime import date, datetime
+
+import pandas as pd
+
+from run_metrics import metrics
+
+DATE_FORMAT = "dd-mm-yyyy"
+MAX_COLUMN_WIDTH = 60
+WIDTH_SAMPLE_ROWS = 200  # Rows sampled to size each column
+ROW_CHUNK = 5000  # Rows converted to Python values at a time (memory stays flat however long the sheet is)
+
+
+def _header_text(column):
+    if isinstance(column, (datetime, date)):
+        return column.strftime("%Y-%m-%d")  # Statement period headers
+    return str(column)
+
+
+# ✅ Turn one DataFrame column into (python values with None for missing, column kind)
+def _column_values(column):
+    missing = column.isna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(column):
+        values = column.dt.tz_localize(None).dt.to_pydatetime() if column.dt.tz is not None else column.dt.to_pydatetime()
+        kind = "datetime"
+    elif pd.api.types.is_bool_dtype(column):
+        values = column.to_numpy(dtype=object)
+        kind = "bool"
+    elif pd.api.types.is_numeric_dtype(column):
+        values = column.to_numpy(dtype="float64", na_value=float("nan")).tolist()
+        kind = "number"
+    else:
+        values = column.to_numpy(dtype=object)
+        kind = "other"
+    values = list(values)
+    for i in missing.nonzero()[0]:
+        values[i] = None
+    return values, kind
+
+
+def _generic_writer(worksheet):
+    def write(row, col, value):
+        if isinstance(value, (str, int, float, datetime, date)):
+            worksheet.write(row, col, value)
+        else:
+            worksheet.write_string(row, col, str(value))  # Lists/dicts (e.g. companyOfficers) as text
+    return write
+
+
+def _column_width(header, values):
+    sample = [len(str(v)) for v in values[:WIDTH_SAMPLE_ROWS] if v is not None]
+    return min(max([len(header)] + sample) + 2, MAX_COLUMN_WIDTH)
+
+
+# ✅ Stream one DataFrame into a worksheet row by row (formats/widths set once per column)
+def write_sheet(workbook, sheet_name, df, number_formats=None, date_format=DATE_FORMAT):
+    worksheet = workbook.add_worksheet(sheet_name[:31])  # Excel caps sheet names at 31 characters
+    header_format = workbook.add_format({"bold": True})
+    date_cell_format = workbook.add_format({"num_format": date_format})
+    number_formats = number_formats or {}
+
+    headers = [_header_text(c) for c in df.columns]
+    sample = [_column_values(df.iloc[:WIDTH_SAMPLE_ROWS, col]) for col in range(df.shape[1])]
+    writers = []
+    for col, (header, (values, kind)) in enumerate(zip(headers, sample)):
+        # Column formats apply to every unformatted cell, so no per-cell format objects are needed
+        if kind == "datetime":
+            cell_format = date_cell_format
+        elif header in number_formats:
+            cell_format = workbook.add_format({"num_format": number_formats[header]})
+        else:
+            cell_format = None
+        worksheet.set_column(col, col, _column_width(header, values), cell_format)
+        writers.append({
+            "datetime": worksheet.write_datetime,
+            "number": worksheet.write_number,
+            "bool": worksheet.write_boolean,
+        }.get(kind) or _generic_writer(worksheet))
+
+    # constant_memory mode needs rows in order: header first, then each data row
+    worksheet.write_row(0, 0, headers, header_format)
+    for start in range(0, len(df), ROW_CHUNK):
+        block = df.iloc[start:start + ROW_CHUNK]
+        value_lists = [_column_values(block.iloc[:, col])[0] for col in range(block.shape[1])]
+        for row, row_values in enumerate(zip(*value_lists), start=start + 1):
+            for col, value in enumerate(row_values):
+                if value is not None:
+                    writers[col](row, col, value)
+    return worksheet
+
+
+# ✅ Write several DataFrames to one workbook, streaming with xlsxwriter's constant_memory mode
+def write_excel(output_file, sheets, number_formats=None, date_format=DATE_FORMAT, constant_memory=True):
+    import xlsxwriter
+
+    # ±inf (e.g. a ratio over zero) is written as an Excel #NUM!/#DIV/0! error instead of failing the export
+    workbook = xlsxwriter.Workbook(output_file, {"constant_memory": constant_memory, "strings_to_urls": False,
+                                                 "nan_inf_to_errors": True})
+    try:
+        for sheet_name, df in sheets.items():
+            write_sheet(workbook, sheet_name, df, number_formats, date_format)
+    finally:
+        workbook.close()
+    return output_file
+
+
+# ✅ Export {sheet name: DataFrame} as .xlsx, .csv or .parquet (CSV/Parquet get one file per sheet)
+def export_sheets(output_file, sheets, **excel_options):
+    extension = os.path.splitext(output_file)[1].lower()
+    with metrics.stage(f"export{extension}"):
+        written = _export_sheets(output_file, sheets, **excel_options)
+    for path in written:
+        metrics.count_file(path)
+    return written
+
+
+def _export_sheets(output_file, sheets, **excel_options):
+    stem, extension = os.path.splitext(output_file)
+    extension = extension.lower()
+    if extension == ".xlsx":
+        return [write_excel(output_file, sheets, **excel_options)]
+    if extension not in (".csv", ".parquet"):
+        raise ValueError(f"Unsupported export format: {extension}")
+
+    written = []
+    for sheet_name, df in sheets.items():
+        path = output_file if len(sheets) == 1 else f"{stem} - {sheet_name}{extension}"
+        df = df.rename(columns=_header_text)  # Parquet needs string column names
+        if extension == ".csv":
+            df.to_csv(path, index=False)
+        else:
+            df.to_parquet(path, index=False)
+        written.append(path)
+    return written
@@ -0,0 +1,149 @@
+import os
+import re
+from numbers import Number
+
+import numpy as np
+import pandas as pd
+
+from run_metrics import metrics
+from universe import universe_name
+
+# ✅ One index per universe, next to the `.info` cache
+DEFAULT_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mwkt", "field_index")
+
+# ✅ Integer fields are only treated as timestamps when the key looks like a date (marketCap is not a date)
+DATE_KEY = re.compile(r"date|time|epoch|yearend|quarter", re.IGNORECASE)
+EPOCH_RANGES = {"s": (1e8, 1e10), "ms": (1e11, 1e13)}  # 1973-2286 in seconds or milliseconds
+
+
+def value_type(value):
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, Number):
+        return "float"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, (list, tuple)):
+        return "list"
+    if isinstance(value, dict):
+        return "dict"
+    return "mixed"
+
+
+def infer_field(key, values):
+    """(type, timestamp unit or "") for every observed value of one field."""
+    types = {value_type(value) for value in values}
+    if types <= {"int", "float"} and DATE_KEY.search(key):
+        epochs = [value for value in values if value > 0]  # Zero / negative epochs are placeholders
+        for unit, (low, high) in EPOCH_RANGES.items():
+            if epochs and all(low <= value < high for value in epochs):
+                return "timestamp", unit
+    if types == {"int", "float"}:
+        return "float", ""
+    return (types.pop() if len(types) == 1 else "mixed"), ""
+
+
+# ✅ Sparse field x ticker coverage (CSR layout: per field, the sorted positions of tickers that have it)
+class FieldIndex:
+    """Which `.info` fields each ticker of a universe actually returns, with type, timestamp unit and fill rate."""
+
+    def __init__(self, tickers, fields, indptr, indices, types, units):
+        self.tickers = [str(ticker) for ticker in tickers]
+        self.fields = [str(field) for field in fields]
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.types = dict(zip(self.fields, map(str, types)))
+        self.units = dict(zip(self.fields, map(str, units)))
+        self.position = {field: i for i, field in enumerate(self.fields)}
+
+    @classmethod
+    @metrics.timed("field_index.build")
+    def build(cls, infos):
+        """`infos` maps ticker -> `.info` dict (None for tickers that failed, which count as having no fields)."""
+        tickers = list(infos)
+        present, observed = {}, {}
+        for position, ticker in enumerate(tickers):
+            for key, value in (infos[ticker] or {}).items():
+                if value is None or (isinstance(value, float) and value != value):
+                    continue
+                present.setdefault(key, []).append(position)
+                observed.setdefault(key, []).append(value)
+        fields = sorted(present)
+        indptr = np.cumsum([0] + [len(present[field]) for field in fields])
+        indices = np.concatenate([present[field] for field in fields]) if fields else []
+        inferred = [infer_field(field, observed[field]) for field in fields]
+        return cls(tickers, fields, indptr, indices, [t for t, _ in inferred], [u for _, u in inferred])
+
+    # ---- persistence ----
+
+    @staticmethod
+    def path_for(universe, root=DEFAULT_INDEX_DIR):
+        return os.path.join(root, f"{universe_name(universe)}.npz")
+
+    def save(self, universe, root=DEFAULT_INDEX_DIR):
+        os.makedirs(root, exist_ok=True)
+        path = self.path_for(universe, root)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, tickers=np.array(self.tickers, dtype=str), fields=np.array(self.fields, dtype=str),
+                            indptr=self.indptr, indices=self.indices,
+                            types=np.array([self.types[f] for f in self.fields], dtype=str),
+                            units=np.array([self.units[f] for f in self.fields], dtype=str))
+        os.replace(tmp_path, path)
+        metrics.count_file(path)
+        return path
+
+    @classmethod
+    def load(cls, universe, root=DEFAULT_INDEX_DIR):
+        """The saved index for `universe`, or None if it was never built."""
+        path = cls.path_for(universe, root)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["tickers"], data["fields"], data["indptr"], data["indices"], data["types"], data["units"])
+
+    # ---- queries ----
+
+    def count(self, field):
+        i = self.position.get(field)
+        return 0 if i is None else int(self.indptr[i + 1] - self.indptr[i])
+
+    def fill_rate(self, field):
+        return self.count(field) / len(self.tickers) if self.tickers else 0.0
+
+    def tickers_with(self, field):
+        i = self.position.get(field)
+        return [] if i is None else [self.tickers[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def timestamp_unit(self, field):
+        """Detected unit: "s", "ms" or None."""
+        return self.units.get(field) or None
+
+    def timestamp_fields(self):
+        return {field: unit for field, unit in self.units.items() if unit}
+
+    def coverage(self):
+        """One row per field: type, timestamp unit, tickers present and fill rate (most complete first)."""
+        counts = np.diff(self.indptr)
+        frame = pd.DataFrame({
+            "Field": self.fields,
+            "Type": [self.types[f] for f in self.fields],
+            "Timestamp Unit": [self.units[f] for f in self.fields],
+            "Tickers": counts,
+            "Fill Rate": counts / max(len(self.tickers), 1),
+        })
+        return frame.sort_values(["Fill Rate", "Field"], ascending=[False, True], ignore_index=True)
+
+    def column_spec(self, spec, min_fill_rate=0.0):
+        """Adapt a (name, key, dtype, transform) column spec to this universe: keys no ticker returns
+        (or below `min_fill_rate`) become "absent" (not read, left empty), and timestamp columns use the detected unit."""
+        adapted = []
+        for name, key, dtype, transform in spec:
+            if key is not None:
+                if self.count(key) == 0 or self.fill_rate(key) < min_fill_rate:
+                    transform = "absent"
+                elif dtype == "datetime" and self.timestamp_unit(key):
+                    transform = f"timestamp_{self.timestamp_unit(key)}"
+            adapted.append((name, key, dtype, transform))
+        return adapted
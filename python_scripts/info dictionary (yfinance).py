@@ -1,25 +1,40 @@
 import os
-import yfinance as yf
 import pandas as pd
 from datetime import datetime
+from data_export import export_sheets
+from field_index import FieldIndex
+from run_metrics import instrumented
+from snapshot_store import SnapshotStore
+from universe import load_universe, universe_name
+from yf_cache import InfoCache
+from yf_fetch import fetch_all, fetch_info
 
 # ✅ Choose a stock symbol
 ticker = "AAPL"  # Change this if needed
-stock = yf.Ticker(ticker)
 
-# ✅ Get all available fields from yfinance
-stock_info = stock.info
+# ✅ Coverage mode: a universe ("nasdaq100", "sp500", "russell3000" or a CSV path) to fetch `.info` for every symbol
+#    and save which fields exist, their types and timestamp units (field_index.py; used by the Nasdaq-100 script)
+COVERAGE_UNIVERSE = None
+MAX_WORKERS = 8
+
+# ✅ The Parquet snapshot store is the system of record; the dated Excel file is optional
+EXPORT_EXCEL = True
+
+# ✅ Profiler for this run: None, "cprofile" or "py-spy" (run metrics JSON is always written to ~/Downloads/MWKT_Metrics)
+PROFILE = None
+
+info_cache = InfoCache()
 
 # ✅ Function to convert Unix timestamps to human-readable date format
-def convert_timestamp(value):
+def convert_timestamp(value, unit=None):
     if isinstance(value, (int, float)) and value > 0:
-        # Convert milliseconds to seconds if needed
-        if value > 10**10:  # If value is too large, it's in milliseconds
+        # Convert milliseconds to seconds if needed (unit from the coverage index, else guessed from the size)
+        if unit == "ms" or (unit is None and value > 10**10):
             value = value / 1000
         return datetime.utcfromtimestamp(value).strftime("%d-%m-%Y")  # Convert to dd-mm-yyyy
     return value  # Return original if not a timestamp
 
-# ✅ Convert all Unix timestamp fields
+# ✅ Convert all Unix timestamp fields (fallback when no coverage index has been built)
 date_fields = [
     "dividendDate", "earningsTimestamp", "earningsTimestampStart", "earningsTimestampEnd",
     "earningsCallTimestampStart", "earningsCallTimestampEnd", "exDividendDate",
@@ -28,22 +43,74 @@ date_fields = [
     "compensationAsOfEpochDate", "firstTradeDateMilliseconds", "lastSplitDate"
 ]
 
-for field in date_fields:
-    if field in stock_info:
-        stock_info[field] = convert_timestamp(stock_info[field])
+# ✅ Fetch `.info` for a whole universe and save its field coverage index
+def build_coverage(universe, max_workers=MAX_WORKERS, export_excel=EXPORT_EXCEL, output_dir=None):
+    def get_info(symbol):
+        try:
+            return info_cache.get(symbol, fetch_info, groups=["fundamentals"])  # Field presence, not live quotes
+        except Exception as e:
+            print(f"❌ Error retrieving {symbol}: {e}")
+            return None  # Counts as a ticker with no fields
+
+    symbols = load_universe(universe)
+    infos = fetch_all(symbols, get_info, max_workers=max_workers, desc=f"Fetching {universe} .info")
+    field_index = FieldIndex.build(dict(zip(symbols, infos)))
+    index_path = field_index.save(universe)
+    coverage = field_index.coverage()
+    print(f"✅ {len(field_index.fields)} fields across {len(symbols)} tickers "
+          f"({(coverage['Fill Rate'] == 1).sum()} in every ticker, {len(field_index.timestamp_fields())} timestamps). "
+          f"Index saved to {index_path}")
+
+    if export_excel:
+        downloads_folder = output_dir or os.path.join(os.path.expanduser("~"), "Downloads")
+        output_file = os.path.join(downloads_folder, f"{universe_name(universe)}_FieldCoverage_{datetime.today():%Y-%m-%d}.xlsx")
+        export_sheets(output_file, {"Field Coverage": coverage})
+        print(f"✅ Field coverage saved to: {output_file}")
+    return field_index
+
+# ✅ Whole run for one or more tickers: `mwkt info` passes its arguments here
+@instrumented("info")
+def main(tickers=None, export_excel=EXPORT_EXCEL, output_dir=None, coverage_universe=COVERAGE_UNIVERSE,
+         max_workers=MAX_WORKERS):
+    if coverage_universe:
+        build_coverage(coverage_universe, max_workers, export_excel, output_dir)
+    if tickers is None:
+        tickers = () if coverage_universe else (ticker,)  # Coverage runs only write workbooks for tickers asked for
+
+    # ✅ Timestamp fields and units from the coverage index when one exists
+    field_index = FieldIndex.load(coverage_universe or "nasdaq100")
+    timestamp_units = field_index.timestamp_fields() if field_index else dict.fromkeys(date_fields)
+
+    snapshot_store = SnapshotStore("stock_info")
+    for ticker in tickers:
+        # ✅ Get all available fields from yfinance (served from the shared cache when fresh)
+        stock_info = info_cache.get(ticker, fetch_info)
+
+        for field, unit in timestamp_units.items():
+            if field in stock_info:
+                stock_info[field] = convert_timestamp(stock_info[field], unit)
+
+        # ✅ Append only the fields that changed since the last snapshot (one row per ticker, other tickers stay stored)
+        changed_values = snapshot_store.write(pd.DataFrame([{"Symbol": ticker, **stock_info}]), key="Symbol", complete=False)
+        print(f"✅ Snapshot updated: {changed_values} changed values written to {snapshot_store.path}")
+
+        if export_excel:
+            # ✅ Convert Dictionary to DataFrame
+            stock_df = pd.DataFrame(stock_info.items(), columns=["Metric", "Value"])
 
-# ✅ Convert Dictionary to DataFrame
-stock_df = pd.DataFrame(stock_info.items(), columns=["Metric", "Value"])
+            # ✅ Get today's date for filename
+            current_date = datetime.today().strftime("%Y-%m-%d")
 
-# ✅ Get today's date for filename
-current_date = datetime.today().strftime("%Y-%m-%d")
+            # ✅ Define File Path (Save in Downloads Folder)
+            downloads_folder = output_dir or os.path.join(os.path.expanduser("~"), "Downloads")
+            output_file = os.path.join(downloads_folder, f"{ticker}_StockInfo_{current_date}.xlsx")
 
-# ✅ Define File Path (Save in Downloads Folder)
-downloads_folder = os.path.join(os.path.expanduser("~"), "Downloads")
-output_file = os.path.join(downloads_folder, f"{ticker}_StockInfo_{current_date}.xlsx")
+            # ✅ Save to Excel
+            export_sheets(output_file, {"Stock Info": stock_df})
 
-# ✅ Save to Excel
-with pd.ExcelWriter(output_file, engine="xlsxwriter") as writer:
-    stock_df.to_excel(writer, sheet_name="Stock Info", index=False)
+            print(f"✅ Stock data saved to: {output_file}")
+    info_cache.close()
+    info_cache.report()
 
-print(f"✅ Stock data saved to: {output_file}")
+if __name__ == "__main__":
+    main(profile=PROFILE)
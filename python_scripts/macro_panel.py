@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from run_metrics import metrics
+
+# Aggregations for putting a series on a coarser calendar (daily -> monthly, monthly -> quarterly, ...)
+AGGREGATIONS = ("last", "first", "mean", "sum", "min", "max")
+REDUCERS = {"sum": np.add, "min": np.minimum, "max": np.maximum}
+
+# Frequencies labelled by the period's last day (like pandas `resample`); the rest ("MS", "QS", "YS", "B", "D") by its first
+END_LABELLED = {"ME", "QE", "YE", "BME", "BQE", "BYE", "W"}
+
+# Gap filling on the panel calendar: "ffill" (carry the last observation), "interpolate" (time-weighted) or None
+FILLS = ("ffill", "interpolate", None)
+
+
+class Derived:
+    """A series computed from other panel columns: `compute(block)` gets the aligned inputs as a DataFrame."""
+
+    def __init__(self, inputs, compute):
+        self.inputs = tuple(inputs)
+        self.compute = compute
+
+
+def spread(a, b):
+    """`a - b` on the common calendar (e.g. the 10Y - 2Y yield curve spread)."""
+    return Derived((a, b), lambda block: block[a] - block[b])
+
+
+def yoy(column, percent=True):
+    """Year-over-year change of a level series (e.g. CPI index -> inflation rate)."""
+    def compute(block):
+        levels = block[column]
+        # Move each value one year forward and look up as of each date: works on any calendar (month ends, leap days)
+        shifted = pd.Series(levels.to_numpy(), index=levels.index + pd.DateOffset(years=1))
+        year_ago = shifted[~shifted.index.duplicated(keep="last")].asof(block.index)
+        return (levels.to_numpy() / year_ago.to_numpy() - 1) * (100 if percent else 1)
+    return Derived((column,), compute)
+
+
+def make_calendar(start, end, freq):
+    """Period labels from `start` to `end` (business days straight from NumPy, the rest from `pd.date_range`)."""
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    if freq == "B":  # pd.date_range builds business days one offset step at a time
+        days = np.arange(start.to_datetime64(), end.to_datetime64() + np.timedelta64(1, "D"), dtype="datetime64[D]")
+        return pd.DatetimeIndex(days[np.is_busday(days)].astype("datetime64[ns]"), name="date")
+    return pd.date_range(start, end, freq=freq, name="date")
+
+
+def _fill_gaps(values, limit=None):
+    """Forward fill along a 1-D array, at most `limit` positions past the last value."""
+    positions = np.arange(len(values))
+    last_valid = np.maximum.accumulate(np.where(np.isnan(values), -1, positions))
+    fillable = (last_valid >= 0) & (limit is None or positions - last_valid <= limit)
+    return np.where(fillable, values[np.maximum(last_valid, 0)], np.nan)
+
+
+def align(series, calendar, freq, how="last", fill="ffill", limit=None):
+    """One raw series (any frequency, gaps allowed) as a float64 array on `calendar`.
+
+    Observations are binned into calendar periods with one `searchsorted` and aggregated with `ufunc.reduceat`
+    (same bins and labels as `Series.resample(freq)`, without building a date range per series)."""
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation: {how!r} (use one of {', '.join(AGGREGATIONS)})")
+    if fill not in FILLS:
+        raise ValueError(f"Unknown fill: {fill!r} (use 'ffill', 'interpolate' or None)")
+    series = pd.Series(series, dtype="float64").dropna()
+    series.index = pd.DatetimeIndex(series.index).normalize()
+    series = series[~series.index.duplicated(keep="last")].sort_index()
+    dates, values = series.index.to_numpy(), series.to_numpy()
+
+    offset = to_offset(freq)
+    end_labelled = offset.name.split("-")[0] in END_LABELLED
+    if end_labelled:
+        period = calendar.searchsorted(dates, side="left")  # First label on or after the observation
+        before = dates <= (calendar[0] - offset).to_datetime64()
+    else:
+        period = calendar.searchsorted(dates, side="right") - 1  # Last label on or before the observation
+        before = period < 0
+        period[dates >= (calendar[-1] + offset).to_datetime64()] = len(calendar)  # After the last period
+    inside = ~before & (period < len(calendar))
+
+    # Several observations per period -> one value
+    aligned = np.full(len(calendar), np.nan)
+    period, inside_values = period[inside], values[inside]
+    if len(period):
+        starts = np.flatnonzero(np.r_[True, period[1:] != period[:-1]])
+        if how == "last":
+            binned = inside_values[np.r_[starts[1:], len(period)] - 1]
+        elif how == "first":
+            binned = inside_values[starts]
+        elif how == "mean":
+            binned = np.add.reduceat(inside_values, starts) / np.diff(np.r_[starts, len(period)])
+        else:
+            binned = REDUCERS[how].reduceat(inside_values, starts)
+        aligned[period[starts]] = binned
+
+    # Periods without an observation; the last observation before the calendar seeds the forward fill
+    if fill == "ffill":
+        seed, gap = [np.nan], 0
+        if before.any():
+            seed = values[before][-1:]
+            if limit is not None:  # The seed's distance (in periods) from the calendar start counts towards the limit
+                seed_date = pd.Timestamp(dates[before][-1])
+                labels = pd.date_range(seed_date, calendar[0], freq=freq)
+                seed_labelled = end_labelled or (len(labels) and labels[0] == seed_date)
+                gap = max(len(labels) - (2 if seed_labelled else 1), 0)  # Empty periods between seed and calendar
+        aligned = _fill_gaps(np.r_[seed, np.full(gap, np.nan), aligned], limit)[1 + gap:]
+    elif fill == "interpolate":
+        known = ~np.isnan(aligned)
+        if known.sum() > 1:
+            x = calendar.asi8
+            between = (x >= x[known][0]) & (x <= x[known][-1])
+            interpolated = np.interp(x, x[known], aligned[known])
+            gap_ok = _fill_gaps(aligned, limit) if limit is not None else interpolated
+            aligned = np.where(between & ~np.isnan(gap_ok), interpolated, np.nan)
+    return aligned
+
+
+# Every series on one calendar: sources are only loaded and aligned when a column is first asked for
+class MacroPanel:
+    def __init__(self, freq="ME", start=None, end=None):
+        self.freq = freq
+        self.start = start
+        self.end = end
+        self.sources = {}  # name -> (Series or loader, how, fill, limit)
+        self.derived = {}
+        self.columns = {}  # name -> aligned array (memo)
+        self.loaded = {}  # name -> raw Series, shared with panels made by `at`
+        self._calendar = None
+
+    def add(self, name, source, how="last", fill="ffill", limit=None):
+        """`source` is a Series or a zero-argument function returning one (called on first use).
+        `how` aggregates several observations per period, `fill` fills periods without one (`limit` periods at most)."""
+        self.sources[name] = (source, how, fill, limit)
+        self.columns.pop(name, None)
+        return self
+
+    def derive(self, name, derived):
+        self.derived[name] = derived
+        self.columns.pop(name, None)
+        return self
+
+    def at(self, freq):
+        """The same sources and derived series on another calendar (raw series are not reloaded)."""
+        panel = MacroPanel(freq, self.start, self.end)
+        panel.sources, panel.derived, panel.loaded = dict(self.sources), dict(self.derived), self.loaded
+        return panel
+
+    def raw(self, name):
+        if name not in self.loaded:
+            source = self.sources[name][0]
+            self.loaded[name] = source() if callable(source) else source
+        return self.loaded[name]
+
+    @property
+    def calendar(self):
+        if self._calendar is None:
+            start = self.start or min(self.raw(name).index.min() for name in self.sources)
+            end = self.end or max(self.raw(name).index.max() for name in self.sources)
+            self._calendar = make_calendar(start, end, self.freq)
+        return self._calendar
+
+    def column(self, name):
+        """Aligned values of a source or derived series (NumPy array on `calendar`)."""
+        if name not in self.columns:
+            if name in self.derived:
+                derived = self.derived[name]
+                block = self.frame(derived.inputs)
+                self.columns[name] = np.asarray(derived.compute(block), dtype="float64")
+            elif name in self.sources:
+                _, how, fill, limit = self.sources[name]
+                with metrics.stage("transform.panel_align"):
+                    self.columns[name] = align(self.raw(name), self.calendar, self.freq, how, fill, limit)
+            else:
+                raise KeyError(f"Unknown panel series: {name!r}")
+        return self.columns[name]
+
+    def series(self, name):
+        return pd.Series(self.column(name), index=self.calendar, name=name)
+
+    def frame(self, names=None):
+        """Aligned block (calendar x series); every source and derived series by default."""
+        names = list(self.sources) + list(self.derived) if names is None else list(names)
+        return pd.DataFrame({name: self.column(name) for name in names}, index=self.calendar)
+
+    def to_parquet(self, path, names=None):
+        """One columnar file for downstream analysis: a date column plus one float column per series."""
+        frame = self.frame(names).dropna(how="all").reset_index()
+        frame.to_parquet(path, index=False, compression="zstd")
+        metrics.count_file(path)
+        return frame
@@ -1,13 +1,20 @@
+import os
 import pandas as pd
-import matplotlib.pyplot as plt
 import wbdata
 from fredapi import Fred
-from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime
+from macro_panel import MacroPanel, spread, yoy
+from report_render import render_report
+from run_metrics import instrumented, metrics
+from series_cache import SeriesCache
+from yf_fetch import fetch_all
 
-# Set up FRED API (Replace with your actual API key)
-FRED_API_KEY = "xxx-xxx-xxx-xxx-xxx"
-fred = Fred(api_key=FRED_API_KEY)
+# Set up FRED API (Replace with your actual API key, or set the FRED_API_KEY environment variable)
+FRED_API_KEY = os.environ.get("FRED_API_KEY", "xxx-xxx-xxx-xxx-xxx")
+
+# Concurrent downloads, and a local cache that only pulls observations newer than the last cached date
+MAX_WORKERS = 8
+series_cache = SeriesCache()
 
 # Define date range
 start_date = datetime(2000, 1, 1)
@@ -31,53 +38,114 @@ regions = {
     "EAS": "East Asia & Pacific"
 }
 
-# Fetch World Bank data for all regions
-wb_data = {}
-for region_code, region_name in regions.items():
-    data = wbdata.get_dataframe(wb_indicators, country=region_code).dropna()
-    data.index = pd.to_datetime(data.index)
-    data = data[(data.index >= start_date) & (data.index <= end_date)]
-    wb_data[region_name] = data
+# Fetch World Bank data for one region (cached; only years after the last cached one are downloaded)
+def fetch_world_bank(region_code):
+    def download(start, end):
+        data = wbdata.get_dataframe(wb_indicators, country=region_code, date=(start, end))
+        data.index = pd.to_datetime(data.index)
+        return data
+
+    series_id = f"{region_code}_" + "_".join(sorted(wb_indicators))
+    return series_cache.get("worldbank", series_id, start_date, end_date, download)
 
 # --- FRED API --- (Only for USA & EU, as FRED does not have global data)
-us_fred_data = {
-    "Federal Funds Rate": fred.get_series("FEDFUNDS", start_date, end_date),
-    "CPI Inflation": fred.get_series("CPIAUCSL", start_date, end_date),
-    "10-Year Treasury Yield": fred.get_series("DGS10", start_date, end_date),
-    "Unemployment Rate": fred.get_series("UNRATE", start_date, end_date),
-    "Core Inflation": fred.get_series("CPILFESL", start_date, end_date),
-    "Retail Sales Growth": fred.get_series("RSXFS", start_date, end_date),
-    "Labor Force Participation Rate": fred.get_series("CIVPART", start_date, end_date),
-    "Job Openings": fred.get_series("JTSJOL", start_date, end_date),
-    "Yield Curve Spread (10Y - 2Y)": fred.get_series("DGS10", start_date, end_date) - fred.get_series("DGS2", start_date, end_date),
-    "US Dollar Index": fred.get_series("DTWEXBGS", start_date, end_date),
-    "Total Public Debt": fred.get_series("GFDEBTN", start_date, end_date),
-    "Debt-to-GDP Ratio": fred.get_series("GFDEGDQ188S", start_date, end_date),
-    "S&P 500 Index": fred.get_series("SP500", start_date, end_date)
+fred_series = {
+    "Federal Funds Rate": "FEDFUNDS",
+    "CPI Inflation": "CPIAUCSL",
+    "10-Year Treasury Yield": "DGS10",
+    "Unemployment Rate": "UNRATE",
+    "Core Inflation": "CPILFESL",
+    "Retail Sales Growth": "RSXFS",
+    "Labor Force Participation Rate": "CIVPART",
+    "Job Openings": "JTSJOL",
+    "US Dollar Index": "DTWEXBGS",
+    "Total Public Debt": "GFDEBTN",
+    "Debt-to-GDP Ratio": "GFDEGDQ188S",
+    "S&P 500 Index": "SP500",
+}
+
+# --- Aligned panel ---
+# Every series on one calendar at this frequency ("B", "W", "ME", "QE", "YE"), exported next to the PDF
+PANEL_FREQ = "ME"
+
+# How a series is aggregated when it has several observations per panel period (default "last");
+# periods without an observation are forward-filled
+fred_aggregation = {"DGS10": "mean", "DGS2": "mean", "FEDFUNDS": "mean", "DTWEXBGS": "mean"}
+
+# Series computed on the aligned block (both legs of a spread share the same dates)
+derived_series = {
+    "Yield Curve Spread (10Y - 2Y)": spread("DGS10", "DGS2"),
+    "CPI Inflation (YoY %)": yoy("CPIAUCSL"),
+    "Core Inflation (YoY %)": yoy("CPILFESL"),
 }
 
-# --- Save All Plots to PDF ---
-with PdfPages("macroeconomic_report.pdf") as pdf:
-    
-    def plot_series(data, title, ylabel, color='blue'):
-        if data is not None and not data.empty:
-            plt.figure(figsize=(10,5))
-            plt.plot(data, color=color, linewidth=2)
-            plt.title(title)
-            plt.xlabel("Year")
-            plt.ylabel(ylabel)
-            plt.grid(True)
-            pdf.savefig()
-            plt.close()
+# Fetch one FRED series (cached; only observations after the last cached date are downloaded)
+def fetch_fred(fred, series_id):
+    return series_cache.get("fred", series_id, start_date, end_date,
+                            lambda start, end: fred.get_series(series_id, start, end))
+
+# Daily series are downsampled to the visible resolution; pages can be rendered in parallel
+RENDER_PROCESSES = 4
+
+# Profiler for this run: None, "cprofile" or "py-spy" (run metrics JSON is always written to ~/Downloads/MWKT_Metrics)
+PROFILE = None
+
+# Whole run: the settings above are the defaults, `mwkt macro` passes its arguments here
+@instrumented("macro")
+def main(fred_api_key=FRED_API_KEY, max_workers=MAX_WORKERS, render_processes=RENDER_PROCESSES,
+         output_file="macroeconomic_report.pdf", panel_freq=PANEL_FREQ, panel_file=None):
+    fred = Fred(api_key=fred_api_key)
+
+    # Download every World Bank region and every unique FRED series concurrently (DGS10 only once)
+    fred_ids = sorted(set(fred_series.values()) | {series_id for derived in derived_series.values() for series_id in derived.inputs})
+    downloads = fetch_all([("worldbank", code) for code in regions] + [("fred", series_id) for series_id in fred_ids],
+                          lambda task: fetch_world_bank(task[1]) if task[0] == "worldbank" else fetch_fred(fred, task[1]),
+                          max_workers=max_workers, desc="Downloading macro series", unit="series")
+    wb_downloads, fred_downloads = downloads[:len(regions)], dict(zip(fred_ids, downloads[len(regions):]))
+
+    wb_data = {region_name: data.dropna() for region_name, data in zip(regions.values(), wb_downloads)}
+
+    us_fred_data = {title: fred_downloads[series_id] for title, series_id in fred_series.items()}
+
+    # One panel of every series (aligned on first use), derived series computed on the aligned block
+    panel = MacroPanel(panel_freq, start_date, end_date)
+    for series_id in fred_ids:
+        panel.add(series_id, fred_downloads[series_id], how=fred_aggregation.get(series_id, "last"))
+    for region_code, data in zip(regions, wb_downloads):
+        for indicator in data.columns:
+            panel.add(f"{region_code} - {indicator}", data[indicator])
+    for name, derived in derived_series.items():
+        panel.derive(name, derived)
+
+    # Derived series are charted from a business-day panel (no gaps where only one leg has a value)
+    chart_panel = panel.at("B")
+    us_fred_data.update({name: chart_panel.series(name).dropna() for name in derived_series})
+
+    # --- Save All Plots to PDF ---
+    # Charts as (data, title, ylabel, color); rendered 4 per page with one reused Figure
+    charts = []
 
     # Plot for each region with improved labels
     for region_name, data in wb_data.items():
         for indicator in wb_indicators.values():
             if indicator in data.columns:
-                plot_series(data[indicator], f"{region_name} - {indicator}", indicator, 'blue')
-    
+                charts.append((data[indicator], f"{region_name} - {indicator}", indicator, 'blue'))
+
     # Plot US-specific FRED data with improved labels
     for title, series in us_fred_data.items():
-        plot_series(series, f"USA - {title}", title, 'red')
+        charts.append((series, f"USA - {title}", title, 'red'))
+
+    render_report(charts, output_file, processes=render_processes)
+    metrics.count_file(output_file)
+
+    print(f"Macroeconomic report saved as '{output_file}'")
+
+    # Written after rendering, not alongside it: the render pool forks, which is unsafe while another thread is in pyarrow
+    panel_file = panel_file or f"{os.path.splitext(output_file)[0]}_panel.parquet"
+    panel_frame = panel.to_parquet(panel_file)
+    print(f"Aligned panel ({panel_freq}, {len(panel_frame)} periods x {len(panel_frame.columns) - 1} series) saved as '{panel_file}'")
+    series_cache.report()
+
 
-print("Macroeconomic report saved as 'macroeconomic_report.pdf'")
+if __name__ == "__main__":
+    main(profile=PROFILE)
@@ -1,54 +1,33 @@
-import time
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-
-# Set up Selenium WebDriver
-options = webdriver.ChromeOptions()
-options.add_argument("--headless")  # Run in background mode
-options.add_argument("--disable-gpu")
-options.add_argument("--window-size=1920x1080")
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+import os
+from queue import Queue
+from chunk_pipeline import DEFAULT_CHECKPOINT_DIR
+from data_export import export_sheets
+from morningstar_crawl import CrawlStore, crawl_api, join_tabs
+from run_metrics import instrumented, metrics
+from screener_table import TableAccumulator, fetch_table_html
+from yf_fetch import fetch_all
+
+# ✅ Engine: "api" talks to the screener's JSON API with pooled HTTP (no browser),
+#    "selenium" drives headless Chrome through the page like before (selenium is only imported for this engine)
+ENGINE = "api"
+
+# ✅ Pages to scrape per tab (None = every page of the result set)
+MAX_PAGES = 5
+
+# ✅ Crawl mode: stream every scraped page to an on-disk store keyed by (tab, page) and resume
+#    an interrupted run from its last stored page, even on another day (the folder is cleared after the export)
+CRAWL = True
+CRAWL_DIR = os.path.join(DEFAULT_CHECKPOINT_DIR, "morningstar_funds")
+
+# ✅ Selenium engine: browsers scraping tabs in parallel (one tab per browser at a time)
+BROWSER_POOL_SIZE = 3
+
+# ✅ Profiler for this run: None, "cprofile" or "py-spy" (run metrics JSON is always written to ~/Downloads/MWKT_Metrics)
+PROFILE = None
 
 # URL of the Morningstar Fund Screener
 base_url = "https://sg.morningstar.com/sg/screener/fund.aspx"
 
-# Open the page
-driver.get(base_url)
-time.sleep(5)  # Allow JavaScript to load
-
-### **🔹 Step 1: Remove Any Overlay** ###
-try:
-    overlay = WebDriverWait(driver, 5).until(
-        EC.presence_of_element_located((By.CLASS_NAME, "body_blocked"))
-    )
-    driver.execute_script("arguments[0].remove();", overlay)
-    print("✅ Removed page overlay.")
-except:
-    print("⚠️ No overlay detected. Continuing...")
-
-### **🔹 Step 2: Set 'Show Rows' to 50 Using JavaScript** ###
-try:
-    dropdown_id = "ec-screener-input-page-size-select"
-    driver.execute_script("""
-        let dropdown = document.getElementById(arguments[0]);
-        dropdown.value = '50';
-        dropdown.dispatchEvent(new Event('change', { bubbles: true }));
-    """, dropdown_id)
-
-    time.sleep(5)  # Wait for table update
-    print("✅ Successfully set 'Show Rows' to 50 using JavaScript!")
-except Exception as e:
-    print(f"⚠️ Failed to set 'Show Rows' to 50: {e}")
-
-# Dictionary to store data per tab
-data_per_tab = {}
-
 # Tabs Mapping
 tabs = {
     "Overview": "ec-screener-view-tabs-tab0",
@@ -59,46 +38,90 @@ tabs = {
     "Risk": "ec-screener-view-tabs-tab5",
 }
 
-# **Function to Scrape Table Data**
-def scrape_table():
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    headers = [th.text.strip() for th in soup.find_all("th") if th.text.strip()]
-    rows = soup.select("tbody tr")
-    page_data = []
-
-    for row in rows:
-        cols = row.find_all("td")
-        if len(cols) > 1:
-            row_data = [col.text.strip() for col in cols]
-            page_data.append(row_data)
-
-    return headers, page_data
-
-# **Function to Reset to Page 1 via URL Reload**
-def reset_to_page_1():
-    print("🔄 Resetting to Page 1 via URL reload...")
-    driver.get(base_url)  # Reload the page to ensure we're at Page 1
-    time.sleep(5)  # Allow page to load
-
-    # Verify reset worked
+# **Explicit Waits: the table "signature" (row count, first row text, headers) changes when new data renders**
+WAIT_TIMEOUT = 20  # Seconds before giving up on a page/tab change
+TABLE_SIGNATURE_JS = """
+    const rows = document.querySelectorAll('tbody tr');
+    const headers = Array.from(document.querySelectorAll('th')).map(th => th.innerText.trim()).join('|');
+    return [rows.length, rows.length ? rows[0].innerText : '', headers];
+"""
+
+def table_signature(driver):
+    return tuple(driver.execute_script(TABLE_SIGNATURE_JS))
+
+def wait_for_table(driver, previous_signature=None, timeout=WAIT_TIMEOUT):
+    """Block until the table has rows (and differs from `previous_signature`, if given)."""
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    def table_ready(d):
+        signature = table_signature(d)
+        return signature[0] > 0 and signature != previous_signature
+    WebDriverWait(driver, timeout, poll_frequency=0.1).until(table_ready)
+
+def current_page_number(driver):
+    from selenium.webdriver.common.by import By
+
+    current_page_element = driver.find_element(By.CSS_SELECTOR, "a.mds-pagination__link.mds-pagination__link--selected")
+    return int(current_page_element.text.strip())
+
+# **Function to Start Headless Chrome**
+def create_driver(driver_path):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    # Set up Selenium WebDriver
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")  # Run in background mode
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920x1080")
+    return webdriver.Chrome(service=Service(driver_path), options=options)
+
+# **Function to Open the Screener on Page 1 with 50 Rows per Page**
+@metrics.timed("morningstar.open_screener")
+def open_screener(driver):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # Open the page
+    driver.get(base_url)
+    wait_for_table(driver)  # Wait for JavaScript to render the first rows
+
+    ### **🔹 Step 1: Remove Any Overlay** ###
     try:
-        current_page_element = driver.find_element(By.CSS_SELECTOR, "a.mds-pagination__link.mds-pagination__link--selected")
-        current_page = int(current_page_element.text.strip())
-
-        if current_page == 1:
-            print("✅ Successfully reset to Page 1.")
-        else:
-            print(f"⚠️ Page did not reset properly. Expected Page 1, but got {current_page}.")
-    
+        overlay = WebDriverWait(driver, 2).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "body_blocked"))
+        )
+        driver.execute_script("arguments[0].remove();", overlay)
+        print("✅ Removed page overlay.")
+    except:
+        print("⚠️ No overlay detected. Continuing...")
+
+    ### **🔹 Step 2: Set 'Show Rows' to 50 Using JavaScript** ###
+    try:
+        dropdown_id = "ec-screener-input-page-size-select"
+        before = table_signature(driver)
+        driver.execute_script("""
+            let dropdown = document.getElementById(arguments[0]);
+            dropdown.value = '50';
+            dropdown.dispatchEvent(new Event('change', { bubbles: true }));
+        """, dropdown_id)
+
+        wait_for_table(driver, before)  # Wait for table update
+        print("✅ Successfully set 'Show Rows' to 50 using JavaScript!")
     except Exception as e:
-        print(f"⚠️ Failed to reset pagination: {e}")
+        print(f"⚠️ Failed to set 'Show Rows' to 50: {e}")
 
 # **Function to Click Next Page**
-def click_next_page():
+@metrics.timed("morningstar.next_page")
+def click_next_page(driver):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
     try:
         # Find the currently active page number
-        current_page_element = driver.find_element(By.CSS_SELECTOR, "a.mds-pagination__link.mds-pagination__link--selected")
-        current_page = int(current_page_element.text.strip())
+        current_page = current_page_number(driver)
         print(f"🔹 Before Clicking: Current Page: {current_page}")
 
         # Find all pagination buttons and get the next one
@@ -108,20 +131,18 @@ def click_next_page():
             try:
                 page_num = int(btn.text.strip())
                 if page_num == current_page + 1:
-                    # Click the next page button using JavaScript
+                    # Click the next page button using JavaScript, then wait for the new rows
+                    before = table_signature(driver)
                     driver.execute_script("arguments[0].click();", btn)
-                    time.sleep(5)  # Ensure new data loads
-                    
-                    # Verify page change
-                    new_page_element = driver.find_element(By.CSS_SELECTOR, "a.mds-pagination__link.mds-pagination__link--selected")
-                    new_page = int(new_page_element.text.strip())
-
-                    if new_page == page_num:
-                        print(f"✅ Successfully moved to Page {new_page}.")
-                        return True
-                    else:
-                        print(f"⚠️ Page did not change properly. Expected {page_num}, but got {new_page}.")
-                        return False
+                    wait_for_table(driver, before)
+                    WebDriverWait(driver, WAIT_TIMEOUT, poll_frequency=0.1).until(
+                        lambda d: current_page_number(d) == page_num
+                    )
+                    print(f"✅ Successfully moved to Page {page_num}.")
+                    return True
+            except TimeoutException:
+                print(f"⚠️ Page did not change properly. Expected {page_num}, but got {current_page_number(driver)}.")
+                return False
             except:
                 continue
 
@@ -129,55 +150,132 @@ def click_next_page():
         print(f"⚠️ Failed to navigate to the next page: {e}")
     return False
 
-# **Scraping Logic for Each Tab**
-for tab_name, tab_id in tabs.items():
+# **Scraping Logic for One Tab**
+def scrape_tab(driver, tab_name, tab_id, max_pages=MAX_PAGES, store=None):
+    from selenium.webdriver.common.by import By
+
+    # With a crawl store, finished tabs are skipped and unfinished ones resume after their last stored page
+    if store is not None and store.is_complete(tab_name):
+        print(f"♻️ {tab_name} already crawled. Skipping.")
+        return None
+    start_page = store.next_page(tab_name) if store is not None else 1
+    if max_pages is not None and start_page > max_pages:
+        return None
+
     print(f"\n🔄 Switching to {tab_name} tab...")
 
-    # Reset to Page 1 before switching tabs
-    reset_to_page_1()
+    # Start every tab from a freshly loaded Page 1
+    open_screener(driver)
 
     # Click the tab
     try:
         tab_element = driver.find_element(By.ID, tab_id)
+        before = table_signature(driver)
         driver.execute_script("arguments[0].click();", tab_element)
-        time.sleep(5)  # Allow data to load
+        if tab_name != "Overview":  # Overview is already showing, so its columns won't change
+            wait_for_table(driver, before)
         print(f"✅ Switched to {tab_name} tab.")
     except Exception as e:
         print(f"❌ Failed to switch to {tab_name}: {e}")
-        continue
-
-    funds_data = []
-    page_count = 0
-
-    # **Scrape first 5 pages**
-    while page_count < 5:
+        return None
+
+    # Page forward to where the previous crawl stopped
+    if start_page > 1:
+        print(f"♻️ Resuming {tab_name} from page {start_page}...")
+    for _ in range(start_page - 1):
+        if not click_next_page(driver):
+            print(f"⚠️ Could not reach page {start_page} of {tab_name}.")
+            return None
+
+    # **Each page's table HTML is parsed with lxml straight into this tab's column arrays**
+    accumulator = TableAccumulator()
+    page_count = start_page - 1
+    last_page_reached = False
+
+    # **Scrape up to max_pages pages (None = the full result set)**
+    while max_pages is None or page_count < max_pages:
         page_count += 1
         print(f"🔄 Scraping page {page_count} of {tab_name}...")
 
-        headers, page_data = scrape_table()
-
-        if not page_data:
+        if not accumulator.add_page(fetch_table_html(driver)):
             print("⚠️ No data detected, stopping.")
+            last_page_reached = True
             break
 
-        funds_data.extend(page_data)
+        if store is not None:
+            store.write_page(tab_name, page_count, accumulator.drain())  # On disk before moving on
 
-        success = click_next_page()
+        if max_pages is not None and page_count == max_pages:
+            break
+
+        success = click_next_page(driver)
         if not success:
             print(f"⚠️ No more pages in {tab_name}. Moving to next tab.")
+            last_page_reached = True
             break
 
-        time.sleep(5)  # Wait for the table to update
-
-    # Save data
-    data_per_tab[tab_name] = pd.DataFrame(funds_data, columns=headers)
-
-# Save all data into Excel
-with pd.ExcelWriter("morningstar_funds.xlsx") as writer:
-    for sheet_name, df in data_per_tab.items():
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
+    if store is not None:
+        if last_page_reached:
+            store.mark_complete(tab_name, page_count)
+        return None
+    return accumulator.to_frame()
+
+# **Scrape all tabs in parallel across a small pool of WebDriver instances**
+def scrape_with_selenium(max_pages=MAX_PAGES, pool_size=BROWSER_POOL_SIZE, store=None):
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    driver_path = ChromeDriverManager().install()  # Download the driver once for the whole pool
+    pool_size = min(pool_size, len(tabs))
+    drivers = Queue()
+    for driver in fetch_all(list(range(pool_size)), lambda _: create_driver(driver_path),
+                            max_workers=pool_size, desc="Starting browsers", unit="browser"):
+        drivers.put(driver)
+
+    def scrape_with_pooled_driver(tab):
+        driver = drivers.get()
+        try:
+            return scrape_tab(driver, tab[0], tab[1], max_pages, store)
+        finally:
+            drivers.put(driver)
 
-print("🎉 Scraping complete! Data saved as 'morningstar_funds.xlsx'.")
-
-# Close the Selenium driver
-driver.quit()
+    try:
+        results = fetch_all(list(tabs.items()), scrape_with_pooled_driver, max_workers=pool_size,
+                            desc="Scraping tabs", unit="tab")
+    finally:
+        # Close the Selenium drivers
+        while not drivers.empty():
+            drivers.get().quit()
+
+    # Dictionary to store data per tab
+    return {tab_name: df for tab_name, df in zip(tabs, results) if df is not None}
+
+# **Whole run: the settings above are the defaults, `mwkt morningstar` passes its arguments here**
+@instrumented("morningstar")
+def main(engine=ENGINE, max_pages=MAX_PAGES, pool_size=BROWSER_POOL_SIZE, crawl=CRAWL, crawl_dir=CRAWL_DIR,
+         output_file="morningstar_funds.xlsx"):
+    if crawl:
+        # **Every page goes to the crawl store as soon as it's scraped; re-running resumes the crawl**
+        store = CrawlStore(crawl_dir)
+        if engine == "api":
+            from morningstar_api import ScreenerClient
+            crawl_api(store, ScreenerClient(), max_pages=max_pages)
+        else:
+            scrape_with_selenium(max_pages, pool_size, store=store)
+        data_per_tab = store.load_tabs(tabs)  # Pages are read once, then joined on the fund Id
+        data_per_tab = {"All Funds": join_tabs(data_per_tab), **data_per_tab}
+    elif engine == "api":
+        # **All pages and tab column sets over pooled HTTP, no browser**
+        from morningstar_api import ScreenerClient
+        data_per_tab = ScreenerClient().fetch_all_tabs(max_pages=max_pages)
+    else:
+        data_per_tab = scrape_with_selenium(max_pages, pool_size)
+
+    # Save all data into Excel
+    export_sheets(output_file, data_per_tab)
+    if crawl:
+        store.clear()  # The workbook has every page now; the next run crawls fresh data
+
+    print(f"🎉 Scraping complete! Data saved as '{output_file}'.")
+
+if __name__ == "__main__":
+    main(profile=PROFILE)
@@ -0,0 +1,109 @@
+import pandas as pd
+
+from run_metrics import metrics
+from yf_fetch import fetch_all
+
+# ✅ JSON API behind the Morningstar fund screener page (seen in the page's XHR traffic)
+API_URL = "https://lt.morningstar.com/api/rest.svc/klr5zyak8x/security/screener"
+UNIVERSE_ID = "FOSGP$$ALL"  # Funds available for sale in Singapore
+CURRENCY_ID = "SGD"
+LANGUAGE_ID = "en-GB"
+PAGE_SIZE = 50
+
+# ✅ Column set of each screener tab: API datapoint -> column header shown on the page
+TAB_COLUMNS = {
+    "Overview": {
+        "SecId": "Id", "Name": "Name", "CategoryName": "Morningstar Category", "StarRatingM255": "Morningstar Rating",
+        "ClosePrice": "NAV", "ClosePriceDate": "NAV Date", "PriceCurrency": "Currency", "OngoingCharge": "Ongoing Charge %",
+        "ReturnM12": "1 Yr Return %",
+    },
+    "Short Term Performance": {
+        "SecId": "Id", "Name": "Name", "ReturnD1": "1 Day %", "ReturnW1": "1 Week %", "ReturnM1": "1 Month %",
+        "ReturnM3": "3 Months %", "ReturnM6": "6 Months %", "ReturnM0": "YTD %",
+    },
+    "Long Term Performance": {
+        "SecId": "Id", "Name": "Name", "ReturnM12": "1 Yr Ann %", "ReturnM36": "3 Yr Ann %", "ReturnM60": "5 Yr Ann %",
+        "ReturnM120": "10 Yr Ann %",
+    },
+    "Fees": {
+        "SecId": "Id", "Name": "Name", "OngoingCharge": "Ongoing Charge %", "ManagementFee": "Management Fee %",
+        "MaxFrontEndLoad": "Max Initial Charge %", "PerformanceFee": "Performance Fee %", "InitialPurchase": "Min Initial Investment",
+    },
+    "Portfolio": {
+        "SecId": "Id", "Name": "Name", "EquityStyleBox": "Equity Style Box", "BondStyleBox": "Bond Style Box",
+        "AverageMarketCapital": "Average Market Cap", "EffectiveDuration": "Effective Duration", "FundTNAV": "Fund Size",
+    },
+    "Risk": {
+        "SecId": "Id", "Name": "Name", "StandardDeviationM36": "3 Yr Std Dev", "SharpeM36": "3 Yr Sharpe Ratio",
+        "AlphaM36": "3 Yr Alpha", "BetaM36": "3 Yr Beta", "R2M36": "3 Yr R-Squared",
+    },
+}
+
+
+def create_session(max_workers=8, retries=3):
+    """HTTP session with a connection pool sized for the worker count and automatic retries."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = "Mozilla/5.0"
+    return session
+
+
+class ScreenerClient:
+    """Fetches every screener page and tab column set over pooled HTTP, with no browser."""
+
+    def __init__(self, api_url=API_URL, universe_id=UNIVERSE_ID, currency_id=CURRENCY_ID,
+                 language_id=LANGUAGE_ID, page_size=PAGE_SIZE, max_workers=8, session=None):
+        self.api_url = api_url
+        self.universe_id = universe_id
+        self.currency_id = currency_id
+        self.language_id = language_id
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.session = session or create_session(max_workers)
+
+    def fetch_page(self, datapoints, page):
+        params = {
+            "page": page,
+            "pageSize": self.page_size,
+            "sortOrder": "LegalName asc",
+            "outputType": "json",
+            "version": 1,
+            "languageId": self.language_id,
+            "currencyId": self.currency_id,
+            "universeIds": self.universe_id,
+            "securityDataPoints": "|".join(datapoints),
+        }
+        metrics.count("requests.morningstar_api")
+        with metrics.stage("request.morningstar_api"):
+            response = self.session.get(self.api_url, params=params, timeout=30)
+        metrics.count("bytes_received.morningstar_api", len(response.content))
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_rows(self, datapoints, max_pages=None):
+        """All rows for the given datapoints: page 1 gives the total, remaining pages run concurrently."""
+        first = self.fetch_page(datapoints, 1)
+        total_pages = -(-first.get("total", 0) // self.page_size)
+        if max_pages:
+            total_pages = min(total_pages, max_pages)
+        print(f"✅ {first.get('total', 0)} funds in the screener; fetching {total_pages} pages of {self.page_size}")
+
+        rows = list(first.get("rows", []))
+        later_pages = fetch_all(list(range(2, total_pages + 1)), lambda page: self.fetch_page(datapoints, page),
+                                max_workers=self.max_workers, desc="Fetching screener pages", unit="page")
+        for payload in later_pages:
+            rows.extend(payload.get("rows", []))
+        return rows
+
+    def fetch_all_tabs(self, max_pages=None, tabs=TAB_COLUMNS):
+        """One request per page covers every tab's datapoints; tab tables are column subsets of it."""
+        datapoints = list(dict.fromkeys(dp for columns in tabs.values() for dp in columns))
+        funds = pd.DataFrame(self.fetch_rows(datapoints, max_pages)).reindex(columns=datapoints)
+        return {tab: funds[list(columns)].rename(columns=columns) for tab, columns in tabs.items()}
@@ -0,0 +1,156 @@
+import json
+import os
+import shutil
+import threading
+
+import pandas as pd
+
+from morningstar_api import TAB_COLUMNS
+from run_metrics import metrics
+from yf_fetch import fetch_all
+
+# ✅ Column that identifies a fund in every tab (falls back to "Name" if a tab doesn't show it)
+FUND_KEY = "Id"
+
+
+# ✅ Append-only page store: one Parquet file per (tab, page) plus a checkpoint of completed pages
+class CrawlStore:
+    """Scraped pages stream to disk as they arrive, so a crashed crawl resumes instead of restarting.
+
+    Layout: `<path>/tab=<Tab_Name>/page-00001.parquet` and `<path>/checkpoint.json`. A page file is
+    never rewritten once it exists; the checkpoint only lists pages whose file is fully written.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.checkpoint_file = os.path.join(path, "checkpoint.json")
+        self.lock = threading.Lock()  # Pages of different tabs can finish on different threads
+        os.makedirs(path, exist_ok=True)
+        self.checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_file):
+            return {}
+        with open(self.checkpoint_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_checkpoint(self):
+        tmp_path = f"{self.checkpoint_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.checkpoint, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_file)
+
+    def _tab_state(self, tab):
+        return self.checkpoint.setdefault(tab, {"pages": [], "complete": False, "total_pages": None})
+
+    def _page_file(self, tab, page):
+        return os.path.join(self.path, f"tab={tab.replace(' ', '_')}", f"page-{page:05d}.parquet")
+
+    def completed_pages(self, tab):
+        return set(self.checkpoint.get(tab, {}).get("pages", []))
+
+    def next_page(self, tab):
+        """First page after the run of completed pages starting at page 1."""
+        pages, page = self.completed_pages(tab), 1
+        while page in pages:
+            page += 1
+        return page
+
+    def is_complete(self, tab):
+        return self.checkpoint.get(tab, {}).get("complete", False)
+
+    def total_pages(self, tab):
+        return self.checkpoint.get(tab, {}).get("total_pages")
+
+    def write_page(self, tab, page, frame):
+        """Persist one scraped page, then record it in the checkpoint; existing pages are kept as-is."""
+        path = self._page_file(tab, page)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)  # Only fully written pages count as completed
+            metrics.count_file(path)
+        with self.lock:
+            state = self._tab_state(tab)
+            if page not in state["pages"]:
+                state["pages"] = sorted(state["pages"] + [page])
+            self._save_checkpoint()
+
+    def mark_complete(self, tab, total_pages=None):
+        with self.lock:
+            state = self._tab_state(tab)
+            state["complete"] = True
+            if total_pages is not None:
+                state["total_pages"] = total_pages
+            self._save_checkpoint()
+
+    def set_total_pages(self, tabs, total_pages):
+        with self.lock:
+            for tab in tabs:
+                self._tab_state(tab)["total_pages"] = total_pages
+            self._save_checkpoint()
+
+    def load_tab(self, tab):
+        """Every stored page of one tab, in page order."""
+        files = [self._page_file(tab, page) for page in sorted(self.completed_pages(tab))]
+        if not files:
+            return pd.DataFrame()
+        return pd.concat([pd.read_parquet(path) for path in files], ignore_index=True)
+
+    def load_tabs(self, tabs):
+        frames = {tab: self.load_tab(tab) for tab in tabs}
+        return {tab: frame for tab, frame in frames.items() if not frame.empty}
+
+    def clear(self):
+        """Delete every stored page and the checkpoint (the next crawl starts from page 1)."""
+        with self.lock:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.checkpoint = {}
+
+
+# ✅ One wide row per fund: the tab tables joined on the fund identifier
+def join_tabs(frames, key=FUND_KEY):
+    """`frames` maps tab name -> table; columns repeated across tabs (Name, Ongoing Charge %, ...)
+    are kept from the first tab only."""
+    frames = [frame for frame in frames.values() if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    if not all(key in frame.columns for frame in frames):
+        key = "Name"
+    seen, indexed = {key}, []
+    for frame in frames:
+        columns = [column for column in frame.columns if column not in seen]
+        seen.update(columns)
+        indexed.append(frame.drop_duplicates(key, keep="last").set_index(key)[columns])
+    return pd.concat(indexed, axis=1, join="outer").rename_axis(key).reset_index()
+
+
+# ✅ API engine crawl: each page is one request for every tab's datapoints, split into (tab, page) files
+def crawl_api(store, client, max_pages=None, tabs=TAB_COLUMNS):
+    """Fetch every screener page not yet in `store`; pages are written as soon as they arrive."""
+    datapoints = list(dict.fromkeys(dp for columns in tabs.values() for dp in columns))
+
+    def store_page(page, payload):
+        funds = pd.DataFrame(payload.get("rows", [])).reindex(columns=datapoints)
+        for tab, columns in tabs.items():
+            store.write_page(tab, page, funds[list(columns)].rename(columns=columns))
+
+    total_pages = min(store.total_pages(tab) or 0 for tab in tabs)
+    if not total_pages:
+        first = client.fetch_page(datapoints, 1)
+        total_pages = -(-first.get("total", 0) // client.page_size)
+        store.set_total_pages(tabs, total_pages)
+        store_page(1, first)
+    last_page = min(total_pages, max_pages) if max_pages else total_pages
+
+    done = set.intersection(*(store.completed_pages(tab) for tab in tabs))
+    remaining = [page for page in range(1, last_page + 1) if page not in done]
+    if len(remaining) < last_page - 1:
+        print(f"♻️ Resuming: {last_page - len(remaining)} of {last_page} pages already stored in {store.path}")
+
+    fetch_all(remaining, lambda page: store_page(page, client.fetch_page(datapoints, page)),
+              max_workers=client.max_workers, desc="Crawling screener pages", unit="page")
+    if last_page == total_pages:  # A max_pages-limited crawl can still be extended later
+        for tab in tabs:
+            store.mark_complete(tab)
@@ -0,0 +1,56 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# ✅ Sample screener rows in the API's response shape (fund names/values are made up)
+FIXTURE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "morningstar", "screener_rows.json")
+
+
+# ✅ Local stand-in for the screener JSON API: paginates the fixture rows and keeps only the requested datapoints
+def make_handler(fixture):
+    class ScreenerHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if not url.path.endswith("/security/screener"):
+                self.send_error(404)
+                return
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            page, page_size = int(query.get("page", 1)), int(query.get("pageSize", 50))
+            datapoints = query.get("securityDataPoints", "").split("|")
+            rows = fixture["rows"][(page - 1) * page_size:page * page_size]
+            body = json.dumps({
+                "total": fixture["total"], "page": page, "pageSize": page_size,
+                "rows": [{dp: row[dp] for dp in datapoints if dp in row} for row in rows],
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # Keep benchmark / check output clean
+
+    return ScreenerHandler
+
+
+def start_stub_server(fixture_file=FIXTURE_FILE, port=0):
+    """Serve the fixture on localhost in a background thread; returns (server, screener API url)."""
+    with open(fixture_file, encoding="utf-8") as f:
+        fixture = json.load(f)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(fixture))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api/rest.svc/stub/security/screener"
+
+
+# ✅ Offline check of the requests engine: python morningstar_stub_server.py
+if __name__ == "__main__":
+    from morningstar_api import ScreenerClient
+
+    server, api_url = start_stub_server()
+    tabs = ScreenerClient(api_url=api_url, page_size=5, max_workers=4).fetch_all_tabs()
+    for tab_name, df in tabs.items():
+        print(f"✅ {tab_name}: {df.shape[0]} funds x {df.shape[1]} columns")
+    server.shutdown()
@@ -0,0 +1,171 @@
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# ✅ One entry point for every script: `python mwkt.py nasdaq100|info|3fs|macro|morningstar ...`
+#    Only the chosen subcommand's script (and its pandas/yfinance/selenium imports) is loaded
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = {
+    "nasdaq100": "Retrieve nasdaq100 data (yFinance) v.1.0.py",
+    "info": "info dictionary (yfinance).py",
+    "3fs": "Fetch 3FS from (yfinance) v1.0.py",
+    "macro": "macroeconomic data.py",
+    "morningstar": "morningstar funds.py",
+}
+
+# ✅ Datasets refreshed by `mwkt nightly` (the scripts that need no ticker list)
+NIGHTLY = ["nasdaq100", "macro", "morningstar"]
+
+
+def load_script(command):
+    """Import one of the scripts by file name (they have spaces, so a plain `import` won't do)."""
+    sys.path.insert(0, SCRIPT_DIR)  # So the scripts find their helper modules from any working directory
+    spec = importlib.util.spec_from_file_location(f"mwkt_{command}", os.path.join(SCRIPT_DIR, SCRIPTS[command]))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ✅ Cache-only lookup: print cached `.info` fields as JSON without touching the network (stdlib only)
+def show_cached_info(tickers, fields=None):
+    sys.path.insert(0, SCRIPT_DIR)
+    from yf_cache import InfoCache
+
+    cache = InfoCache()
+    result = {}
+    for ticker in tickers:
+        info = cache.peek(ticker)
+        result[ticker] = {field: info.get(field) for field in fields} if info is not None and fields else info
+    cache.close()
+    print(json.dumps(result, indent=2, default=str))
+    return 0 if all(info is not None for info in result.values()) else 1  # Non-zero if a ticker was never cached
+
+
+# ✅ Nightly refresh: every dataset at once, one process per script (each keeps its own metrics file and profiler),
+#    so the whole refresh takes about as long as the slowest script instead of the sum of all of them
+def run_nightly(commands=None, metrics_dir=None, log_dir=None):
+    commands = commands or NIGHTLY
+    log_dir = log_dir or metrics_dir or os.path.join(os.path.expanduser("~"), "Downloads", "MWKT_Metrics")
+    os.makedirs(log_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+
+    running, logs, seconds, started = {}, {}, {}, time.perf_counter()
+    for command in commands:
+        argv = [sys.executable, os.path.abspath(__file__), command] + (["--metrics-dir", metrics_dir] if metrics_dir else [])
+        logs[command] = os.path.join(log_dir, f"nightly_{command}_{stamp}.log")
+        with open(logs[command], "w", encoding="utf-8") as log:  # One log per script: progress bars don't interleave
+            running[command] = subprocess.Popen(argv, stdout=log, stderr=subprocess.STDOUT)
+        print(f"🔄 Started {command} (log: {logs[command]})")
+
+    while len(seconds) < len(running):
+        for command, process in running.items():
+            if command not in seconds and process.poll() is not None:
+                seconds[command] = time.perf_counter() - started
+                print(f"{'✅' if process.returncode == 0 else '❌'} {command} finished in {seconds[command]:.1f}s "
+                      f"(exit code {process.returncode})")
+        time.sleep(0.2)
+
+    print(f"⏱️ Nightly refresh: {time.perf_counter() - started:.1f}s wall for {len(commands)} scripts "
+          f"({sum(seconds.values()):.1f}s if run one after another)")
+    failed = [command for command, process in running.items() if process.returncode != 0]
+    for command in failed:
+        print(f"❌ {command} failed, see {logs[command]}")
+    return 1 if failed else 0
+
+
+def build_parser():
+    # Options default to None so the scripts' own settings stay the defaults
+    parser = argparse.ArgumentParser(prog="mwkt", description="Market data scripts (Yahoo Finance, FRED/World Bank, Morningstar).")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Every script writes a run metrics JSON and can run under a profiler
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--profile", choices=["cprofile", "py-spy"], help="Profile the run (stats saved next to the metrics file)")
+    common.add_argument("--metrics-dir", help="Folder for the run metrics JSON (default: ~/Downloads/MWKT_Metrics)")
+
+    nasdaq = commands.add_parser("nasdaq100", parents=[common], help="Fetch `.info` fields for a whole universe into the snapshot store")
+    nasdaq.add_argument("--universe", help='"nasdaq100", "sp500", "russell3000" or a CSV path (default: nasdaq100)')
+    nasdaq.add_argument("--chunk-size", type=int, help="Symbols per checkpointed chunk")
+    nasdaq.add_argument("--workers", dest="max_workers", type=int, help="Concurrent fetch workers")
+    nasdaq.add_argument("--rps", dest="requests_per_second", type=float, help="Yahoo requests per second")
+    nasdaq.add_argument("--retries", type=int, help="Retries per ticker")
+    nasdaq.add_argument("--processes", dest="transform_processes", type=int,
+                        help="Processes converting chunks while the next chunk downloads (0 = a thread)")
+    nasdaq.add_argument("--quotes-only", action="store_true", default=None, help="Only refresh price/volume columns")
+    nasdaq.add_argument("--no-field-index", dest="use_field_index", action="store_false", default=None,
+                        help="Ignore the field coverage index built by `info --coverage`")
+    nasdaq.add_argument("--no-price-history", dest="price_history", action="store_false", default=None,
+                        help="Use Yahoo's precomputed averages instead of the local daily-bar store")
+    nasdaq.add_argument("--refresh-prices", action="store_true", default=None,
+                        help="Download the full daily-bar history again (e.g. after a split)")
+    nasdaq.add_argument("--no-excel", dest="export_excel", action="store_false", default=None, help="Skip the Excel export")
+    nasdaq.add_argument("--output-dir", help="Folder for the Excel export (default: ~/Downloads)")
+
+    info = commands.add_parser("info", parents=[common], help="Every `.info` field for one or more tickers")
+    info.add_argument("tickers", nargs="*", default=None)
+    info.add_argument("--coverage", dest="coverage_universe",
+                      help="Build the field coverage index for a universe (nasdaq100, sp500, russell3000 or a CSV path)")
+    info.add_argument("--workers", dest="max_workers", type=int, help="Concurrent fetch workers for --coverage")
+    info.add_argument("--cache-only", action="store_true", help="Print cached fields as JSON; no network, no pandas")
+    info.add_argument("--fields", help="Comma-separated fields to print with --cache-only")
+    info.add_argument("--no-excel", dest="export_excel", action="store_false", default=None, help="Skip the Excel export")
+    info.add_argument("--output-dir", help="Folder for the Excel export (default: ~/Downloads)")
+
+    statements = commands.add_parser("3fs", parents=[common], help="Income statement, balance sheet and cash flow with TTM")
+    statements.add_argument("tickers", nargs="+")
+    statements.add_argument("--workers", dest="max_workers", type=int, help="Concurrent (ticker, statement) requests")
+    statements.add_argument("--output-mode", choices=["workbooks", "store"], help="One workbook per ticker or one Parquet store")
+    statements.add_argument("--processes", dest="transform_processes", type=int,
+                            help="Processes computing TTM and formatting workbooks while later tickers download (0 = a thread)")
+    statements.add_argument("--output-dir", help="Output folder (default: ~/Downloads)")
+
+    macro = commands.add_parser("macro", parents=[common], help="World Bank and FRED series rendered to a PDF report")
+    macro.add_argument("--fred-api-key", help="FRED API key (default: the FRED_API_KEY environment variable)")
+    macro.add_argument("--workers", dest="max_workers", type=int, help="Concurrent series downloads")
+    macro.add_argument("--processes", dest="render_processes", type=int, help="Processes rendering report pages")
+    macro.add_argument("--output", dest="output_file", help="PDF path (default: macroeconomic_report.pdf)")
+    macro.add_argument("--panel-freq", help="Calendar of the exported panel: B, W, ME, QE or YE (default: ME)")
+    macro.add_argument("--panel-file", help="Parquet path of the aligned panel (default: next to the PDF)")
+
+    morningstar = commands.add_parser("morningstar", parents=[common], help="Morningstar fund screener, every tab")
+    morningstar.add_argument("--engine", choices=["api", "selenium"], help="JSON API (default) or headless Chrome")
+    morningstar.add_argument("--max-pages", type=int, help="Pages per tab (0 = every page of the result set)")
+    morningstar.add_argument("--pool-size", type=int, help="Browsers for the selenium engine")
+    morningstar.add_argument("--no-crawl", dest="crawl", action="store_false", default=None, help="Keep pages in memory only")
+    morningstar.add_argument("--crawl-dir", help="Crawl store folder (re-use it to resume)")
+    morningstar.add_argument("--output", dest="output_file", help="Excel path (default: morningstar_funds.xlsx)")
+
+    nightly = commands.add_parser("nightly", help=f"Refresh several datasets concurrently (default: {', '.join(NIGHTLY)})")
+    nightly.add_argument("--only", dest="commands", action="append", choices=NIGHTLY, help="Script to run (repeatable)")
+    nightly.add_argument("--metrics-dir", help="Folder for the run metrics JSON files (default: ~/Downloads/MWKT_Metrics)")
+    nightly.add_argument("--log-dir", help="Folder for the per-script logs (default: the metrics folder)")
+    return parser
+
+
+def main(argv=None):
+    args = vars(build_parser().parse_args(argv))
+    command = args.pop("command")
+
+    if command == "nightly":
+        return run_nightly(**args)
+
+    if command == "info":
+        cache_only, fields = args.pop("cache_only"), args.pop("fields")
+        if cache_only:
+            return show_cached_info(args["tickers"], fields.split(",") if fields else None)
+
+    # Unset options fall back to the script's own setting
+    kwargs = {key: value for key, value in args.items() if value is not None and value != []}
+    if kwargs.get("max_pages") == 0:
+        kwargs["max_pages"] = None
+    load_script(command).main(**kwargs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+import pandas as pd
+
+from run_metrics import metrics
+
+# ✅ Column spec for the Nasdaq-100 sheet: (output name, `.info` key, dtype, transform)
+#    dtype:     "float" (numeric), "category" (repeated labels), "string" (free text)
+#    transform: None, "timestamp_s" (Unix seconds), "timestamp_ms" (Unix milliseconds)
+#               or "absent" (no ticker in the universe returns the key, see field_index.py: column left empty)
+COLUMN_SPEC = [
+    ("Asset Class", "quoteType", "category", None),
+    ("Exchange", "fullExchangeName", "category", None),
+    ("Currency", "currency", "category", None),
+    ("Symbol", None, "string", None),  # Filled from the requested ticker
+    ("Company Name", "shortName", "string", None),
+    ("Current Price", "currentPrice", "float", None),
+    ("Market Cap", "marketCap", "float", None),
+    ("PE Ratio (TTM)", "trailingPE", "float", None),
+    ("Beta (5Y Monthly)", "beta", "float", None),
+    ("EPS (Trailing)", "trailingEps", "float", None),
+    ("EPS (Forward)", "forwardEps", "float", None),  # Expected EPS for Next Quarter.
+    ("EPS (Current Year)", "epsCurrentYear", "float", None),  # EPS for Current Quarter.
+    ("Sector", "sector", "category", None),
+    ("Industry", "industry", "category", None),
+
+    # ✅ Market Prices & Changes
+    ("Regular Market Price", "regularMarketPrice", "float", None),
+    ("Regular Market Change Percent", "regularMarketChangePercent", "float", None),
+    ("Post Market Change %", "postMarketChangePercent", "float", None),
+    ("Post Market Price", "postMarketPrice", "float", None),  # Stock price in post-market trading
+    ("Post Market Change", "postMarketChange", "float", None),  # Change in stock price after market close
+    ("Regular Market Change", "regularMarketChange", "float", None),  # Change in stock price during regular trading
+    ("Regular Market Day Range", "regularMarketDayRange", "string", None),  # Low-High range during the trading day
+
+    # ✅ 52-Week Performance
+    ("52W Low", "fiftyTwoWeekLow", "float", None),
+    ("52W Low Change", "fiftyTwoWeekLowChange", "float", None),  # Price change from 52-week low
+    ("52W Low Change %", "fiftyTwoWeekLowChangePercent", "float", None),  # % change from 52-week low
+    ("52W Range", "fiftyTwoWeekRange", "string", None),  # 52-week Low-High range
+    ("52W High", "fiftyTwoWeekHigh", "float", None),
+    ("52W High Change", "fiftyTwoWeekHighChange", "float", None),  # Price change from 52-week high
+    ("52W High Change %", "fiftyTwoWeekHighChangePercent", "float", None),  # % change from 52-week high
+    ("52W Change %", "fiftyTwoWeekChangePercent", "float", None),  # % change over the last 52 weeks
+
+    # ✅ Moving Averages & Trends
+    ("50-Day Moving Average", "fiftyDayAverage", "float", None),
+    ("50-Day Avg Change", "fiftyDayAverageChange", "float", None),  # Change from 50-day moving average
+    ("50-Day Avg Change %", "fiftyDayAverageChangePercent", "float", None),  # % change from 50-day MA
+    ("200-Day Moving Average", "twoHundredDayAverage", "float", None),
+    ("200-Day Avg Change", "twoHundredDayAverageChange", "float", None),  # Change from 200-day MA
+    ("200-Day Avg Change %", "twoHundredDayAverageChangePercent", "float", None),  # % change from 200-day MA
+
+    # ✅ Volume
+    ("Volume", "volume", "float", None),
+    ("Regular Market Volume", "regularMarketVolume", "float", None),
+    ("Average Volume", "averageVolume", "float", None),
+    ("Average Volume (10 days)", "averageVolume10days", "float", None),
+    ("Average Daily Volume (10 days)", "averageDailyVolume10Day", "float", None),
+
+    # ✅ Stock Trading Metrics
+    ("Bid", "bid", "float", None),
+    ("Ask", "ask", "float", None),
+    ("Bid Size", "bidSize", "float", None),
+    ("Ask Size", "askSize", "float", None),
+
+    # ✅ Growth Estimates
+    ("Earnings Growth", "earningsGrowth", "float", None),
+    ("Revenue Growth", "revenueGrowth", "float", None),
+    ("Earnings Quarterly Growth", "earningsQuarterlyGrowth", "float", None),
+    ("Trailing PEG Ratio", "trailingPegRatio", "float", None),
+    # PEG < 1: Undervalued
+    # PEG = 1: Fair Value
+    # PEG > 1: Overvalued
+
+    # ✅ Revenue Margins
+    ("Net Profit Margin", "profitMargins", "float", None),
+    ("Gross Margins", "grossMargins", "float", None),
+    ("EBITDA Margins", "ebitdaMargins", "float", None),
+    ("Operating Margins", "operatingMargins", "float", None),
+
+    # ✅ Additional financial ratios [Valuation, Leverage]
+    ("Enterprise Value", "enterpriseValue", "float", None),
+    ("EBITDA", "ebitda", "float", None),
+    ("EV/EBITDA", "enterpriseToEbitda", "float", None),
+    ("Enterprise to Revenue", "enterpriseToRevenue", "float", None),
+    ("Book Value", "bookValue", "float", None),
+    ("Price/Book Ratio", "priceToBook", "float", None),
+    ("Debt/Equity Ratio", "debtToEquity", "float", None),
+    ("ROE (Return on Equity)", "returnOnEquity", "float", None),
+    ("ROA (Return on Assets)", "returnOnAssets", "float", None),
+
+    # ✅ Valuation Metrics
+    ("Total Cash", "totalCash", "float", None),
+    ("Total Debt", "totalDebt", "float", None),
+    ("Free Cash Flow", "freeCashflow", "float", None),  # Levered Free Cash Flow (Cash after servicing Debt).
+    ("Operating Cash Flow", "operatingCashflow", "float", None),
+    ("Quick Ratio", "quickRatio", "float", None),
+    ("Current Ratio", "currentRatio", "float", None),
+    ("Total Revenue", "totalRevenue", "float", None),
+    ("Gross Profits", "grossProfits", "float", None),
+    ("Cash Per Share", "totalCashPerShare", "float", None),
+    ("Revenue per Share", "revenuePerShare", "float", None),
+
+    # ✅ Risk Metrics
+    ("Compensation Timestamp", "compensationAsOfEpochDate", "datetime", "timestamp_s"),
+    ("Compensation Risk", "compensationRisk", "float", None),  # Executive Pay Fairness
+    ("Governance Timestamp", "governanceEpochDate", "datetime", "timestamp_s"),
+    ("Audit Risk", "auditRisk", "float", None),  # Transparency of Financials
+    ("Board Risk", "boardRisk", "float", None),  # Effectiveness & Independence of the Board
+    ("Shareholder Rights Risk", "shareHolderRightsRisk", "float", None),  # Investor Protection
+    ("Overall Risk", "overallRisk", "float", None),  # Combined Score
+
+    # ✅ Analyst Ratings & Price Targets
+    ("Target High Price", "targetHighPrice", "float", None),  # Highest analyst price target
+    ("Target Low Price", "targetLowPrice", "float", None),  # Lowest analyst price target
+    ("Target Mean Price", "targetMeanPrice", "float", None),  # Average analyst price target
+    ("Target Median Price", "targetMedianPrice", "float", None),
+    ("Recommendation Mean", "recommendationMean", "float", None),
+    ("Recommendation Key", "recommendationKey", "category", None),
+    ("Number of Analyst Opinions", "numberOfAnalystOpinions", "float", None),
+    ("Average Analyst Rating", "averageAnalystRating", "string", None),
+
+    # ✅ Stock Splits & Dividends
+    ("Payout Ratio", "payoutRatio", "float", None),  # Share of net income paid out as dividends
+    ("Dividend Rate", "dividendRate", "float", None),  # Annual dividend payout per share
+    ("Dividend Yield", "dividendYield", "float", None),
+    ("Five-Year Avg Dividend Yield", "fiveYearAvgDividendYield", "float", None),
+    ("Last Split Factor", "lastSplitFactor", "string", None),
+    ("Last Split Date", "lastSplitDate", "datetime", "timestamp_s"),
+    ("Last Dividend Value", "lastDividendValue", "float", None),
+    ("Last Dividend Date", "lastDividendDate", "datetime", "timestamp_s"),
+    ("Ex-Dividend Date", "exDividendDate", "datetime", "timestamp_s"),  # Last Day to Qualify for Dividend Payout
+    ("Trailing Annual Dividend Rate", "trailingAnnualDividendRate", "float", None),
+    ("Trailing Annual Dividend Yield", "trailingAnnualDividendYield", "float", None),
+
+    # ✅ Date Fields (Converted)
+    ("Earnings Timestamp", "earningsTimestamp", "datetime", "timestamp_s"),
+    ("Earnings Timestamp Start", "earningsTimestampStart", "datetime", "timestamp_s"),
+    ("Earnings Timestamp End", "earningsTimestampEnd", "datetime", "timestamp_s"),
+    ("Earnings Call Start", "earningsCallTimestampStart", "datetime", "timestamp_s"),
+    ("Earnings Call End", "earningsCallTimestampEnd", "datetime", "timestamp_s"),
+    ("First Trade Date", "firstTradeDateMilliseconds", "datetime", "timestamp_ms"),
+    ("Last Fiscal Year End", "lastFiscalYearEnd", "datetime", "timestamp_s"),
+    ("Next Fiscal Year End", "nextFiscalYearEnd", "datetime", "timestamp_s"),
+    ("Most Recent Quarter", "mostRecentQuarter", "datetime", "timestamp_s"),
+
+    # ✅ Share Structure
+    ("Float Shares", "floatShares", "float", None),  # 🟢 Shares available for trading in the public market.
+    ("Shares Outstanding", "sharesOutstanding", "float", None),  # 🟢 Total number of shares issued by the company.
+    ("Shares Short", "sharesShort", "float", None),  # 🔴 Shares currently sold short (borrowed and sold, not yet repurchased).
+    ("Shares Short Prior Month", "sharesShortPriorMonth", "float", None),  # 🔴 Shares shorted in the prior reporting month.
+    ("Shares Short Previous Month Date", "sharesShortPreviousMonthDate", "datetime", "timestamp_s"),  # 🔴 Date of the previous month's short interest report.
+    ("Date Short Interest", "dateShortInterest", "datetime", "timestamp_s"),  # 🔴 The most recent short interest reporting date.
+    ("Shares Percent Shares Out", "sharesPercentSharesOut", "float", None),  # 🔴 % of total outstanding shares that are shorted.
+    ("Held Percent Insiders", "heldPercentInsiders", "float", None),  # 🟢 % of shares held by insiders (executives, board members).
+    ("Held Percent Institutions", "heldPercentInstitutions", "float", None),  # 🟢 % of shares held by institutional investors.
+    ("Short Ratio (Days to Cover)", "shortRatio", "float", None),  # 🔴 Shares Short / Average Daily Volume.
+    ("Short Percent of Float", "shortPercentOfFloat", "float", None),  # 🔴 % of the float (publicly tradable shares) that is shorted.
+    ("Implied Shares Outstanding", "impliedSharesOutstanding", "float", None),  # 🟢 Theoretical shares incl. convertibles, options, etc.
+
+    # ✅ Business Summary
+    ("Business Summary", "longBusinessSummary", "string", None),
+]
+
+TIMESTAMP_UNITS = {"timestamp_s": "s", "timestamp_ms": "ms"}
+
+
+# ✅ Convert one raw column according to its spec entry (whole column at once)
+def convert_column(values, dtype, transform=None):
+    if transform in TIMESTAMP_UNITS:
+        numbers = pd.to_numeric(values, errors="coerce")
+        numbers = numbers.where(numbers > 0)  # Zero / negative epochs are placeholders, not dates
+        return pd.to_datetime(numbers, unit=TIMESTAMP_UNITS[transform], errors="coerce")
+    if dtype == "float":
+        return pd.to_numeric(values, errors="coerce").astype("float64")
+    if dtype == "category":
+        return values.astype(object).astype("category")  # A column with no labels must not get float categories (read back as numbers)
+    return values.astype("string")
+
+
+# ✅ Build the Nasdaq-100 DataFrame from raw `.info` dicts in one columnar pass
+@metrics.timed("transform.build_stock_frame")
+def build_stock_frame(symbols, infos, spec=COLUMN_SPEC):
+    """`infos[i]` is the info dict for `symbols[i]`, or None if that ticker failed to download."""
+    source_keys = [key for _, key, _, transform in spec if key is not None and transform != "absent"]
+    raw = pd.DataFrame.from_records([info or {} for info in infos], columns=source_keys)
+    empty = pd.Series([None] * len(symbols), dtype="object")
+
+    columns = {}
+    for name, key, dtype, transform in spec:
+        if key is None:
+            columns[name] = pd.Series(symbols, dtype="string")
+        elif transform == "absent":
+            columns[name] = convert_column(empty, dtype, "timestamp_s" if dtype == "datetime" else None)
+        else:
+            columns[name] = convert_column(raw[key], dtype, transform)
+    frame = pd.DataFrame(columns)
+
+    # Keep the old error-row shape: Symbol + "Error" company name, everything else missing
+    failed = pd.Series([info is None for info in infos])
+    frame.loc[failed, "Company Name"] = "Error"
+    return frame
@@ -0,0 +1,191 @@
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tqdm import tqdm  # type: ignore
+
+from run_metrics import metrics
+
+# ✅ Items waiting between two stages (a slow stage holds back its producers instead of buffering everything)
+QUEUE_SIZE = 8
+
+_DONE = object()  # End-of-stream marker: one per finished upstream stage
+
+
+class _Aborted(Exception):
+    """Raised in worker threads once any stage has failed."""
+
+
+class _Stage:
+    def __init__(self, name, fn, upstream, workers, processes, queue_size):
+        self.name = name
+        self.fn = fn
+        self.upstream = upstream
+        self.workers = workers
+        self.processes = processes
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.downstream = []
+        self.open_upstreams = len(upstream)
+        self.active_workers = workers
+        self.busy_seconds = 0.0
+        self.items = 0
+        self.lock = threading.Lock()
+
+
+# ✅ Stages connected by bounded queues: each item moves on as soon as a stage finishes it, so a transform or write
+#    for the first tickers runs while later tickers are still downloading. I/O stages run on threads,
+#    CPU-bound stages (`processes=True`) on a shared process pool (their function must be importable/picklable).
+class Pipeline:
+    """pipeline = Pipeline(); pipeline.source("symbols", symbols)
+    pipeline.stage("fetch", fetch, after="symbols", workers=8)
+    pipeline.stage("transform", build, after="fetch", processes=True)
+    pipeline.stage("export", write, after="transform")
+    results = pipeline.run()  # {"export": [...]} (outputs of stages nothing consumes, in completion order)"""
+
+    def __init__(self, name="pipeline", queue_size=QUEUE_SIZE, processes=2):
+        self.name = name
+        self.queue_size = queue_size
+        self.processes = processes
+        self.sources = {}
+        self.stages = {}
+        self.failed = threading.Event()
+        self.errors = []
+        self.pool = None
+
+    def source(self, name, items):
+        """`items` is an iterable, or a function returning one (called on the pipeline's thread, e.g. a universe load)."""
+        self.sources[name] = items
+        return self
+
+    def stage(self, name, fn, after, workers=1, processes=False):
+        """Apply `fn(item)` to every item from the `after` stage(s); a None result is dropped (e.g. failed tickers)."""
+        upstream = [after] if isinstance(after, str) else list(after)
+        for parent in upstream:
+            if parent not in self.sources and parent not in self.stages:
+                raise ValueError(f"Stage {name!r}: unknown upstream stage {parent!r}")
+        self.stages[name] = _Stage(name, fn, upstream, workers, processes, self.queue_size)
+        return self
+
+    # ---- queue helpers (give up as soon as another stage failed, so nothing blocks forever) ----
+
+    def _put(self, inbox, item):
+        while not self.failed.is_set():
+            try:
+                inbox.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise _Aborted
+
+    def _get(self, inbox):
+        while not self.failed.is_set():
+            try:
+                return inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        raise _Aborted
+
+    def _emit(self, consumers, item):
+        for consumer in consumers:
+            self._put(consumer.inbox, item)
+
+    def _fail(self, stage_name, error):
+        if not self.failed.is_set():
+            self.errors.append((stage_name, error))
+            self.failed.set()
+
+    # ---- workers ----
+
+    def _run_source(self, name, items):
+        consumers = [stage for stage in self.stages.values() if name in stage.upstream]
+        try:
+            for item in (items() if callable(items) else items):
+                self._emit(consumers, item)
+            self._emit(consumers, _DONE)
+        except _Aborted:
+            pass
+        except Exception as e:
+            self._fail(name, e)
+
+    def _run_worker(self, stage, results, progress):
+        try:
+            while True:
+                item = self._get(stage.inbox)
+                if item is _DONE:
+                    with stage.lock:
+                        stage.open_upstreams = max(stage.open_upstreams - 1, 0)
+                        exhausted = stage.open_upstreams == 0
+                    if exhausted:
+                        stage.inbox.put(_DONE)  # Wake the stage's other workers (the queue always has room: producers are done)
+                        break
+                    continue
+                start = time.perf_counter()
+                with metrics.stage(f"pipeline.{self.name}.{stage.name}"):
+                    output = self.pool.submit(stage.fn, item).result() if stage.processes else stage.fn(item)
+                with stage.lock:
+                    stage.busy_seconds += time.perf_counter() - start
+                    stage.items += 1
+                if output is None:
+                    continue
+                if stage.downstream:
+                    self._emit(stage.downstream, output)
+                else:
+                    results[stage.name].append(output)
+                    progress.update()
+        except _Aborted:
+            return
+        except Exception as e:
+            self._fail(stage.name, e)
+            return
+        with stage.lock:
+            stage.active_workers -= 1
+            last_worker = stage.active_workers == 0
+        if last_worker:
+            try:
+                self._emit(stage.downstream, _DONE)
+            except _Aborted:
+                pass
+
+    def run(self, total=None, desc=None):
+        """Run every stage to completion; re-raises the first stage error. `total` sizes the progress bar
+        (items expected out of the final stages)."""
+        for stage in self.stages.values():
+            stage.downstream = [other for other in self.stages.values() if stage.name in other.upstream]
+        results = {stage.name: [] for stage in self.stages.values() if not stage.downstream}
+        if any(stage.processes for stage in self.stages.values()) and self.processes:
+            # Workers are started by a fresh server process, never forked from this (multi-threaded) one
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self.pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context(method))
+        else:
+            for stage in self.stages.values():
+                stage.processes = False  # processes=0: CPU stages fall back to threads
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=self._run_source, args=(name, items), daemon=True)
+                   for name, items in self.sources.items()]
+        with tqdm(total=total, desc=desc or self.name, unit="item") as progress:
+            threads += [threading.Thread(target=self._run_worker, args=(stage, results, progress), daemon=True)
+                        for stage in self.stages.values() for _ in range(stage.workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+        self.wall_seconds = time.perf_counter() - started
+
+        if self.errors:
+            stage_name, error = self.errors[0]
+            print(f"❌ Pipeline stage '{stage_name}' failed: {error}")
+            raise error
+        return results
+
+    def report(self):
+        """Busy time per stage next to the wall time (a well-overlapped run takes about as long as its busiest stage)."""
+        print(f"⏱️ Pipeline '{self.name}': {self.wall_seconds:.2f}s wall")
+        for stage in self.stages.values():
+            kind = "process" if stage.processes else "thread"
+            print(f"   {stage.name:<12} {stage.items:6d} items {stage.busy_seconds / stage.workers:8.2f}s busy per worker "
+                  f"({stage.workers} {kind} worker{'s' if stage.workers > 1 else ''})")
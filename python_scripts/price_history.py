@@ -0,0 +1,198 @@
+import json
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from run_metrics import metrics
+from yf_quotes import OHLCV_FIELDS, download_history, quote_fields
+
+# ✅ Daily bars live outside the repo, next to the other caches (one folder per universe)
+DEFAULT_HISTORY_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mwkt", "prices")
+
+# ✅ First download per ticker (later runs only fetch bars after the last stored session)
+INITIAL_PERIOD = "2y"
+
+
+def rolling_mean(values, window, min_periods=None):
+    """Trailing mean over `window` rows for every column of a (sessions, tickers) array, ignoring NaN."""
+    min_periods = window if min_periods is None else min_periods
+    present = ~np.isnan(values)
+    sums = np.cumsum(np.where(present, values, 0.0), axis=0)
+    counts = np.cumsum(present, axis=0)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts >= min_periods, sums / counts, np.nan)
+
+
+# ✅ One raw float64 file per OHLCV field, shaped (sessions, tickers) and memory-mapped on read
+#    New sessions are appended as rows; new tickers widen the files once (existing columns keep their index)
+#    meta.json is the commit point: bytes past the shape it records (an interrupted write) are dropped on open
+class PriceHistory:
+    """Local daily OHLCV store: `update(symbols)` downloads only new bars, `quotes()` derives `.info` quote fields."""
+
+    def __init__(self, name, root=DEFAULT_HISTORY_DIR):
+        self.path = os.path.join(root, name)
+        os.makedirs(self.path, exist_ok=True)
+        self.meta_path = os.path.join(self.path, "meta.json")
+        self.meta = {"tickers": [], "sessions": 0}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as f:
+                self.meta = json.load(f)
+        self.index = {ticker: i for i, ticker in enumerate(self.meta["tickers"])}
+        self._recover()
+
+    @property
+    def tickers(self):
+        return self.meta["tickers"]
+
+    @property
+    def sessions(self):
+        return self.meta["sessions"]
+
+    def _file(self, field):
+        return os.path.join(self.path, field.lower().replace(" ", "_") + ".f8")
+
+    def _size(self, field):
+        """Bytes of one file at the shape recorded in meta.json."""
+        return self.sessions * (1 if field == "dates" else len(self.tickers)) * 8
+
+    def _save_meta(self):
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.meta_path)  # Atomic: the files are only trusted up to the shape saved here
+
+    def _recover(self):
+        """Bring every file back to the shape in meta.json after a run that crashed mid-write."""
+        for field in ("dates", *OHLCV_FIELDS):
+            path, size = self._file(field), self._size(field)
+            if os.path.exists(f"{path}.tmp"):
+                if os.path.getsize(f"{path}.tmp") == size:  # Widened and committed to meta, not yet swapped in
+                    os.replace(f"{path}.tmp", path)
+                else:  # Widening that never reached meta
+                    os.remove(f"{path}.tmp")
+            stored = os.path.getsize(path) if os.path.exists(path) else 0
+            if stored < size:
+                raise ValueError(f"{path} holds {stored} bytes but meta.json expects {size}; "
+                                 f"delete {self.path} to download the price history again")
+            if stored > size:  # Rows appended before the crash, never recorded in meta
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def _append(self, field, values):
+        """Write rows right after the sessions recorded in meta (overwriting anything a crashed write left there)."""
+        path = self._file(field)
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.truncate(self._size(field))
+            f.seek(0, os.SEEK_END)
+            values.tofile(f)
+
+    def dates(self):
+        if not self.sessions:
+            return np.empty(0, dtype="datetime64[D]")
+        return np.memmap(self._file("dates"), dtype="datetime64[D]", mode="r", shape=(self.sessions,))
+
+    def array(self, field, mode="r"):
+        """(sessions, tickers) memory map of one field (no copy until sliced with fancy indexing)."""
+        if not self.sessions or not self.tickers:
+            return np.empty((self.sessions, len(self.tickers)))
+        return np.memmap(self._file(field), dtype="float64", mode=mode, shape=(self.sessions, len(self.tickers)))
+
+    def _add_tickers(self, tickers):
+        new = [ticker for ticker in dict.fromkeys(tickers) if ticker not in self.index]
+        if not new:
+            return
+        # Every widened file is written before meta changes and swapped in after it (_recover finishes an interrupted swap)
+        if self.sessions:
+            width = len(self.tickers) + len(new)
+            for field in OHLCV_FIELDS:
+                widened = np.full((self.sessions, width), np.nan)
+                widened[:, :len(self.tickers)] = self.array(field)
+                widened.tofile(f"{self._file(field)}.tmp")
+        self.meta["tickers"] = self.tickers + new
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._save_meta()
+        if self.sessions:
+            for field in OHLCV_FIELDS:
+                os.replace(f"{self._file(field)}.tmp", self._file(field))
+
+    @metrics.timed("prices.write")
+    def write(self, bars):
+        """Store a wide (field, ticker) frame of daily bars. Sessions already stored are updated in place
+        (NaN never overwrites a stored value); later sessions are appended. Returns the number of new sessions."""
+        bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+        if bars.empty:
+            return 0
+        tickers = list(dict.fromkeys(bars.columns.get_level_values(1)))
+        self._add_tickers(tickers)
+        columns = np.array([self.index[ticker] for ticker in tickers])
+        bar_dates = pd.DatetimeIndex(bars.index).tz_localize(None).to_numpy().astype("datetime64[D]")
+        stored = np.array(self.dates())
+        existing = np.isin(bar_dates, stored)
+        newer = bar_dates > stored[-1] if len(stored) else np.ones(len(bar_dates), dtype=bool)
+        rows = np.searchsorted(stored, bar_dates[existing])
+
+        for field in OHLCV_FIELDS:
+            values = (bars[field].reindex(columns=tickers) if field in bars.columns.get_level_values(0)
+                      else pd.DataFrame(np.nan, index=bars.index, columns=tickers)).to_numpy(dtype="float64")
+            if existing.any():
+                stored_values = self.array(field, mode="r+")
+                block = np.ix_(rows, columns)
+                stored_values[block] = np.where(np.isnan(values[existing]), stored_values[block], values[existing])
+                stored_values.flush()
+            if newer.any():
+                appended = np.full((newer.sum(), len(self.tickers)), np.nan)
+                appended[:, columns] = values[newer]
+                self._append(field, appended)
+        if newer.any():
+            self._append("dates", bar_dates[newer])
+            self.meta["sessions"] += int(newer.sum())
+            metrics.count("prices.new_sessions", int(newer.sum()))
+        self._save_meta()
+        return int(newer.sum())
+
+    def update(self, symbols, download=download_history, initial_period=INITIAL_PERIOD, refresh=False):
+        """Bring the store up to date for `symbols` with at most two batched downloads:
+        known tickers from their last stored session (always re-fetched, it may have been a partial day), new tickers in full.
+        `refresh=True` downloads the full period for every ticker again (e.g. after a split), updating stored sessions."""
+        known = [symbol for symbol in symbols if symbol in self.index and not refresh]
+        new = [symbol for symbol in symbols if symbol not in known]
+        if known and self.sessions:
+            last_session = pd.Timestamp(self.dates()[-1])
+            self.write(download(known, start=last_session.strftime("%Y-%m-%d"),
+                                end=(date.today() + timedelta(days=1)).isoformat()))
+        if new:
+            self.write(download(new, period=initial_period))
+            print(f"✅ Price history: downloaded {initial_period} of daily bars for {len(new)} tickers.")
+        return self
+
+    # ---- vectorized metrics over every ticker ----
+
+    def _columns(self, tickers):
+        tickers = self.tickers if tickers is None else [ticker for ticker in tickers if ticker in self.index]
+        return tickers, np.array([self.index[ticker] for ticker in tickers], dtype=np.int64)
+
+    @metrics.timed("prices.quotes")
+    def quotes(self, tickers=None, days=365):
+        """`.info`-style quote fields (last price, 50/200-day averages, 52-week range, volume averages)
+        for every ticker, from the last `days` calendar days of stored bars."""
+        tickers, columns = self._columns(tickers)
+        if not self.sessions or not len(columns):
+            return {}
+        dates = self.dates()
+        start = np.searchsorted(dates, dates[-1] - np.timedelta64(days, "D"), side="right")
+        window = {field: self.array(field)[start:, columns] for field in ("Open", "High", "Low", "Close", "Volume")}
+        return quote_fields(tickers, window["Open"], window["High"], window["Low"], window["Close"], window["Volume"])
+
+    def frame(self, field="Close", tickers=None):
+        """One field as a DataFrame (dates x tickers)."""
+        tickers, columns = self._columns(tickers)
+        return pd.DataFrame(self.array(field)[:, columns], index=pd.DatetimeIndex(self.dates(), name="Date"), columns=tickers)
+
+    def moving_average(self, window, field="Close", tickers=None):
+        """Trailing `window`-session average of one field for every ticker (dates x tickers)."""
+        prices = self.frame(field, tickers)
+        return pd.DataFrame(rolling_mean(prices.to_numpy(), window), index=prices.index, columns=prices.columns)
@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from matplotlib import dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from run_metrics import metrics
+
+# Page layout: several charts per landscape page
+PAGE_SIZE = (11, 8.5)
+PANEL_ROWS, PANEL_COLS = 2, 2
+POINTS_PER_PIXEL = 2  # Keep 2 points (min + max) per horizontal pixel of the axes
+
+
+# Reduce a long series to the points that are actually visible: the min and max of each pixel-wide bucket
+def downsample(data, max_points):
+    data = data.dropna()
+    if len(data) <= max_points:
+        return data
+    buckets = pd.Series(data.to_numpy()).groupby(np.arange(len(data)) * (max_points // 2) // len(data))
+    keep = np.union1d(buckets.idxmin().to_numpy(), buckets.idxmax().to_numpy())  # Sorted positions
+    return data.iloc[keep]
+
+
+# Draw one chart onto an existing Axes, reusing its line instead of clearing and rebuilding the Axes
+def plot_series(ax, data, title, ylabel, color="blue"):
+    max_points = int(ax.get_window_extent().width * POINTS_PER_PIXEL)
+    data = downsample(data, max_points)
+    x, y = mdates.date2num(data.index), data.to_numpy(dtype="float64")
+    if ax.lines:
+        line = ax.lines[0]
+        line.set_data(x, y)
+        line.set_color(color)
+    else:
+        ax.plot(x, y, color=color, linewidth=2)
+        ax.xaxis_date()
+        ax.set_xlabel("Year")
+        ax.grid(True)
+    ax.relim()
+    ax.autoscale_view()
+    ax.set_title(title, fontsize=10)
+    ax.set_ylabel(ylabel, fontsize=8)
+
+
+def _pages(charts, panels_per_page):
+    return [charts[i:i + panels_per_page] for i in range(0, len(charts), panels_per_page)]
+
+
+# Render charts into one PDF, reusing a single Figure and its Axes for every page
+def render_pages(charts, output_file, rows=PANEL_ROWS, cols=PANEL_COLS):
+    """`charts` is a list of (data, title, ylabel, color) tuples; empty series are skipped."""
+    figure = Figure(figsize=PAGE_SIZE)
+    FigureCanvasAgg(figure)
+    axes = figure.subplots(rows, cols, squeeze=False).ravel()
+    figure.subplots_adjust(left=0.08, right=0.97, bottom=0.07, top=0.95, wspace=0.28, hspace=0.35)  # Fixed layout, computed once
+
+    with PdfPages(output_file) as pdf:
+        for page in _pages(charts, rows * cols):
+            for ax, chart in zip(axes, page + [None] * (len(axes) - len(page))):
+                ax.set_visible(chart is not None)
+                if chart is not None:
+                    plot_series(ax, *chart)
+            pdf.savefig(figure)
+    return output_file
+
+
+def _render_chunk(args):
+    charts, output_file, rows, cols = args
+    return render_pages(charts, output_file, rows, cols)
+
+
+# Render the report, optionally splitting pages across a process pool and merging the PDFs
+@metrics.timed("render.report")
+def render_report(charts, output_file, rows=PANEL_ROWS, cols=PANEL_COLS, processes=1):
+    charts = [chart for chart in charts if chart[0] is not None and not chart[0].empty]
+    pages = _pages(charts, rows * cols)
+
+    try:
+        from pypdf import PdfWriter
+    except ImportError:  # Merging needs pypdf; render serially without it
+        processes = 1
+    # Fork-based pools only: forked workers start with matplotlib already imported, while spawn/forkserver workers
+    # re-import it and the calling script (~1 s each, more than the pages take). Call this with no other threads
+    # writing files (a fork copies their locks); the macro script writes its panel after rendering for that reason
+    if processes <= 1 or len(pages) <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return render_pages(charts, output_file, rows, cols)
+
+    processes = min(processes, len(pages))
+    pages_per_worker = -(-len(pages) // processes)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        jobs = []
+        for worker in range(processes):
+            worker_pages = pages[worker * pages_per_worker:(worker + 1) * pages_per_worker]
+            worker_charts = [chart for page in worker_pages for chart in page]
+            if worker_charts:
+                jobs.append((worker_charts, os.path.join(tmp_dir, f"part-{worker:03d}.pdf"), rows, cols))
+
+        with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("fork")) as pool:
+            parts = list(pool.map(_render_chunk, jobs))
+
+        writer = PdfWriter()
+        for part in parts:
+            writer.append(part)
+        with open(output_file, "wb") as f:
+            writer.write(f)
+    return output_file
@@ -0,0 +1,162 @@
+import contextlib
+import functools
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+# ✅ One metrics file per run, next to the other outputs
+DEFAULT_METRICS_DIR = os.path.join(os.path.expanduser("~"), "Downloads", "MWKT_Metrics")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process (None where the `resource` module is unavailable, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)  # Bytes on macOS, KiB on Linux
+
+
+# ✅ Thread-safe timings (per stage) and counters (requests, retries, cache hits, bytes written, ...)
+class RunMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.timings = {}
+            self.counters = {}
+            self.started = time.time()
+
+    def observe(self, name, seconds):
+        with self.lock:
+            self.timings.setdefault(name, []).append(seconds)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_file(self, path, name="bytes_written"):
+        if os.path.exists(path):
+            self.count(name, os.path.getsize(path))
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a block: `with metrics.stage("export.excel"): ...`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Decorator version of `stage`."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def summary(self):
+        with self.lock:
+            timings = {name: sorted(values) for name, values in self.timings.items()}
+            counters = dict(self.counters)
+        return {
+            "wall_seconds": round(time.time() - self.started, 3),
+            "peak_memory_mb": peak_memory_mb(),
+            "stages": {
+                name: {
+                    "count": len(values),
+                    "total_seconds": round(sum(values), 4),
+                    "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+                    "p90_ms": round(percentile(values, 0.90) * 1000, 2),
+                    "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+                    "max_ms": round(values[-1] * 1000, 2),
+                }
+                for name, values in sorted(timings.items())
+            },
+            "counters": dict(sorted(counters.items())),
+        }
+
+    def write(self, script, metrics_dir=DEFAULT_METRICS_DIR):
+        os.makedirs(metrics_dir, exist_ok=True)
+        started = datetime.fromtimestamp(self.started)
+        path = os.path.join(metrics_dir, f"{script}_{started:%Y-%m-%d_%H%M%S}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"script": script, "started_at": started.isoformat(timespec="seconds"), **self.summary()}, f, indent=2)
+        return path
+
+
+# ✅ Shared by every module of a run
+metrics = RunMetrics()
+
+
+# ✅ Optional profilers: "cprofile" (in-process, .prof + top functions) or "py-spy" (sampling, flame graph SVG)
+@contextlib.contextmanager
+def profiler(mode, output_stem):
+    if not mode:
+        yield
+        return
+    if mode == "cprofile":
+        import cProfile
+        import pstats
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(f"{output_stem}.prof")
+            pstats.Stats(profile).sort_stats("cumulative").print_stats(25)
+            print(f"⏱️ cProfile stats saved to {output_stem}.prof (open with snakeviz or pstats)")
+    elif mode == "py-spy":
+        if shutil.which("py-spy") is None:
+            print("⚠️ py-spy is not installed (pip install py-spy); running without it.")
+            yield
+            return
+        # py-spy samples this process from outside (no overhead in the profiled code) and writes on SIGINT
+        recorder = subprocess.Popen(["py-spy", "record", "--pid", str(os.getpid()), "--subprocesses",
+                                     "--output", f"{output_stem}.svg"])
+        try:
+            yield
+        finally:
+            recorder.send_signal(signal.SIGINT)
+            recorder.wait()
+            print(f"⏱️ py-spy flame graph saved to {output_stem}.svg")
+    else:
+        raise ValueError(f"Unknown profiler: {mode!r} (use 'cprofile' or 'py-spy')")
+
+
+# ✅ Wrap a script's main(): fresh metrics, optional profiler, metrics JSON written at the end (even on failure)
+def instrumented(script):
+    def decorate(main):
+        @functools.wraps(main)
+        def run(*args, profile=None, metrics_dir=DEFAULT_METRICS_DIR, **kwargs):
+            metrics.reset()
+            os.makedirs(metrics_dir, exist_ok=True)
+            output_stem = os.path.join(metrics_dir, f"{script}_{datetime.fromtimestamp(metrics.started):%Y-%m-%d_%H%M%S}")
+            try:
+                with profiler(profile, output_stem), metrics.stage(f"{script}.total"):
+                    return main(*args, **kwargs)
+            finally:
+                print(f"📈 Run metrics saved to {metrics.write(script, metrics_dir)}")
+        return run
+    return decorate
@@ -0,0 +1,75 @@
+import pandas as pd
+from lxml import html
+
+from run_metrics import metrics
+
+# ✅ Pull only the screener table's HTML from the browser (not the whole page_source)
+TABLE_HTML_JS = """
+    const body = document.querySelector('tbody');
+    const table = body ? body.closest('table') : null;
+    return table ? table.outerHTML : '';
+"""
+
+
+def parse_header_layout(table):
+    """(position, header) for every non-empty <th>, plus the total <th> count."""
+    cells = table.xpath(".//thead//th") or table.xpath(".//th")
+    texts = [cell.text_content().strip() for cell in cells]
+    return [(i, text) for i, text in enumerate(texts) if text], len(texts)
+
+
+# ✅ Accumulates one tab's pages straight into column arrays (header layout parsed once per tab)
+class TableAccumulator:
+    def __init__(self):
+        self.layout = None
+        self.header_count = 0
+        self.columns = None
+        self.rows = 0
+
+    @property
+    def headers(self):
+        return [header for _, header in self.layout] if self.layout else []
+
+    def add_page(self, table_html):
+        """Parse one page of table HTML; returns the number of rows added."""
+        if not table_html:
+            return 0
+        with metrics.stage("parse.screener_page"):
+            return self._add_table(html.fromstring(table_html))
+
+    def _add_table(self, table):
+        if self.layout is None:
+            self.layout, self.header_count = parse_header_layout(table)
+            self.columns = [[] for _ in self.layout]
+        positions = [position for position, _ in self.layout]
+
+        added = 0
+        for row in table.xpath(".//tbody/tr"):
+            cells = row.xpath("./td")
+            if len(cells) <= 1:
+                continue
+            # Rows with one cell per <th> map by position (skipping unlabeled columns like checkboxes)
+            picked = [cells[p] for p in positions] if len(cells) == self.header_count else cells[:len(positions)]
+            for column, cell in zip(self.columns, picked):
+                column.append(cell.text_content().strip())
+            for column in self.columns[len(picked):]:
+                column.append(None)
+            added += 1
+        self.rows += added
+        return added
+
+    def to_frame(self):
+        frame = pd.DataFrame(dict(enumerate(self.columns or [])))
+        frame.columns = self.headers  # Set afterwards so duplicate header names survive
+        return frame
+
+    def drain(self):
+        """Frame of the rows added since the last drain; the header layout is kept for the next page."""
+        frame = self.to_frame()
+        self.columns = [[] for _ in self.layout] if self.layout else None
+        return frame
+
+
+def fetch_table_html(driver):
+    with metrics.stage("request.table_html"):
+        return driver.execute_script(TABLE_HTML_JS)
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from run_metrics import metrics
+
+# ✅ Cache lives outside the repo, next to the yfinance info cache
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mwkt", "series")
+
+# ✅ Re-download this many days before the last cached observation (sources revise recent data)
+REVISION_OVERLAP_DAYS = 0
+
+
+class SeriesCache:
+    """Local cache of time series keyed by (source, series id, start date) that only fetches new observations."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, revision_overlap_days=REVISION_OVERLAP_DAYS):
+        self.cache_dir = cache_dir
+        self.revision_overlap = timedelta(days=revision_overlap_days)
+        self.lock = threading.Lock()
+        self.stats = {"cached": 0, "incremental": 0, "full": 0, "new_observations": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, source, series_id, start):
+        safe_id = "".join(c if c.isalnum() or c in ("-", "_") else "_" for c in series_id)
+        if len(safe_id) > 60:
+            safe_id = hashlib.sha1(series_id.encode()).hexdigest()[:16]
+        stem = os.path.join(self.cache_dir, f"{source}_{safe_id}_{start:%Y%m%d}")
+        return f"{stem}.parquet", f"{stem}.json"
+
+    def _count(self, stat, amount=1):
+        with self.lock:
+            self.stats[stat] += amount
+        metrics.count(f"series_cache.{stat}", amount)
+
+    def get(self, source, series_id, start, end, fetch):
+        """Return observations between `start` and `end`.
+
+        `fetch(start, end)` downloads a Series or DataFrame with a DatetimeIndex; it is only called
+        for dates after the last cached observation, and not at all if the series was checked today.
+        """
+        data_path, meta_path = self._paths(source, series_id, start)
+        cached, meta = None, {}
+        if os.path.exists(data_path) and os.path.exists(meta_path):
+            cached = pd.read_parquet(data_path)
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+
+        today = datetime.today().strftime("%Y-%m-%d")
+        if cached is not None and (meta.get("checked_at") == today or meta.get("end", "") >= f"{end:%Y-%m-%d}"):
+            self._count("cached")
+            data = cached
+        elif cached is not None and not cached.empty:
+            fetch_from = cached.index.max() - self.revision_overlap
+            with metrics.stage(f"request.{source}"):
+                new = self._as_frame(fetch(fetch_from.to_pydatetime(), end), meta.get("series_name"))
+            # New observations win over cached ones for overlapping dates (revisions)
+            data = pd.concat([cached[cached.index < fetch_from], new]).sort_index()
+            data = data[~data.index.duplicated(keep="last")]
+            self._count("incremental")
+            self._count("new_observations", int((new.index > cached.index.max()).sum()))
+        else:
+            with metrics.stage(f"request.{source}"):
+                series = fetch(start, end)
+            meta["series_name"] = "value" if isinstance(series, pd.Series) else None
+            data = self._as_frame(series, meta["series_name"])
+            self._count("full")
+            self._count("new_observations", len(data))
+
+        if data is not cached:
+            data.to_parquet(data_path)
+            meta.update({"checked_at": today, "end": f"{end:%Y-%m-%d}" if end.date() < datetime.today().date() else ""})
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+        data = data[(data.index >= pd.Timestamp(start)) & (data.index <= pd.Timestamp(end))]
+        return data[meta["series_name"]] if meta.get("series_name") else data
+
+    @staticmethod
+    def _as_frame(data, series_name):
+        frame = data.to_frame(series_name or "value") if isinstance(data, pd.Series) else data.copy()
+        frame.index = pd.to_datetime(frame.index)
+        frame.columns = [str(c) for c in frame.columns]  # Parquet needs string column names
+        return frame.sort_index()
+
+    def report(self):
+        print(f"📦 Series cache: {self.stats['cached']} served from cache, {self.stats['incremental']} incremental "
+              f"and {self.stats['full']} full downloads, {self.stats['new_observations']} new observations")
@@ -0,0 +1,166 @@
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from run_metrics import metrics
+
+# ✅ Snapshots live next to the old Excel exports, one folder per dataset
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser("~"), "Downloads", "MWKT_Snapshots")
+
+# ✅ Long layout: one row per (symbol, field) value that changed on a snapshot date
+#    kind is "num", "text" or "datetime" so wide frames come back with their original dtypes
+STORE_COLUMNS = ["symbol", "field", "kind", "value_num", "value_text", "written_at"]
+
+# ✅ Membership is stored as one more field: 1 when a symbol is written, 0 (a tombstone) when it leaves the universe
+MEMBER_FIELD = "__member__"
+
+
+# ✅ Turn a wide frame (one row per symbol) into the long (symbol, field, value) layout
+def to_long(frame, key):
+    symbols = frame[key].astype(str).to_numpy()
+    parts = []
+    for field in frame.columns:
+        if field == key:
+            continue
+        column = frame[field]
+        part = pd.DataFrame({"symbol": symbols, "field": field})
+        if pd.api.types.is_datetime64_any_dtype(column):
+            part["kind"] = "datetime"
+            part["value_num"] = float("nan")
+            part["value_text"] = column.dt.strftime("%Y-%m-%dT%H:%M:%S").to_numpy()
+        elif pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+            part["kind"] = "num"
+            part["value_num"] = column.astype("float64").to_numpy()
+            part["value_text"] = None
+        else:
+            part["kind"] = "text"
+            part["value_num"] = float("nan")
+            part["value_text"] = column.map(lambda v: None if v is None or v is pd.NA or v != v else str(v)).to_numpy()
+        parts.append(part)
+    long = pd.concat(parts, ignore_index=True)
+    long["value_text"] = long["value_text"].astype("string")
+    return long
+
+
+class SnapshotStore:
+    """Date-partitioned Parquet history of a wide dataset, written as deltas."""
+
+    def __init__(self, dataset, root=DEFAULT_STORE_DIR):
+        self.dataset = dataset
+        self.path = os.path.join(root, dataset)
+        os.makedirs(self.path, exist_ok=True)
+
+    def snapshot_dates(self):
+        return sorted(name.split("=", 1)[1] for name in os.listdir(self.path) if name.startswith("snapshot_date="))
+
+    def _read(self, filters=None):
+        if not self.snapshot_dates():
+            return pd.DataFrame(columns=STORE_COLUMNS + ["snapshot_date"])
+        changes = pd.read_parquet(self.path, filters=filters)
+        changes["snapshot_date"] = changes["snapshot_date"].astype(str)
+        return changes.sort_values(["snapshot_date", "written_at"], kind="stable")
+
+    def changes(self, as_of=None):
+        """Every change written on or before `as_of` (YYYY-MM-DD), oldest first."""
+        return self._read([("snapshot_date", "<=", as_of)] if as_of else None)
+
+    @staticmethod
+    def _members(changes):
+        """Latest change per (symbol, field) without the membership rows and without symbols that left the universe."""
+        state = changes.drop_duplicates(["symbol", "field"], keep="last")
+        removed = state.loc[(state["field"] == MEMBER_FIELD) & (state["value_num"] == 0), "symbol"]
+        return state[(state["field"] != MEMBER_FIELD) & ~state["symbol"].isin(removed)]
+
+    def state(self, as_of=None):
+        """Latest long-format value of every (symbol, field) on or before `as_of`, for symbols in the universe then."""
+        return self._members(self.changes(as_of))
+
+    @metrics.timed("export.snapshot_store")
+    def write(self, frame, key="Symbol", snapshot_date=None, complete=True, failed=()):
+        """Append only the values that differ from the current state; returns the number of rows written.
+        `complete`: the frame is the whole universe, so stored symbols missing from it are recorded as removed.
+        `failed`: keys whose rows are fetch errors; their stored values are kept until the next good fetch."""
+        snapshot_date = snapshot_date or datetime.today().strftime("%Y-%m-%d")
+        failed = set(failed)
+        symbols = frame[key].astype(str)
+        new = to_long(frame[~symbols.isin(failed)], key)
+        current = self.changes().drop_duplicates(["symbol", "field"], keep="last")
+
+        # Membership rows: every written symbol is present, and (for a complete frame) every other stored symbol is gone
+        members = current.loc[current["field"] == MEMBER_FIELD].set_index("symbol")["value_num"]
+        stored = pd.Index(pd.unique(current["symbol"]))
+        present = pd.unique(symbols)
+        gone = stored[~stored.isin(present) & (members.reindex(stored) != 0).to_numpy()] if complete else stored[:0]
+        membership = pd.DataFrame({"symbol": [*present, *gone], "field": MEMBER_FIELD, "kind": "num",
+                                   "value_num": [1.0] * len(present) + [0.0] * len(gone), "value_text": None})
+        membership["value_text"] = membership["value_text"].astype("string")
+        new = pd.concat([new, membership], ignore_index=True)
+        current = current[["symbol", "field", "kind", "value_num", "value_text"]]
+
+        merged = new.merge(current, on=["symbol", "field"], how="left", suffixes=("", "_old"), indicator=True)
+        same_num = (merged["value_num"] == merged["value_num_old"]) | (merged["value_num"].isna() & merged["value_num_old"].isna())
+        same_text = (merged["value_text"] == merged["value_text_old"]).fillna(False) | (merged["value_text"].isna() & merged["value_text_old"].isna())
+        unchanged = (merged["_merge"] == "both") & (merged["kind"] == merged["kind_old"]) & same_num & same_text
+        # Brand-new (symbol, field) pairs that are empty carry no information
+        empty_new = (merged["_merge"] == "left_only") & merged["value_num"].isna() & merged["value_text"].isna()
+
+        delta = merged.loc[~unchanged & ~empty_new, ["symbol", "field", "kind", "value_num", "value_text"]].copy()
+        if delta.empty:
+            return 0
+        delta["written_at"] = time.time()
+
+        partition = os.path.join(self.path, f"snapshot_date={snapshot_date}")
+        os.makedirs(partition, exist_ok=True)
+        part_number = len(os.listdir(partition))
+        part_file = os.path.join(partition, f"part-{part_number:04d}.parquet")
+        delta.to_parquet(part_file, index=False)
+        metrics.count_file(part_file)
+        return len(delta)
+
+    def latest(self, as_of=None, key="Symbol"):
+        """Rebuild the wide frame as it looked on `as_of` (default: newest snapshot)."""
+        changes = self.changes(as_of)
+        state = self._members(changes)
+        values = state["value_text"].astype(object).where(state["kind"] != "num", state["value_num"])
+        wide = pd.DataFrame({"symbol": state["symbol"], "field": state["field"], "value": values})
+        wide = wide.pivot(index="symbol", columns="field", values="value")
+        kinds = state.drop_duplicates("field", keep="last").set_index("field")["kind"]
+        for field in wide.columns:
+            if kinds[field] == "num":
+                wide[field] = pd.to_numeric(wide[field])
+            elif kinds[field] == "datetime":
+                wide[field] = pd.to_datetime(wide[field])
+        # Restore first-seen row/column order (pivot sorts alphabetically)
+        order = changes[changes["symbol"].isin(state["symbol"]) & (changes["field"] != MEMBER_FIELD)]
+        wide = wide.reindex(index=pd.unique(order["symbol"]), columns=pd.unique(order["field"]))
+        wide.columns.name = None
+        return wide.rename_axis(key).reset_index()
+
+    @staticmethod
+    def _carry(changes, dates):
+        """One field's changes as a value at every snapshot date (missing before its first change)."""
+        changes = changes.drop_duplicates("snapshot_date", keep="last").set_index("snapshot_date")
+        values = changes["value_num"] if (changes["kind"] == "num").all() else changes["value_text"]
+        # Unchanged values are not rewritten, so carry the last change forward across later snapshots
+        # (only into dates without a change: a value written as missing stays missing, as in latest())
+        last_change = np.maximum.accumulate(np.where(dates.isin(values.index), np.arange(len(dates)), -1))
+        carried = pd.Series(values.reindex(dates).to_numpy()[np.maximum(last_change, 0)], index=dates, dtype=values.dtype)
+        return carried.where(last_change >= 0)
+
+    def history(self, symbol, field):
+        """Value of one field for one symbol at every snapshot date (e.g. AAPL trailingPE over time);
+        missing while the symbol is out of the universe."""
+        changes = self._read([("symbol", "==", symbol), ("field", "in", [field, MEMBER_FIELD])])
+        dates = pd.Index(self.snapshot_dates(), name="snapshot_date")
+        values = self._carry(changes[changes["field"] == field], dates)
+        member = self._carry(changes[changes["field"] == MEMBER_FIELD], dates)
+        return values.where(member != 0).rename(f"{symbol} {field}")
+
+    def export_excel(self, output_file, sheet_name, as_of=None, key="Symbol"):
+        """Optional Excel export of one snapshot (the store stays the system of record)."""
+        from data_export import export_sheets
+
+        return export_sheets(output_file, {sheet_name: self.latest(as_of, key)})[0]
@@ -0,0 +1,130 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from run_metrics import metrics
+from ttm import compute_ttm, ttm_for
+from yf_fetch import fetch_all, fetch_info
+
+# ✅ yfinance statement attributes fetched for every ticker
+STATEMENTS = {
+    "Income Statement": "financials",
+    "Balance Sheet": "balance_sheet",
+    "Cash Flow Statement": "cashflow",
+    "Quarterly Income Statement": "quarterly_financials",
+    "Quarterly Balance Sheet": "quarterly_balance_sheet",
+    "Quarterly Cash Flow Statement": "quarterly_cashflow",
+}
+
+# ✅ Sheets of the per-ticker workbook (each with its TTM column first)
+WORKBOOK_SHEETS = ["Income Statement", "Balance Sheet", "Cash Flow Statement"]
+
+
+def _statement_provider(attribute):
+    def provider(ticker):
+        import yfinance as yf
+
+        return getattr(yf.Ticker(ticker), attribute)
+    return provider
+
+
+def _fetch_statement(ticker, name, requests_per_second, retries, statement_provider):
+    try:
+        return fetch_info(ticker, statement_provider(STATEMENTS[name]), retries=retries, requests_per_second=requests_per_second)
+    except Exception as e:
+        print(f"❌ Error retrieving {name} for {ticker}: {e}")
+        return pd.DataFrame()
+
+
+# ✅ Fetch all six statements for all tickers on one thread pool (yfinance shares one HTTP session)
+def fetch_statements(tickers, max_workers=8, requests_per_second=5, retries=3, statement_provider=_statement_provider):
+    """Returns ({ticker: {statement name: DataFrame}}, {ticker: seconds spent in requests}).
+
+    `statement_provider(attribute)` returns the per-ticker fetch function (offline fixtures in benchmarks)."""
+    tasks = [(ticker, name) for ticker in tickers for name in STATEMENTS]
+
+    def fetch_task(task):
+        ticker, name = task
+        start = time.perf_counter()
+        df = _fetch_statement(ticker, name, requests_per_second, retries, statement_provider)
+        return ticker, name, df, time.perf_counter() - start
+
+    results = defaultdict(dict)
+    latencies = defaultdict(float)
+    for ticker, name, df, seconds in fetch_all(tasks, fetch_task, max_workers=max_workers,
+                                               desc="Fetching statements", unit="statement"):
+        results[ticker][name] = df
+        latencies[ticker] += seconds
+    return dict(results), dict(latencies)
+
+
+# ✅ All six statements of one ticker (the unit of work when statements are pipelined ticker by ticker)
+def fetch_ticker_statements(ticker, requests_per_second=5, retries=3, statement_provider=_statement_provider, executor=None):
+    """Returns ({statement name: DataFrame}, seconds spent in requests); the six requests run concurrently.
+
+    Pass one shared `executor` when fetching several tickers at once, so its size caps all statement requests."""
+    def fetch_timed(name):
+        start = time.perf_counter()
+        return _fetch_statement(ticker, name, requests_per_second, retries, statement_provider), time.perf_counter() - start
+
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=len(STATEMENTS)) as own_executor:
+            results = dict(zip(STATEMENTS, own_executor.map(fetch_timed, STATEMENTS)))
+    else:
+        results = dict(zip(STATEMENTS, executor.map(fetch_timed, STATEMENTS)))
+    return {name: df for name, (df, _) in results.items()}, sum(seconds for _, seconds in results.values())
+
+
+# ✅ Stack {ticker: {statement: DataFrame}} into one long (ticker, statement, line item, period, value) frame
+@metrics.timed("transform.stack_statements")
+def stack_statements(results):
+    parts = []
+    for ticker, statements in results.items():
+        for name, df in statements.items():
+            if df is None or df.empty:
+                continue
+            long = df.rename_axis(index="line_item", columns="period").stack(future_stack=True).rename("value").reset_index()
+            long.insert(0, "statement", name)
+            long.insert(0, "ticker", ticker)
+            parts.append(long)
+    if not parts:
+        return pd.DataFrame(columns=["ticker", "statement", "line_item", "period", "value"])
+    stacked = pd.concat(parts, ignore_index=True)
+    stacked["value"] = pd.to_numeric(stacked["value"], errors="coerce")
+    stacked["period"] = pd.to_datetime(stacked["period"])
+    for column in ("ticker", "statement", "line_item"):
+        stacked[column] = stacked[column].astype("category")
+    return stacked
+
+
+# ✅ Function to format each statement correctly
+@metrics.timed("transform.format_statement")
+def format_statement(df, ttm_series, statement_name):
+    """Format the financial statement for proper Excel formatting with TTM included."""
+    df = df.copy()  # Avoid modifying original data
+    df.insert(0, "TTM", ttm_series)  # Add TTM as the first column
+    df.index.name = statement_name  # Set index name as statement title
+    df.reset_index(inplace=True)  # Move row names to a column
+    return df
+
+
+# ✅ One ticker's workbook sheets with TTM (module-level so it can run on a process pool)
+def workbook_sheets(ticker, statements, ttm_table=None):
+    """`ttm_table` from `compute_ttm` over many tickers, or computed here for this ticker alone."""
+    if ttm_table is None:
+        ttm_table = compute_ttm(stack_statements({ticker: statements}))
+    return {name: format_statement(statements[name], ttm_for(ttm_table, ticker, name), name) for name in WORKBOOK_SHEETS}
+
+
+def ticker_workbook(item):
+    """Pipeline transform: (ticker, company name, statements) -> (ticker, company name, workbook sheets)."""
+    ticker, company_name, statements = item
+    return ticker, company_name, workbook_sheets(ticker, statements)
+
+
+def print_latency_report(latencies):
+    print("⏱️ Per-ticker request time:")
+    for ticker, seconds in sorted(latencies.items(), key=lambda item: item[1], reverse=True):
+        print(f"   {ticker:<8} {seconds:6.2f}s")
@@ -0,0 +1,315 @@
+import numpy as np
+import pandas as pd
+
+from run_metrics import metrics
+
+
+# ✅ Filter expressions: Field("Trailing PEG Ratio").between(0, 1) & (Field("Sector") == "Technology")
+class Condition:
+    """Boolean row mask built from Field comparisons; combine with &, | and ~."""
+
+    def __init__(self, evaluate, text):
+        self.evaluate = evaluate  # Screen -> boolean NumPy array
+        self.text = text
+
+    def __and__(self, other):
+        return Condition(lambda screen: self.evaluate(screen) & other.evaluate(screen), f"({self.text} & {other.text})")
+
+    def __or__(self, other):
+        return Condition(lambda screen: self.evaluate(screen) | other.evaluate(screen), f"({self.text} | {other.text})")
+
+    def __invert__(self):
+        return Condition(lambda screen: ~self.evaluate(screen), f"~{self.text}")
+
+    def __repr__(self):
+        return f"Condition({self.text})"
+
+
+class Field:
+    """A column of the screened frame. Numeric columns support <, <=, >, >=, between;
+    category/string columns support ==, != and isin. Missing values never match."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def values(self, screen):
+        return screen.numeric(self.name)
+
+    def missing(self, screen):
+        if self.name in screen.arrays:
+            return np.isnan(self.values(screen))  # Derived values (ranks, z-scores) can be missing on their own
+        return screen.missing(self.name)
+
+    def _compare(self, op, other, symbol):
+        def evaluate(screen):
+            right = other.values(screen) if isinstance(other, Field) else other
+            return op(self.values(screen), right)
+        return Condition(evaluate, f"{self} {symbol} {other!r}")
+
+    def __lt__(self, other):
+        return self._compare(np.less, other, "<")
+
+    def __le__(self, other):
+        return self._compare(np.less_equal, other, "<=")
+
+    def __gt__(self, other):
+        return self._compare(np.greater, other, ">")
+
+    def __ge__(self, other):
+        return self._compare(np.greater_equal, other, ">=")
+
+    def between(self, low, high):
+        def evaluate(screen):
+            values = self.values(screen)
+            return (values >= low) & (values <= high)
+        return Condition(evaluate, f"{self} in [{low}, {high}]")
+
+    def isin(self, labels):
+        labels = list(labels)
+        return Condition(lambda screen: screen.label_mask(self.name, labels), f"{self} in {labels!r}")
+
+    def __eq__(self, other):
+        if isinstance(other, str):
+            return self.isin([other])
+        return self._compare(np.equal, other, "==")
+
+    def __ne__(self, other):
+        equal = self == other
+        return Condition(lambda screen: ~equal.evaluate(screen) & ~self.missing(screen), f"{self} != {other!r}")
+
+    def notna(self):
+        return Condition(lambda screen: ~screen.missing(self.name), f"{self} present")
+
+    def isna(self):
+        return Condition(lambda screen: screen.missing(self.name), f"{self} missing")
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return f"Field({self.name!r})"
+
+
+class PctRank(Field):
+    """Percentile rank (0-1] of a numeric column, optionally within a group column such as "Sector".
+    With `where`, only rows matching that condition are ranked (the others never match)."""
+
+    def __init__(self, name, by=None, ascending=True, where=None):
+        super().__init__(name)
+        self.by = by
+        self.ascending = ascending
+        self.where = where
+
+    def values(self, screen):
+        rows = None if self.where is None else screen.mask(self.where)
+        return screen.pct_rank(self.name, self.by, self.ascending, rows)
+
+    def __repr__(self):
+        where = "" if self.where is None else f", where={self.where.text}"
+        return f"PctRank({self.name!r}, by={self.by!r}{where})"
+
+
+class ZScore(Field):
+    """Z-score of a numeric column, optionally against its group's mean and standard deviation
+    (0 in a group with a single value or no spread). With `where`, the moments come from rows matching that condition only (the others never match)."""
+
+    def __init__(self, name, by=None, where=None):
+        super().__init__(name)
+        self.by = by
+        self.where = where
+
+    def values(self, screen):
+        rows = None if self.where is None else screen.mask(self.where)
+        return screen.zscore(self.name, self.by, rows)
+
+    def __repr__(self):
+        where = "" if self.where is None else f", where={self.where.text}"
+        return f"ZScore({self.name!r}, by={self.by!r}{where})"
+
+
+# ✅ Group index: integer codes per row, computed once per group column and shared by every query
+class GroupIndex:
+    def __init__(self, labels):
+        codes, self.names = pd.factorize(labels, use_na_sentinel=True)
+        self.codes = codes.astype(np.int64)  # -1 = no group (missing label)
+        self.size = len(self.names)
+
+    @classmethod
+    def single(cls, rows):
+        index = cls.__new__(cls)
+        index.codes, index.names, index.size = np.zeros(rows, dtype=np.int64), pd.Index(["All"]), 1
+        return index
+
+
+def group_pct_rank(values, codes, groups):
+    """Percentile rank within each group (ties share their average rank, like pandas `rank(pct=True)`)."""
+    ranks = np.full(len(values), np.nan)
+    rows = np.flatnonzero(~np.isnan(values) & (codes >= 0))
+    if not len(rows):
+        return ranks
+    v, c = values[rows], codes[rows]
+    order = np.lexsort((v, c))
+    v, c = v[order], c[order]
+    counts = np.bincount(c, minlength=groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    position = np.arange(1, len(order) + 1) - starts[c]
+    run = np.cumsum(np.r_[True, (c[1:] != c[:-1]) | (v[1:] != v[:-1])]) - 1  # Runs of tied values
+    average_position = np.bincount(run, weights=position) / np.bincount(run)
+    ranks[rows[order]] = average_position[run] / counts[c]
+    return ranks
+
+
+def group_moments(values, codes, groups):
+    """Per-group (count, mean, sample standard deviation), ignoring NaN."""
+    valid = ~np.isnan(values) & (codes >= 0)
+    c, v = codes[valid], values[valid]
+    count = np.bincount(c, minlength=groups).astype("float64")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(c, weights=v, minlength=groups) / count
+        std = np.sqrt(np.bincount(c, weights=(v - mean[c]) ** 2, minlength=groups) / (count - 1))
+    return count, mean, std
+
+
+# ✅ In-process screening over the Nasdaq-100 (or any universe) DataFrame
+class Screen:
+    """Numeric columns are held as float64 arrays and group indexes are built once, so filters,
+    ranks, z-scores and composite scores are plain NumPy operations that are memoized per query."""
+
+    def __init__(self, frame, key="Symbol", groups=("Sector", "Industry")):
+        self.frame = frame.reset_index(drop=True)
+        self.key = key
+        self.rows = len(self.frame)
+        self.arrays = {
+            column: self.frame[column].to_numpy(dtype="float64", na_value=np.nan)
+            for column in self.frame.columns
+            if pd.api.types.is_numeric_dtype(self.frame[column]) and not pd.api.types.is_bool_dtype(self.frame[column])
+        }
+        self.labels = {}
+        self.group_indexes = {None: GroupIndex.single(self.rows)}
+        for column in groups:
+            if column in self.frame.columns:
+                self.group_index(column)
+        self.cache = {}
+
+    # ---- column access (typed) ----
+
+    def numeric(self, column):
+        if column not in self.arrays:
+            if column not in self.frame.columns:
+                raise KeyError(f"Unknown column: {column!r}")
+            raise TypeError(f"{column!r} is not numeric ({self.frame[column].dtype}); use == / isin instead")
+        return self.arrays[column]
+
+    def _label_codes(self, column):
+        if column not in self.labels:
+            if column not in self.frame.columns:
+                raise KeyError(f"Unknown column: {column!r}")
+            if column in self.arrays:
+                raise TypeError(f"{column!r} is numeric; compare it with <, >, between instead")
+            self.labels[column] = GroupIndex(self.frame[column])
+        return self.labels[column]
+
+    def label_mask(self, column, labels):
+        index = self._label_codes(column)
+        wanted = np.flatnonzero(index.names.isin(labels))
+        return np.isin(index.codes, wanted)
+
+    def missing(self, column):
+        if column in self.arrays:
+            return np.isnan(self.arrays[column])
+        return self._label_codes(column).codes < 0
+
+    def group_index(self, by):
+        if by not in self.group_indexes:
+            self.group_indexes[by] = self._label_codes(by)
+        return self.group_indexes[by]
+
+    # ---- memoized column statistics ----
+
+    def _memo(self, key, compute):
+        if key not in self.cache:
+            self.cache[key] = compute()
+        return self.cache[key]
+
+    def _values(self, column, rows=None):
+        """Numeric column, with rows outside the `rows` mask treated as missing."""
+        values = self.numeric(column)
+        return values if rows is None else np.where(rows, values, np.nan)
+
+    @staticmethod
+    def _rows_key(rows):
+        return None if rows is None else np.packbits(rows).tobytes()
+
+    def pct_rank(self, column, by=None, ascending=True, rows=None):
+        """Percentile ranks; with a `rows` mask, only those rows are ranked (against each other)."""
+        def compute():
+            index = self.group_index(by)
+            values = self._values(column, rows)
+            return group_pct_rank(values if ascending else -values, index.codes, index.size)
+        return self._memo(("pct_rank", column, by, ascending, self._rows_key(rows)), compute)
+
+    def zscore(self, column, by=None, rows=None):
+        """Z-scores; with a `rows` mask, the mean and deviation come from those rows only.
+        A group with a single value or no spread scores 0 (neutral), so single-name sectors stay in rankings."""
+        def compute():
+            index = self.group_index(by)
+            values = self._values(column, rows)
+            count, mean, std = group_moments(values, index.codes, index.size)
+            codes = np.where(index.codes >= 0, index.codes, 0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                scores = (values - mean[codes]) / std[codes]
+            scores[~(std[codes] > 0)] = 0.0  # Nothing to deviate from (std NaN for one value, 0 for identical values)
+            scores[(index.codes < 0) | ~np.isfinite(values) | ~np.isfinite(scores)] = np.nan
+            return scores
+        return self._memo(("zscore", column, by, self._rows_key(rows)), compute)
+
+    def group_stats(self, column, by="Sector"):
+        """Count, mean and standard deviation of a numeric column per group."""
+        index = self.group_index(by)
+        count, mean, std = group_moments(self.numeric(column), index.codes, index.size)
+        return pd.DataFrame({"count": count.astype(int), "mean": mean, "std": std}, index=pd.Index(index.names, name=by))
+
+    def composite(self, weights, by=None, method="zscore", rows=None):
+        """Weighted factor score. `weights` maps column -> weight; a negative weight means lower is better.
+        Rows missing some factors are scored on the factors they have (weights renormalized).
+        With a `rows` mask, factors are normalized over those rows only (the others score NaN)."""
+        scores = np.zeros(self.rows)
+        total_weight = np.zeros(self.rows)
+        for column, weight in weights.items():
+            if method == "zscore":
+                factor = self.zscore(column, by, rows)
+            elif method == "rank":
+                factor = self.pct_rank(column, by, rows=rows) - 0.5  # Centre ranks so the sign of the weight matters
+            else:
+                raise ValueError(f"Unknown method: {method!r} (use 'zscore' or 'rank')")
+            present = ~np.isnan(factor)
+            scores[present] += weight * factor[present]
+            total_weight[present] += abs(weight)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total_weight > 0, scores / total_weight, np.nan)
+
+    # ---- queries ----
+
+    def mask(self, condition=None):
+        return np.ones(self.rows, dtype=bool) if condition is None else condition.evaluate(self)
+
+    def filter(self, condition=None, columns=None):
+        rows = self.frame.loc[self.mask(condition)]
+        return rows if columns is None else rows[[self.key, *[c for c in columns if c != self.key]]]
+
+    @metrics.timed("screen.rank")
+    def rank(self, weights, condition=None, by=None, top=None, columns=None, method="zscore", score_name="Score"):
+        """Rows matching `condition`, scored by `composite(weights, by)` over those rows and sorted best first.
+        With `top`, keep the best `top` rows (per `by` group when given)."""
+        matching = None if condition is None else self.mask(condition)
+        scores = self.composite(weights, by, method, rows=matching)
+        rows = np.flatnonzero(~np.isnan(scores))
+        if top is not None:
+            codes = self.group_index(by).codes[rows]
+            rows = rows[np.lexsort((-scores[rows], codes))]  # Group, then best score first
+            codes = self.group_index(by).codes[rows]
+            rows = rows[np.arange(len(rows)) - np.searchsorted(codes, codes, side="left") < top]
+        rows = rows[np.argsort(-scores[rows], kind="stable")]
+
+        columns = [self.key, *(by,) * (by is not None), *(columns or weights)]
+        result = self.frame.iloc[rows][list(dict.fromkeys(c for c in columns if c in self.frame.columns))]
+        return result.assign(**{score_name: scores[rows]}).reset_index(drop=True)
@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The scripts import their helper modules by name from python_scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from morningstar_api import ScreenerClient  # noqa: E402
+from morningstar_stub_server import FIXTURE_FILE, start_stub_server  # noqa: E402
+
+PAGE_SIZE = 2
+
+
+@pytest.fixture(scope="session")
+def api_url():
+    server, url = start_stub_server()
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture(scope="session")
+def fixture_rows():
+    with open(FIXTURE_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class RecordingClient(ScreenerClient):
+    """Stub-server client that records requested pages and can fail on one of them."""
+
+    def __init__(self, api_url, fail_on_page=None):
+        super().__init__(api_url=api_url, page_size=PAGE_SIZE, max_workers=1)
+        self.pages = []
+        self.fail_on_page = fail_on_page
+
+    def fetch_page(self, datapoints, page):
+        if page == self.fail_on_page:
+            raise ConnectionError(f"dropped connection on page {page}")
+        self.pages.append(page)
+        return super().fetch_page(datapoints, page)
+
+
+@pytest.fixture
+def make_client(api_url):
+    """`make_client(fail_on_page=None)` -> a RecordingClient against the stub server."""
+    return lambda fail_on_page=None: RecordingClient(api_url, fail_on_page)
@@ -0,0 +1,29 @@
+from conftest import PAGE_SIZE
+from morningstar_api import TAB_COLUMNS
+
+
+def test_page_count_follows_total(make_client, fixture_rows):
+    client = make_client()
+    rows = client.fetch_rows(["SecId"])
+    expected_pages = -(-fixture_rows["total"] // PAGE_SIZE)
+    assert sorted(client.pages) == list(range(1, expected_pages + 1))
+    assert [row["SecId"] for row in rows] == [row["SecId"] for row in fixture_rows["rows"]]
+
+
+def test_page_count_capped_by_max_pages(make_client):
+    client = make_client()
+    rows = client.fetch_rows(["SecId"], max_pages=2)
+    assert sorted(client.pages) == [1, 2]
+    assert len(rows) == 2 * PAGE_SIZE
+
+
+def test_tabs_are_renamed_column_subsets(make_client, fixture_rows):
+    tabs = make_client().fetch_all_tabs()
+    assert list(tabs) == list(TAB_COLUMNS)
+    for tab, columns in TAB_COLUMNS.items():
+        frame = tabs[tab]
+        assert list(frame.columns) == list(columns.values())
+        assert len(frame) == fixture_rows["total"]
+        for datapoint, header in columns.items():
+            expected = [row.get(datapoint) for row in fixture_rows["rows"]]
+            assert [None if value != value else value for value in frame[header].tolist()] == expected
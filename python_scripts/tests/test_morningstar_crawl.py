@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from conftest import PAGE_SIZE
+from morningstar_api import TAB_COLUMNS
+from morningstar_crawl import CrawlStore, crawl_api
+
+
+def test_crawl_resumes_from_partial_checkpoint(make_client, fixture_rows, tmp_path):
+    store = CrawlStore(str(tmp_path / "crawl"))
+    with pytest.raises(ConnectionError):
+        crawl_api(store, make_client(fail_on_page=3))
+    assert store.completed_pages("Overview") == {1, 2}
+    assert not store.is_complete("Overview")
+
+    # A new store on the same folder reads the checkpoint and only fetches the missing pages
+    resumed_store = CrawlStore(str(tmp_path / "crawl"))
+    client = make_client()
+    crawl_api(resumed_store, client)
+    total_pages = -(-fixture_rows["total"] // PAGE_SIZE)
+    assert sorted(client.pages) == list(range(3, total_pages + 1))
+    assert all(resumed_store.is_complete(tab) for tab in TAB_COLUMNS)
+
+    overview = resumed_store.load_tab("Overview")
+    assert overview["Id"].tolist() == [row["SecId"] for row in fixture_rows["rows"]]
+
+
+def test_clear_starts_the_next_crawl_from_page_one(make_client, tmp_path):
+    store = CrawlStore(str(tmp_path / "crawl"))
+    crawl_api(store, make_client())
+    store.clear()
+    assert not os.path.exists(store.path)
+
+    client = make_client()
+    crawl_api(CrawlStore(str(tmp_path / "crawl")), client)
+    assert 1 in client.pages
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from run_metrics import metrics
+
+# ✅ Quarterly statement -> the annual sheet its TTM column belongs to
+QUARTERLY_STATEMENTS = {
+    "Quarterly Income Statement": "Income Statement",
+    "Quarterly Cash Flow Statement": "Cash Flow Statement",
+    "Quarterly Balance Sheet": "Balance Sheet",
+}
+
+# ✅ Flow statements are summed over 4 quarters; balance-sheet items are point-in-time stocks
+FLOW_STATEMENTS = {"Income Statement", "Cash Flow Statement"}
+
+# ✅ Rows of the flow statements that are not flows: share counts, rates and closing balances take the latest quarter
+POINT_IN_TIME_ITEMS = {
+    "Basic Average Shares", "Diluted Average Shares", "Tax Rate For Calcs", "End Cash Position",
+}
+
+# ✅ Per-share earnings are summed (4 quarterly EPS add up to the reported TTM EPS) but get no margin over revenue
+PER_SHARE_ITEMS = {"Basic EPS", "Diluted EPS"}
+
+# ✅ Opening balances take the first quarter of the 4-quarter window (the cash position the TTM flows start from)
+OPENING_ITEMS = {"Beginning Cash Position"}
+
+QUARTERS_PER_YEAR = 4
+MAX_WINDOW_DAYS = 300  # 4 consecutive quarter ends span ~273 days; more means a quarter is missing
+REVENUE_LINE = "Total Revenue"
+
+
+# ✅ Lay quarterly values out as a dense (series x quarter slot) matrix, slot 0 = most recent quarter
+def quarter_matrix(stacked):
+    quarterly = stacked[stacked["statement"].isin(list(QUARTERLY_STATEMENTS))].dropna(subset=["period"])
+    quarterly = quarterly.assign(statement=quarterly["statement"].astype(str).map(QUARTERLY_STATEMENTS),
+                                 ticker=quarterly["ticker"].astype(str),
+                                 line_item=quarterly["line_item"].astype(str))
+
+    # Slots are ranked per (ticker, statement) so a series missing the newest quarter gets NaN there
+    by_report = quarterly.groupby(["ticker", "statement"], sort=True)
+    slot = (by_report["period"].rank(method="dense", ascending=False) - 1).astype(int).to_numpy()
+    report = by_report.ngroup().to_numpy()
+    by_series = quarterly.groupby(["ticker", "statement", "line_item"], sort=True)
+    series = by_series.ngroup().to_numpy()
+
+    n_slots = slot.max() + 1 if len(slot) else 0
+    values = np.full((by_series.ngroups, n_slots), np.nan)
+    values[series, slot] = quarterly["value"].to_numpy(dtype="float64")
+    periods = np.full((by_report.ngroups, n_slots), np.datetime64("NaT"), dtype="datetime64[D]")
+    periods[report, slot] = quarterly["period"].to_numpy().astype("datetime64[D]")
+
+    # Which report (ticker, statement) each series row belongs to
+    series_report = np.zeros(by_series.ngroups, dtype=int)
+    series_report[series] = report
+    index = by_series.size().index
+    return values, periods[series_report], index
+
+
+# ✅ Sum of every 4-quarter window (NaN unless all 4 quarters are present and consecutive)
+def rolling_four_quarter_sums(values, periods):
+    n_series, n_slots = values.shape
+    if n_slots < QUARTERS_PER_YEAR:
+        return np.full((n_series, 0), np.nan)
+    windows = np.lib.stride_tricks.sliding_window_view(values, QUARTERS_PER_YEAR, axis=1)
+    sums = windows.sum(axis=2)  # NaN if any quarter in the window is missing
+    newest, oldest = periods[:, :n_slots - QUARTERS_PER_YEAR + 1], periods[:, QUARTERS_PER_YEAR - 1:]
+    consecutive = ~np.isnat(newest) & ~np.isnat(oldest) & (newest - oldest <= np.timedelta64(MAX_WINDOW_DAYS, "D"))
+    return np.where(consecutive, sums, np.nan)
+
+
+def _slot(matrix, slot):
+    return matrix[:, slot] if matrix.shape[1] > slot else np.full(matrix.shape[0], np.nan)
+
+
+# ✅ Value of the latest quarter per row (balance-sheet TTM); NaN if that quarter is missing, like a flow with a missing quarter
+def latest_values(values):
+    return _slot(values, 0)
+
+
+# ✅ TTM, prior-year TTM, YoY growth and TTM margin for every (ticker, statement, line item) at once
+@metrics.timed("transform.compute_ttm")
+def compute_ttm(stacked):
+    """`stacked` is the long frame from `statements.stack_statements` (any number of tickers)."""
+    values, periods, index = quarter_matrix(stacked)
+    rolling = rolling_four_quarter_sums(values, periods)
+    statements, line_items = index.get_level_values("statement"), index.get_level_values("line_item")
+    in_flow_statement = statements.isin(list(FLOW_STATEMENTS))
+    is_opening = in_flow_statement & line_items.isin(list(OPENING_ITEMS))
+    is_flow = in_flow_statement & ~line_items.isin(list(POINT_IN_TIME_ITEMS)) & ~is_opening
+
+    ttm = np.where(is_flow, _slot(rolling, 0), latest_values(values))
+    prior = np.where(is_flow, _slot(rolling, QUARTERS_PER_YEAR), _slot(values, QUARTERS_PER_YEAR))
+    # Opening balance of the window: its oldest quarter, only when the 4 quarters are all there and consecutive
+    window_start, prior_window_start = QUARTERS_PER_YEAR - 1, 2 * QUARTERS_PER_YEAR - 1
+    ttm = np.where(is_opening, np.where(np.isnan(_slot(rolling, 0)), np.nan, _slot(values, window_start)), ttm)
+    prior = np.where(is_opening, np.where(np.isnan(_slot(rolling, QUARTERS_PER_YEAR)), np.nan,
+                                          _slot(values, prior_window_start)), prior)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        yoy_growth = np.where(prior != 0, ttm / np.abs(prior) - np.sign(prior), np.nan)
+
+    result = pd.DataFrame({"TTM": ttm, "TTM Prior Year": prior, "YoY Growth": yoy_growth}, index=index)
+
+    # TTM margin: every summed income-statement line over the same ticker's TTM revenue
+    tickers = index.get_level_values("ticker")
+    is_revenue = (index.get_level_values("statement") == "Income Statement") & (index.get_level_values("line_item") == REVENUE_LINE)
+    revenue = pd.Series(ttm[is_revenue], index=tickers[is_revenue])
+    revenue = revenue[~revenue.index.duplicated()]
+    ticker_revenue = revenue.reindex(tickers).to_numpy()
+    is_margin = (statements == "Income Statement") & is_flow & ~line_items.isin(list(PER_SHARE_ITEMS))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["TTM Margin"] = np.where(is_margin, ttm / ticker_revenue, np.nan)
+    return result
+
+
+# ✅ TTM column for one ticker's sheet, indexed by line item (ready for `format_statement`)
+def ttm_for(ttm_table, ticker, statement, column="TTM"):
+    try:
+        return ttm_table.loc[(ticker, statement), column]
+    except KeyError:
+        return pd.Series(dtype="float64")
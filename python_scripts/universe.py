@@ -0,0 +1,75 @@
+import os
+
+import pandas as pd
+
+from run_metrics import metrics
+
+# ✅ Built-in symbol sources: Wikipedia tables (url, table index, symbol column)
+WIKIPEDIA_UNIVERSES = {
+    "nasdaq100": ("https://en.wikipedia.org/wiki/NASDAQ-100", 4, "Ticker"),  # Adjust index if Wikipedia changes the structure
+    "sp500": ("https://en.wikipedia.org/wiki/List_of_S%26P_500_companies", 0, "Symbol"),
+}
+
+# ✅ Index constituent files (e.g. the iShares IWV holdings CSV for the Russell 3000)
+CONSTITUENT_FILES = {
+    "russell3000": os.path.join(os.path.expanduser("~"), "Downloads", "IWV_holdings.csv"),
+}
+
+SYMBOL_COLUMNS = ("Symbol", "Ticker", "symbol", "ticker")
+
+
+# ✅ Clean symbols for Yahoo Finance ('.' -> '-', drop blanks/cash lines, keep first occurrence)
+def clean_symbols(symbols):
+    symbols = pd.Series(symbols, dtype="string").str.strip().str.replace(".", "-", regex=False)
+    symbols = symbols[symbols.notna() & (symbols != "") & (symbols != "-")]
+    return symbols.drop_duplicates().tolist()
+
+
+def _symbol_column(df, symbol_column=None):
+    if symbol_column:
+        return df[symbol_column]
+    for column in SYMBOL_COLUMNS:
+        if column in df.columns:
+            return df[column]
+    raise ValueError(f"No symbol column found (looked for {', '.join(SYMBOL_COLUMNS)})")
+
+
+def load_wikipedia_table(url, table_index, symbol_column):
+    tables = pd.read_html(url)
+    return clean_symbols(tables[table_index][symbol_column])
+
+
+def load_csv(path, symbol_column=None):
+    return clean_symbols(_symbol_column(pd.read_csv(path), symbol_column))
+
+
+def load_constituents_file(path, symbol_column="Ticker"):
+    """Index provider holdings files have a few preamble lines before the real header row."""
+    with open(path, encoding="utf-8-sig") as f:
+        for header_row, line in enumerate(f):
+            if line.split(",")[0].strip().strip('"') == symbol_column:
+                break
+        else:
+            raise ValueError(f"No '{symbol_column}' header row in {path}")
+    holdings = pd.read_csv(path, skiprows=header_row)
+    if "Asset Class" in holdings.columns:
+        holdings = holdings[holdings["Asset Class"] == "Equity"]  # Skip cash / futures lines
+    return clean_symbols(holdings[symbol_column])
+
+
+# ✅ Short name for file names and stores ("nasdaq100" stays as is, "data/my_list.csv" becomes "my_list")
+def universe_name(source):
+    return os.path.splitext(os.path.basename(source))[0]
+
+
+# ✅ Load a universe by name ("nasdaq100", "sp500", "russell3000") or from a local CSV path
+@metrics.timed("request.universe")
+def load_universe(source, symbol_column=None):
+    if source in WIKIPEDIA_UNIVERSES:
+        url, table_index, column = WIKIPEDIA_UNIVERSES[source]
+        return load_wikipedia_table(url, table_index, symbol_column or column)
+    if source in CONSTITUENT_FILES:
+        return load_constituents_file(CONSTITUENT_FILES[source], symbol_column or "Ticker")
+    if os.path.exists(source):
+        return load_csv(source, symbol_column)
+    raise ValueError(f"Unknown universe '{source}' (use {', '.join([*WIKIPEDIA_UNIVERSES, *CONSTITUENT_FILES])} or a CSV path)")
@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from run_metrics import metrics
+
+# ✅ Cache lives outside the repo so every script shares it
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mwkt", "yf_info")
+
+# ✅ Field groups (anything not listed here counts as "fundamentals")
+QUOTE_PREFIXES = ("regularMarket", "postMarket", "preMarket")
+QUOTE_FIELDS = {
+    "currentPrice", "open", "previousClose", "dayLow", "dayHigh", "bid", "ask", "bidSize", "askSize",
+    "volume", "marketCap", "enterpriseValue",
+    "fiftyTwoWeekLowChange", "fiftyTwoWeekLowChangePercent", "fiftyTwoWeekHighChange",
+    "fiftyTwoWeekHighChangePercent", "fiftyDayAverageChange", "fiftyDayAverageChangePercent",
+    "twoHundredDayAverageChange", "twoHundredDayAverageChangePercent",
+}
+GOVERNANCE_FIELDS = {
+    "auditRisk", "boardRisk", "compensationRisk", "shareHolderRightsRisk", "overallRisk",
+    "governanceEpochDate", "compensationAsOfEpochDate", "companyOfficers",
+}
+PROFILE_FIELDS = {
+    "quoteType", "shortName", "longName", "sector", "industry", "longBusinessSummary",
+    "fullExchangeName", "exchange", "currency", "website", "country", "firstTradeDateMilliseconds",
+}
+
+# ✅ How long each group stays fresh (seconds): quotes in minutes, the rest in days
+GROUP_TTL = {
+    "quote": 15 * 60,
+    "fundamentals": 24 * 60 * 60,
+    "governance": 7 * 24 * 60 * 60,
+    "profile": 30 * 24 * 60 * 60,
+}
+
+# ✅ After expiry, keep serving the old payload for this long while refreshing in the background
+STALE_WHILE_REVALIDATE = 60 * 60
+
+
+def field_group(key):
+    if key in QUOTE_FIELDS or key.startswith(QUOTE_PREFIXES):
+        return "quote"
+    if key in GOVERNANCE_FIELDS:
+        return "governance"
+    if key in PROFILE_FIELDS:
+        return "profile"
+    return "fundamentals"
+
+
+# ✅ Cached payload with fresh quote fields (e.g. from one batched price download) instead of a new `.info` call
+def refresh_quote_fields(info, quote):
+    """Market cap and enterprise value move with the price; other quote fields the refresh doesn't
+    provide (bid/ask, pre/post market) are dropped rather than served stale."""
+    refreshed = {key: value for key, value in info.items() if field_group(key) != "quote"}
+    old_price = info.get("currentPrice") or info.get("regularMarketPrice")
+    new_price = quote.get("currentPrice")
+    market_cap = info.get("marketCap")
+    if old_price and new_price and isinstance(market_cap, (int, float)):
+        refreshed["marketCap"] = market_cap * new_price / old_price
+        if isinstance(info.get("enterpriseValue"), (int, float)):  # EV = market cap + debt - cash
+            refreshed["enterpriseValue"] = info["enterpriseValue"] + refreshed["marketCap"] - market_cap
+    return {**refreshed, **quote}
+
+
+class InfoCache:
+    """On-disk TTL cache for yfinance `.info` dicts, keyed by ticker."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=5000, ttl=None,
+                 stale_while_revalidate=STALE_WHILE_REVALIDATE, max_memory_entries=500):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_memory_entries = max_memory_entries  # Keeps memory bounded on universe-scale runs
+        self.ttl = {**GROUP_TTL, **(ttl or {})}
+        self.stale_while_revalidate = stale_while_revalidate
+        self.memory = OrderedDict()  # LRU of recently used entries
+        self.lock = threading.Lock()
+        self.refreshing = set()
+        self.refresher = ThreadPoolExecutor(max_workers=2)
+        self.stats = {"hits": 0, "quote_refreshes": 0, "stale_hits": 0, "misses": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, ticker):
+        safe_ticker = "".join(c if c.isalnum() or c in ("-", "_", ".") else "_" for c in ticker)
+        return os.path.join(self.cache_dir, f"{safe_ticker}.json")
+
+    def _load(self, ticker):
+        with self.lock:
+            if ticker in self.memory:
+                self.memory.move_to_end(ticker)
+                return self.memory[ticker]
+        try:
+            with open(self._path(ticker), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._remember(ticker, entry)
+        return entry
+
+    def _remember(self, ticker, entry):
+        with self.lock:
+            self.memory[ticker] = entry
+            self.memory.move_to_end(ticker)
+            while len(self.memory) > self.max_memory_entries:
+                self.memory.popitem(last=False)
+
+    def _store(self, ticker, info, fetched_at=None):
+        """`fetched_at` maps field group -> fetch time (default: every group fetched now)."""
+        entry = {"fetched_at": fetched_at or dict.fromkeys(self.ttl, time.time()), "info": info}
+        path = self._path(ticker)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_path, path)  # Atomic swap so readers never see half a file
+        self._remember(ticker, entry)
+        return entry
+
+    def _refresh(self, ticker, fetch):
+        try:
+            self._store(ticker, fetch(ticker))
+        except Exception as e:
+            print(f"⚠️ Background refresh failed for {ticker}: {e}")
+        finally:
+            with self.lock:
+                self.refreshing.discard(ticker)
+
+    def _count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+        metrics.count(f"info_cache.{stat}")
+
+    def _fetched_at(self, entry):
+        fetched_at = entry["fetched_at"]
+        if not isinstance(fetched_at, dict):  # Entries written before per-group timestamps
+            fetched_at = dict.fromkeys(self.ttl, fetched_at)
+        return {group: fetched_at.get(group, 0.0) for group in self.ttl}
+
+    def get(self, ticker, fetch, groups=None, quotes=None):
+        """Return the info dict for `ticker`, calling `fetch(ticker)` only when the cache can't serve it.
+
+        Each field group expires on its own TTL; `groups` lists the ones the caller needs (all by default).
+        When only the quote group is out of date, `quotes(ticker)` (fresh quote fields or None) refreshes it
+        without a `.info` request."""
+        entry = self._load(ticker)
+        if entry is not None:
+            fetched_at = self._fetched_at(entry)
+            now = time.time()
+            expired = {group for group in (groups or self.ttl) if now - fetched_at[group] > self.ttl[group]}
+            if not expired:
+                self._count("hits")
+                os.utime(self._path(ticker))  # Mark as recently used for on-disk LRU
+                return dict(entry["info"])
+            if expired == {"quote"} and quotes is not None:
+                quote = quotes(ticker)
+                if quote:
+                    self._count("quote_refreshes")
+                    info = refresh_quote_fields(entry["info"], quote)
+                    return dict(self._store(ticker, info, {**fetched_at, "quote": now})["info"])
+            if all(now - fetched_at[group] <= self.ttl[group] + self.stale_while_revalidate for group in expired):
+                self._count("stale_hits")
+                with self.lock:
+                    start_refresh = ticker not in self.refreshing
+                    self.refreshing.add(ticker)
+                if start_refresh:
+                    self.refresher.submit(self._refresh, ticker, fetch)
+                return dict(entry["info"])
+
+        self._count("misses")
+        return dict(self._store(ticker, fetch(ticker))["info"])
+
+    def peek(self, ticker):
+        """Return the cached info dict for `ticker` regardless of age (None if never cached)."""
+        entry = self._load(ticker)
+        return dict(entry["info"]) if entry is not None else None
+
+    def prune(self):
+        """Delete the least recently used cache files beyond `max_entries`."""
+        files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        if len(files) <= self.max_entries:
+            return 0
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_entries]:
+            os.remove(path)
+        return len(files) - self.max_entries
+
+    def close(self):
+        """Wait for background refreshes and enforce the size cap."""
+        self.refresher.shutdown(wait=True)
+        self.prune()
+
+    def report(self):
+        total = sum(self.stats.values())
+        hit_rate = (total - self.stats["misses"]) / total if total else 0.0
+        print(f"📦 Info cache: {self.stats['hits']} hits, {self.stats['quote_refreshes']} quote refreshes, "
+              f"{self.stats['stale_hits']} stale hits, {self.stats['misses']} misses ({hit_rate:.0%} served from cache)")
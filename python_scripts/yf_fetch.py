@@ -0,0 +1,121 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tqdm import tqdm  # type: ignore
+
+from run_metrics import metrics
+
+# ✅ All yfinance `.info` requests go to the same Yahoo host
+YAHOO_HOST = "query2.finance.yahoo.com"
+
+
+# ✅ Simple per-host rate limiter (minimum spacing between request starts)
+class RateLimiter:
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(host, requests_per_second):
+    """Return the shared rate limiter for a host (created on first use)."""
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = RateLimiter(requests_per_second)
+        return _limiters[host]
+
+
+# ✅ Default info provider: one `.info` round trip to Yahoo Finance
+def yfinance_info(ticker):
+    import yfinance as yf
+
+    return yf.Ticker(ticker).info
+
+
+# ✅ Offline stand-in for `yfinance_info` (sleeps to mimic network latency)
+class StubInfoProvider:
+    def __init__(self, latency=0.05, fail_every=0):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, ticker):
+        with self.lock:
+            self.calls += 1
+            call_number = self.calls
+        time.sleep(self.latency)
+        if self.fail_every and call_number % self.fail_every == 0:
+            raise ConnectionError(f"stub failure for {ticker}")
+        seed = sum(ord(c) for c in ticker)
+        return {
+            "quoteType": "EQUITY",
+            "fullExchangeName": "NasdaqGS",
+            "currency": "USD",
+            "shortName": f"{ticker} Inc.",
+            "currentPrice": 50.0 + seed % 400,
+            "marketCap": (seed % 90 + 10) * 10**9,
+            "trailingPE": 10.0 + seed % 40,
+            "sector": "Technology",
+            "industry": "Software",
+            "firstTradeDateMilliseconds": 345479400000,
+            "longBusinessSummary": f"{ticker} makes things. " * 40,
+        }
+
+
+# ✅ Fetch one info dict with rate limiting and retry + jittered exponential backoff
+def fetch_info(ticker, provider=yfinance_info, retries=3, backoff=1.0,
+               requests_per_second=5, host=YAHOO_HOST):
+    limiter = get_rate_limiter(host, requests_per_second)
+    for attempt in range(retries + 1):
+        limiter.wait()
+        metrics.count(f"requests.{host}")
+        try:
+            with metrics.stage(f"request.{host}"):
+                return provider(ticker)
+        except Exception:
+            if attempt == retries:
+                metrics.count(f"failures.{host}")
+                raise
+            metrics.count(f"retries.{host}")
+            # Full jitter: sleep anywhere between 0 and backoff * 2^attempt
+            time.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+
+# ✅ Run `fetch_fn` over all symbols on a bounded thread pool, results in symbol order
+def fetch_all(symbols, fetch_fn, max_workers=8, desc="Fetching", unit="stock"):
+    if max_workers <= 1:
+        return [fetch_fn(symbol) for symbol in tqdm(symbols, desc=desc, unit=unit)]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # `map` yields results in submission order regardless of completion order
+        return list(tqdm(pool.map(fetch_fn, symbols), total=len(symbols), desc=desc, unit=unit))
+
+
+# ✅ Offline throughput benchmark: python yf_fetch.py
+if __name__ == "__main__":
+    symbols = [f"T{i:03d}" for i in range(100)]
+    for workers in (1, 4, 16):
+        provider = StubInfoProvider(latency=0.05)
+        start = time.perf_counter()
+        fetch_all(symbols, lambda s: fetch_info(s, provider, requests_per_second=0, host="stub"),
+                  max_workers=workers, desc=f"{workers:>2} workers")
+        elapsed = time.perf_counter() - start
+        print(f"✅ {workers:>2} workers: {len(symbols)} tickers in {elapsed:.2f}s "
+              f"({len(symbols) / elapsed:.1f} tickers/s)")
@@ -0,0 +1,135 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from run_metrics import metrics
+
+# ✅ One year of daily bars covers the 200-day average and the 52-week range
+HISTORY_PERIOD = "1y"
+
+OHLCV_FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def ffill_rows(values):
+    """Forward-fill NaN down each column of a (sessions, tickers) array."""
+    filled = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+    np.maximum.accumulate(filled, axis=0, out=filled)
+    return values[filled, np.arange(values.shape[1])]
+
+
+def tail_mean(values, sessions):
+    """Mean of the last `sessions` rows per column, ignoring NaN (NaN if a column has no values)."""
+    tail = values[-sessions:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.nansum(tail, axis=0) / (~np.isnan(tail)).sum(axis=0)
+
+
+def _range_text(low, high):
+    return f"{round(float(low), 2)} - {round(float(high), 2)}"
+
+
+# ✅ Derive `.info`-style quote fields for every ticker at once from (sessions, tickers) arrays, oldest first
+def quote_fields(tickers, open_, high, low, close, volume):
+    close = ffill_rows(close)
+    last_close = close[-1]
+    previous_close = close[-2] if len(close) > 1 else last_close
+    change = last_close - previous_close
+    fifty_day = tail_mean(close, 50)
+    two_hundred_day = tail_mean(close, 200)
+    low_52w = np.fmin.reduce(low, axis=0)  # fmin/fmax skip NaN without warnings
+    high_52w = np.fmax.reduce(high, axis=0)
+    volume_3m = tail_mean(volume, 63)  # ~3 months of sessions
+    volume_10d = tail_mean(volume, 10)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        columns = {
+            "currentPrice": last_close,
+            "regularMarketPrice": last_close,
+            "previousClose": previous_close,
+            "open": open_[-1],
+            "dayLow": low[-1],
+            "dayHigh": high[-1],
+            "regularMarketChange": change,
+            "regularMarketChangePercent": change / previous_close * 100,  # Yahoo reports this one in percent
+            "volume": volume[-1],
+            "regularMarketVolume": volume[-1],
+            "averageVolume": volume_3m,
+            "averageVolume10days": volume_10d,
+            "averageDailyVolume10Day": volume_10d,
+            "fiftyDayAverage": fifty_day,
+            "fiftyDayAverageChange": last_close - fifty_day,
+            "fiftyDayAverageChangePercent": (last_close - fifty_day) / fifty_day,
+            "twoHundredDayAverage": two_hundred_day,
+            "twoHundredDayAverageChange": last_close - two_hundred_day,
+            "twoHundredDayAverageChangePercent": (last_close - two_hundred_day) / two_hundred_day,
+            "fiftyTwoWeekLow": low_52w,
+            "fiftyTwoWeekLowChange": last_close - low_52w,
+            "fiftyTwoWeekLowChangePercent": (last_close - low_52w) / low_52w,
+            "fiftyTwoWeekHigh": high_52w,
+            "fiftyTwoWeekHighChange": last_close - high_52w,
+            "fiftyTwoWeekHighChangePercent": (last_close - high_52w) / high_52w,
+        }
+
+    # Tickers with no bars at all (delisted / bad ticker) are dropped rather than returned as NaN rows
+    names = list(columns)
+    rows = np.flatnonzero(~np.isnan(last_close))
+    table = np.vstack(list(columns.values()))[:, rows].T.tolist()
+    quotes = {}
+    for i, row in zip(rows, table):
+        quote = {field: value for field, value in zip(names, row) if value == value}  # NaN != NaN
+        if "dayLow" in quote and "dayHigh" in quote:
+            quote["regularMarketDayRange"] = _range_text(quote["dayLow"], quote["dayHigh"])
+        if "fiftyTwoWeekLow" in quote and "fiftyTwoWeekHigh" in quote:
+            quote["fiftyTwoWeekRange"] = _range_text(quote["fiftyTwoWeekLow"], quote["fiftyTwoWeekHigh"])
+        quotes[tickers[i]] = quote
+    return quotes
+
+
+def quotes_from_history(history):
+    """`history` has (field, ticker) columns as returned by `yf.download(..., group_by="column")`."""
+    tickers = list(history["Close"].columns)
+    arrays = [history[field].reindex(columns=tickers).to_numpy(dtype="float64") for field in ("Open", "High", "Low", "Close", "Volume")]
+    return quote_fields(tickers, *arrays)
+
+
+# ✅ Daily OHLCV bars for many symbols in one batched request, always with (field, ticker) columns
+@metrics.timed("request.yahoo_download")
+def download_history(symbols, **kwargs):
+    import yfinance as yf
+
+    history = yf.download(symbols, interval="1d", group_by="column", auto_adjust=False, threads=True, progress=False, **kwargs)
+    if not isinstance(history.columns, pd.MultiIndex):  # Older yfinance flattens single-ticker downloads
+        history.columns = pd.MultiIndex.from_product([history.columns, symbols[:1]])
+    return history
+
+
+# ✅ Fetch quote fields for all symbols with a single batched download
+def fetch_quotes(symbols, period=HISTORY_PERIOD):
+    return quotes_from_history(download_history(symbols, period=period))
+
+
+# ✅ Quote fields for a group of symbols, downloaded in one batch on the first lookup (never if nothing asks)
+class LazyQuotes:
+    def __init__(self, symbols, period=HISTORY_PERIOD):
+        self.symbols = list(symbols)
+        self.period = period
+        self.quotes = None
+        self.lock = threading.Lock()
+
+    def get(self, ticker):
+        with self.lock:
+            if self.quotes is None:
+                try:
+                    self.quotes = fetch_quotes(self.symbols, self.period)
+                except Exception as e:
+                    print(f"⚠️ Batched quote download failed: {e}")
+                    self.quotes = {}  # Callers fall back to a full `.info` fetch
+        return self.quotes.get(ticker)
+
+
+# ✅ Overlay fresh quote fields onto a (possibly stale or missing) info dict
+def merge_quotes(info, quote):
+    if info is None and quote is None:
+        return None
+    return {**(info or {}), **(quote or {})}